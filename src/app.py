@@ -1,14 +1,24 @@
 import sys
 import os
+import time
+
+_start, _cpu_start = time.perf_counter(), time.thread_time()
 
 # Add the project root to Python path (parent directory of src)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 sys.path.insert(0, project_root)
 
 from src.core import AppCentral
+from src.core.utils.profiler import profiler
 from PySide6.QtWidgets import QApplication
 
+profiler.record("import modules", _start, time.perf_counter(), time.thread_time() - _cpu_start)
+
 if __name__ == "__main__":
+    if "--plugin-host" in sys.argv:  # 隔离模式插件的子进程，见 src/core/plugin/child.py
+        from src.core.plugin.child import main
+        sys.exit(main(sys.argv[sys.argv.index("--plugin-host") + 1:]))
+
     app = QApplication(sys.argv)
     instance = AppCentral()
     instance.run()
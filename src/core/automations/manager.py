@@ -1,6 +1,8 @@
 from PySide6.QtCore import QObject, Signal
 from loguru import logger
 
+from src.core.utils.profiler import tick_profiler, plugin_profiler
+
 from .base import AutomationTask
 from .builtin_tasks import AutoHideTask
 from .update_check import UpdateCheckTask
@@ -13,6 +15,7 @@ class AutomationManager(QObject):
         super().__init__()
         self.app_central = app_central
         self.tasks: dict[str, AutomationTask] = {}
+        self._owners: dict[str, str] = {}  # 任务名 -> 所属插件 ID
         # self._init_builtin_tasks()
 
     def init_builtin_tasks(self):
@@ -34,21 +37,36 @@ class AutomationManager(QObject):
         if name in self.tasks:
             logger.warning(f"Task '{name}' already exists, overwriting old instance")
         self.tasks[name] = task
-        logger.debug(f"Added automation task: {name}")
+        owner = plugin_profiler.owner_of(task.update)
+        if owner:
+            self._owners[name] = owner
+        else:
+            self._owners.pop(name, None)
+        logger.debug(f"Added automation task: {name}" + (f" (plugin {owner})" if owner else ""))
 
     def remove_task(self, name: str):
         """Remove a task"""
         if name in self.tasks:
             del self.tasks[name]
+            self._owners.pop(name, None)
             logger.debug(f"Removed automation task: {name}")
 
+    def remove_plugin_tasks(self, plugin_id: str):
+        """移除某个插件注册的全部任务"""
+        for name in [n for n, owner in self._owners.items() if owner == plugin_id]:
+            self.remove_task(name)
+
     def update(self):
         """Update all active tasks"""
-        for task in list(self.tasks.values()):
-            if not task.enabled:
-                continue
-            try:
-                task.update()
-            except Exception as e:
-                logger.error(f"Error executing task '{task.name}': {e}")
-        self.updated.emit()
+        with tick_profiler.measure("tick.automations"):
+            for task in list(self.tasks.values()):
+                if not task.enabled:
+                    continue
+                try:
+                    with tick_profiler.measure(f"task {task.name}"), \
+                            plugin_profiler.measure(self._owners.get(task.name), f"task {task.name}"):
+                        task.update()
+                except Exception as e:
+                    logger.error(f"Error executing task '{task.name}': {e}")
+            with tick_profiler.measure("signal automations.updated"):
+                self.updated.emit()
@@ -24,9 +24,12 @@ from src.core.updater import UpdaterBridge
 from src.core.utils import TrayIcon, AppTranslator, UtilsBackend
 from src.core.utils.debugger import DebuggerWindow
 from src.core.utils.instance_locker import SingleInstanceGuard
+from src.core.utils.profiler import profiler, tick_profiler
 from src.core.widgets import WidgetsWindow, WidgetListModel
 from src.core.automations.manager import AutomationManager
-from src.core.windows import Settings, Editor, Tutorial, WhatsNew, CheckSingleInstanceDialog, PluginPlaza
+from src.core.windows import (
+    LazyWindow, Settings, Editor, Tutorial, WhatsNew, CheckSingleInstanceDialog, PluginPlaza
+)
 
 
 class AppCentral(QObject):  # Class Widgets 的中枢
@@ -47,11 +50,16 @@ class AppCentral(QObject):  # Class Widgets 的中枢
         AppCentral._instance = self
        
         self._check_single_instance()
-        self._initialize_cores()
-        self._initialize_notification()
-        self._initialize_schedule_components()
-        self._initialize_utils()
-        self._initialize_ui_components()
+        with profiler.span("initialize cores"):
+            self._initialize_cores()
+        with profiler.span("initialize notification"):
+            self._initialize_notification()
+        with profiler.span("initialize schedule components"):
+            self._initialize_schedule_components()
+        with profiler.span("initialize utils"):
+            self._initialize_utils()
+        with profiler.span("initialize ui components"):
+            self._initialize_ui_components()
         logger.info("AppCentral initialization completed")
 
     def _check_single_instance(self):
@@ -83,7 +91,9 @@ class AppCentral(QObject):  # Class Widgets 的中枢
 
     def _initialize_notification(self):
         """初始化通知系统"""
-        self._notification = NotificationManager(config_manager=self.configs, app_central=self)
+        self._notification = NotificationManager(
+            config_manager=self.configs, app_central=self, history_path=CONFIGS_PATH / "notifications.db"
+        )
         self.notification_service = NotificationService(self._notification, self.configs)
 
     def _initialize_utils(self):
@@ -103,20 +113,18 @@ class AppCentral(QObject):  # Class Widgets 的中枢
         self._schedule_editor: ScheduleEditor = ScheduleEditor(self.schedule_manager)
 
     def _initialize_ui_components(self):
-        """初始化UI组件"""
-        self.settings = Settings(self)
-        self.editor = Editor(self)
-        self.whatsnew = WhatsNew(self)
+        """初始化UI组件（辅助窗口在首次打开时才创建）"""
+        self.settings = LazyWindow("Settings", self._create_settings, self)
+        self.editor = LazyWindow("Editor", lambda: Editor(self), self)
+        self.whatsnew = LazyWindow("WhatsNew", lambda: WhatsNew(self), self)
         self.widgets_window: WidgetsWindow = WidgetsWindow(self)  # 简化参数传递
-        self.plugin_plaza = PluginPlaza(self)
+        self.plugin_plaza = LazyWindow("PluginPlaza", lambda: PluginPlaza(self), self)
         if self.multi_instances:
             self.single_dialog_window = CheckSingleInstanceDialog(self)
 
-        import platform
-        # win11 except
-        if platform.system() == "Windows" and platform.release() == "10" and platform.version() < "22000":
-            from RinUI import BackdropEffect
-            self.settings.setBackdropEffect(BackdropEffect.None_)
+    def _create_settings(self):
+        self.plugin_manager.activate_capability("settings_pages")  # 延迟插件的设置页面
+        return Settings(self)
 
     def run(self):  # 运行
         self._load_config()  # 加载配置
@@ -140,25 +148,40 @@ class AppCentral(QObject):  # Class Widgets 的中枢
             return  # 中断后续初始化流程，教程窗口负责完成设置后重启
 
         self._setup_logging()  # 设置日志
-        self._load_schedule()  # 加载课程表
-        self._load_runtime()  # 加载运行时(以及插件)
-        self._init_tray_icon()  # 初始化托盘图标
-        self._run_utils()
-        self.initialized.emit()  # 发送信号
+        with profiler.span("load schedule"):
+            self._load_schedule()  # 加载课程表
+        with profiler.span("load runtime"):
+            self._load_runtime()  # 加载运行时(以及插件)
+        with profiler.span("init tray icon"):
+            self._init_tray_icon()  # 初始化托盘图标
+        with profiler.span("run utils"):
+            self._run_utils()
+        with profiler.span("initialized signal"):
+            self.initialized.emit()  # 发送信号
         logger.info(f"Initialization completed.")
+        profiler.finish()
+        if self.configs.app.debug_mode:
+            profiler.export(LOGS_PATH / "startup-trace.json")
         
 
 
     def _load_config(self):
         """加载和验证配置"""
-        self.configs.load_config()
+        with profiler.span("load config"):
+            self.configs.load_config()
 
     def update(self):
-        self.runtime.refresh()
-        self.updated.emit()  # 发送信号
+        with tick_profiler.measure("tick.central"):
+            self.runtime.refresh()
+            self.union_update_timer.arm_boundary(self.runtime.next_boundary_time())
+            with tick_profiler.measure("signal AppCentral.updated"):
+                self.updated.emit()  # 发送信号
 
     def cleanup(self):
+        self.plugin_manager.cleanup()  # on_unload（隔离插件在其进程中执行）
         self.configs.save()
+        self.schedule_manager.persistence.shutdown()  # 写出未保存的课表修改
+        self._notification.history.close()
         self.union_update_timer.stop()
         logger.info("Clean up.")
 
@@ -272,13 +295,16 @@ class AppCentral(QObject):  # Class Widgets 的中枢
     def _load_theme_and_plugins(self):
         """主题和插件"""
         logger.info("Loading themes and plugins...")
-        self.theme_manager.load()
+        with profiler.span("load themes"):
+            self.theme_manager.load()
         logger.info("Themes loaded successfully")
 
         self.plugin_manager.set_enabled_plugins(self.configs.plugins.enabled)
         # 加载插件（内置+外部）
-        self.plugin_manager.scan()  # 延迟扫描插件，确保翻译器已加载
-        self.plugin_manager.load_plugins()
+        with profiler.span("scan plugins"):
+            self.plugin_manager.scan()  # 延迟扫描插件，确保翻译器已加载
+        with profiler.span("load plugins"):
+            self.plugin_manager.load_plugins()
 
     def _init_tray_icon(self):
         self.tray_icon = TrayIcon()
@@ -310,42 +336,22 @@ class AppCentral(QObject):  # Class Widgets 的中枢
     @Slot()
     def openSettings(self):
         """显示设置窗口"""
-        if self.settings and self.settings.root_window:
-            self.settings.root_window.show()
-            self.settings.root_window.raise_()
-            self.settings.root_window.requestActivate()
-        else:
-            logger.error("Settings window not initialized correctly.")
+        self.settings.open()
 
     @Slot()
     def openEditor(self):
         """显示课程表编辑器"""
-        if self.editor and self.editor.root_window:
-            self.editor.root_window.show()
-            self.editor.root_window.raise_()
-            self.editor.root_window.requestActivate()
-        else:
-            logger.error("Editor window not initialized correctly.")
+        self.editor.open()
 
     @Slot()
     def openPlaza(self):
-        """显示课程表编辑器"""
-        if self.plugin_plaza and self.plugin_plaza.root_window:
-            self.plugin_plaza.root_window.show()
-            self.plugin_plaza.root_window.raise_()
-            self.plugin_plaza.root_window.requestActivate()
-        else:
-            logger.error("Editor window not initialized correctly.")
+        """显示插件广场"""
+        self.plugin_plaza.open()
 
     @Slot()
     def openWhatsNew(self):
-        """显示课程表编辑器"""
-        if self.whatsnew and self.whatsnew.root_window:
-            self.whatsnew.root_window.show()
-            self.whatsnew.root_window.raise_()
-            self.whatsnew.root_window.requestActivate()
-        else:
-            logger.error("WhatsNew window not initialized correctly.")
+        """显示更新说明"""
+        self.whatsnew.open()
 
     @Slot()
     def openSingleInstanceDialog(self):
@@ -0,0 +1,88 @@
+import hashlib
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Type, TypeVar, List, get_args
+
+from loguru import logger
+from pydantic import BaseModel
+
+from src import __version__
+
+T = TypeVar("T", bound=BaseModel)
+
+CACHE_FORMAT = 1  # 缓存格式变化时递增
+
+
+@lru_cache(maxsize=None)
+def schema_digest(model_type: Type[BaseModel]) -> str:
+    """
+    模型结构的哈希（增删字段、修改类型或默认值时变化，开发版本无需改版本号）
+    直接遍历 model_fields：model_json_schema() 每次启动要多花约 20 ms，抵消了缓存的收益
+    """
+    parts, pending, seen = [], [model_type], set()
+    while pending:
+        model = pending.pop()
+        if model in seen:
+            continue
+        seen.add(model)
+        parts.append(f"{model.__module__}.{model.__qualname__}")
+        for name, field in model.model_fields.items():
+            parts.append(f"{name}:{field.annotation!r}={field.default!r}")
+            pending.extend(_nested_models(field.annotation))
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _nested_models(annotation) -> List[Type[BaseModel]]:
+    """注解中出现的模型类型（包括 Dict[str, Model]、List[Model]、Optional[Model] 等）"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation]
+    return [m for arg in get_args(annotation) for m in _nested_models(arg)]
+
+
+class ConfigSnapshotCache:
+    """
+    配置快照缓存（与 JSON 同目录的 pickle 文件）
+    以 JSON 原文的哈希 + 程序版本 + 模型结构哈希为键；JSON 未变化时直接还原已校验的模型，跳过 pydantic 校验。
+    JSON 仍是唯一的数据来源，缓存损坏或不匹配时会被忽略并重建。
+    """
+
+    def __init__(self, json_path: Path):
+        json_path = Path(json_path)
+        self.path = json_path.with_name(f".{json_path.name}.cache")
+
+    @staticmethod
+    def _key(raw: bytes, model_type: Type[BaseModel]) -> str:
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        return f"{CACHE_FORMAT}:{__version__}:{schema_digest(model_type)}:{digest}"
+
+    def load(self, raw: bytes, model_type: Type[T]) -> Optional[T]:
+        """JSON 原文对应的已缓存模型，不匹配返回 None"""
+        try:
+            with open(self.path, "rb") as f:
+                key, model = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # 缓存损坏 / 旧版本无法反序列化
+            logger.debug(f"Ignored config cache: {e}")
+            return None
+        if key != self._key(raw, model_type) or not isinstance(model, model_type):
+            return None
+        return model
+
+    def store(self, raw: bytes, model: BaseModel):
+        """写入缓存（失败不影响配置本身）"""
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((self._key(raw, type(model)), model), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.debug(f"Failed to write config cache: {e}")
+
+    def clear(self):
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -1,13 +1,17 @@
 import platform
+from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Dict, Set, Callable
 
 from PySide6.QtGui import QFontDatabase
 from PySide6.QtWidgets import QApplication
 from loguru import logger
-from pydantic import Field, PrivateAttr
+from pydantic import Field
 from PySide6.QtCore import QObject, QTimer, Signal, Property, Slot
 
+from .cache import ConfigSnapshotCache
 from .model import AppConfig, ScheduleConfig, PreferencesConfig, PluginsConfig, LocaleConfig, InteractionsConfig, \
     ConfigBaseModel, NetworkConfig, NotificationsConfig
 from src import __version__, __version_type__
@@ -23,40 +27,201 @@ class RootConfig(ConfigBaseModel):
     network: NetworkConfig = Field(default_factory=NetworkConfig)
     notifications: NotificationsConfig = Field(default_factory=NotificationsConfig)
 
-    _on_change: callable = PrivateAttr(default=None)
 
-    def __setattr__(self, name, value):
-        super().__setattr__(name, value)
-        if self._on_change and name != "_on_change":
-            self._on_change()
+SECTIONS = tuple(RootConfig.model_fields)  # app, locale, schedule, preferences ...
+
+
+class ConfigData(QObject):
+    """
+    Configs.data：每个分区一个属性，分别通知
+    QML 绑定 Configs.data.preferences.xxx 只在 preferences 变化时重新求值
+    """
+    appChanged = Signal()
+    localeChanged = Signal()
+    scheduleChanged = Signal()
+    preferencesChanged = Signal()
+    interactionsChanged = Signal()
+    pluginsChanged = Signal()
+    networkChanged = Signal()
+    notificationsChanged = Signal()
+
+    def __init__(self, manager: "ConfigManager"):
+        super().__init__(manager)
+        self._manager = manager
+
+    @Property('QVariant', notify=appChanged)
+    def app(self):
+        return self._manager.section_data("app")
+
+    @Property('QVariant', notify=localeChanged)
+    def locale(self):
+        return self._manager.section_data("locale")
+
+    @Property('QVariant', notify=scheduleChanged)
+    def schedule(self):
+        return self._manager.section_data("schedule")
+
+    @Property('QVariant', notify=preferencesChanged)
+    def preferences(self):
+        return self._manager.section_data("preferences")
+
+    @Property('QVariant', notify=interactionsChanged)
+    def interactions(self):
+        return self._manager.section_data("interactions")
+
+    @Property('QVariant', notify=pluginsChanged)
+    def plugins(self):
+        return self._manager.section_data("plugins")
+
+    @Property('QVariant', notify=networkChanged)
+    def network(self):
+        return self._manager.section_data("network")
+
+    @Property('QVariant', notify=notificationsChanged)
+    def notifications(self):
+        return self._manager.section_data("notifications")
 
 
 # 配置管理器
 class ConfigManager(QObject):
-    configChanged = Signal()
+    configChanged = Signal()  # 任意分区变化
+    sectionChanged = Signal(str)  # 分区名
+
+    SAVE_DELAY_MS = 2000  # 最后一次修改后多久保存
 
     def __init__(self, path: Path, filename: str):
         super().__init__()
         self.path = Path(path)
         self.filename = filename
         self.full_path = self.path / filename
+        self._cache = ConfigSnapshotCache(self.full_path)  # 启动快速路径
+
+        self._projections: Dict[str, dict] = {}  # 分区 -> dict 缓存
+        self._dirty: Set[str] = set()  # 尚未保存的分区
+        self._batch_depth = 0  # 事务嵌套层数
+        self._batch_sections: Set[str] = set()  # 事务中被修改的分区
+        self._deferred: Dict[str, Callable[[], None]] = {}  # 事务提交时执行的同步回调
+        self._data = ConfigData(self)
 
         self._config = RootConfig()
-        self._bind_nested_on_change(self._config)
+        self._bind_sections()
 
         self.save_timer = QTimer(self)
-        self.save_timer.setInterval(1000 * 60)  # 1分钟保存一次
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.SAVE_DELAY_MS)  # 防抖，只在有修改时保存
         self.save_timer.timeout.connect(self.save)
 
-    def _bind_nested_on_change(self, obj):
+    def _bind_sections(self):
+        """每个分区绑定自己的 _on_change，根对象变化（整体替换分区）视为全部变化"""
+        self._config._on_change = self._on_root_change
+        for section in SECTIONS:
+            self._bind_nested_on_change(getattr(self._config, section), partial(self._mark_dirty, section))
+
+    def _bind_nested_on_change(self, obj, callback):
+        """
+        递归绑定 _on_change 给所有嵌套的 ConfigBaseModel（包括 dict / list 中的模型）
+        """
+        if isinstance(obj, dict):
+            for value in obj.values():
+                self._bind_nested_on_change(value, callback)
+            return
+        if isinstance(obj, (list, tuple)):
+            for value in obj:
+                self._bind_nested_on_change(value, callback)
+            return
+        if not isinstance(obj, ConfigBaseModel):
+            return
+        obj._on_change = callback
+        for field_name in obj.__fields__:
+            self._bind_nested_on_change(getattr(obj, field_name), callback)
+
+    def _mark_dirty(self, section: str):
+        """分区被修改：失效缓存、发送信号、计划保存（事务中推迟到提交时）"""
+        self._projections.pop(section, None)
+        self._dirty.add(section)
+        if self._batch_depth:
+            self._batch_sections.add(section)
+            return
+        self._notify([section])
+
+    def _notify(self, sections):
+        for section in sections:
+            getattr(self._data, f"{section}Changed").emit()
+            self.sectionChanged.emit(section)
+        self.configChanged.emit()
+        self.save_timer.start()
+
+    # 事务
+    @contextmanager
+    def batch(self):
         """
-        递归绑定 _on_change 给所有嵌套的 ConfigBaseModel
+        将多次修改合并为一次通知与一次保存请求
+        with configs.batch():
+            configs.preferences.opacity = 0.8
+            configs.preferences.scale = 1.2
         """
-        obj._on_change = lambda: (self.configChanged.emit())
-        for field_name, field in obj.__fields__.items():
-            value = getattr(obj, field_name)
-            if isinstance(value, ConfigBaseModel):
-                self._bind_nested_on_change(value)
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.commit()
+
+    def begin(self):
+        """开始事务（可嵌套）"""
+        self._batch_depth += 1
+
+    def commit(self):
+        """提交事务：最外层提交时统一同步、通知"""
+        if not self._batch_depth:
+            logger.warning("Config commit() called without begin()")
+            return
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+
+        while self._deferred:  # 回调中可能再次修改配置
+            deferred, self._deferred = self._deferred, {}
+            self._batch_depth += 1
+            try:
+                for callback in deferred.values():
+                    callback()
+            finally:
+                self._batch_depth -= 1
+
+        sections = [s for s in SECTIONS if s in self._batch_sections]
+        self._batch_sections.clear()
+        if sections:
+            self._notify(sections)
+
+    @property
+    def in_batch(self) -> bool:
+        return bool(self._batch_depth)
+
+    def defer(self, key: str, callback: Callable[[], None]):
+        """事务中相同 key 的回调只在提交时执行一次；不在事务中则立即执行"""
+        if self._batch_depth:
+            self._deferred[key] = callback
+        else:
+            callback()
+
+    def _on_root_change(self):
+        self._bind_sections()  # 新赋值的分区重新绑定
+        self._mark_all_dirty()
+
+    def _mark_all_dirty(self):
+        for section in SECTIONS:
+            self._mark_dirty(section)
+
+    def section_data(self, section: str) -> dict:
+        """分区的 dict 投影（缓存到下次修改）"""
+        data = self._projections.get(section)
+        if data is None:
+            data = self._projections[section] = getattr(self._config, section).model_dump()
+        return data
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
 
     def _ensure_defaults(self):
         """确保在 QApplication 存在时，填充"""
@@ -95,24 +260,41 @@ class ConfigManager(QObject):
         logger.info(f"Cleaned useless configs.")
 
     def load_config(self):
+        loaded = False
         if self.full_path.exists():
             try:
-                data = self.full_path.read_text(encoding="utf-8")
-                self._config = RootConfig.model_validate_json(data)
-
-                self._bind_nested_on_change(self._config)
-                self._ensure_defaults()
-                self._clean_useless_configs()
+                raw = self.full_path.read_bytes()
+                config = self._cache.load(raw, RootConfig)  # JSON 未变化时跳过校验
+                if config is None:
+                    config = RootConfig.model_validate_json(raw)
+                    self._cache.store(raw, config)
+                else:
+                    logger.debug("Config restored from snapshot cache")
+                self._config = config
+                self._projections.clear()
+
+                self._bind_sections()
+                with self.batch():
+                    self._ensure_defaults()
+                    self._clean_useless_configs()
                 title = "{:#^80s}".format(f" Class Widgets {__version__}-{__version_type__} ")
                 logger.info(f"{title} \nloaded config: {self.full_path}")
+                loaded = True
             except Exception as e:
                 logger.warning(f"Load config failed: {e}, use default config")
-        self.save()
+        self.save(force=not loaded)  # 文件未变化时不重写
 
-    def save(self, silent=False):
+    def save(self, silent=False, force=False):
+        """保存配置；没有未保存的修改时跳过（force 强制写入）"""
+        self.save_timer.stop()
+        if not self._dirty and not force:
+            return
         try:
             self.path.mkdir(parents=True, exist_ok=True)
-            self.full_path.write_text(self._config.model_dump_json(indent=4), encoding="utf-8")
+            raw = self._config.model_dump_json(indent=4).encode("utf-8")
+            self.full_path.write_bytes(raw)
+            self._dirty.clear()
+            self._cache.store(raw, self._config)
             if not silent:
                 logger.success(f"Save config success: {self.full_path}")
         except Exception as e:
@@ -125,9 +307,9 @@ class ConfigManager(QObject):
 
         return getattr(self._config, name)
 
-    @Property('QVariant', notify=configChanged)
+    @Property(QObject, constant=True)
     def data(self):
-        return self._config.model_dump()  # 整个配置转 dict
+        return self._data  # 按分区通知，见 ConfigData
 
     @Slot(str, "QVariant")
     def set(self, key: str, value):
@@ -139,17 +321,31 @@ class ConfigManager(QObject):
         last_key = keys[-1]
 
         # 如果最后一级是 dict，就赋值到 dict 的键
-        if isinstance(cfg, dict):
+        if isinstance(cfg, dict):  # dict 赋值不会触发 _on_change
             cfg[last_key] = value
+            self._mark_dirty(keys[0]) if keys[0] in SECTIONS else self._mark_all_dirty()
         else:
             setattr(cfg, last_key, value)
 
-        self._config._on_change()
-        self.configChanged.emit()
+    @Slot("QVariant")
+    def batchSet(self, values):
+        """
+        QML 中一次设置多项，合并为一次通知（QML 没有 try/finally，事务只在 Python 中开启）
+        Configs.batchSet({"preferences.opacity": 0.8, "preferences.scale_factor": 1.2})
+        """
+        if hasattr(values, "toVariant"):
+            values = values.toVariant()
+        with self.batch():
+            for key, value in values.items():
+                self.set(key, value)
 
     @Slot(str, str, "QVariant")
     def setPlugin(self, plugin_id: str, key: str, value):
         """设置插件配置（同时更新运行时模型）"""
+        with self.batch():  # 运行时模型的同步与本次修改合并为一次通知
+            self._set_plugin(plugin_id, key, value)
+
+    def _set_plugin(self, plugin_id: str, key: str, value):
         # 先更新 dict 存储
         plugin_cfg: dict = self._config.plugins.configs.get(plugin_id)
         if plugin_cfg is None:
@@ -179,5 +375,4 @@ class ConfigManager(QObject):
                 except Exception as e:
                     logger.error(f"Failed to update runtime model for {plugin_id}: {e}")
 
-        self._config._on_change()
-        self.configChanged.emit()
+        self._mark_dirty("plugins")
@@ -15,19 +15,40 @@ GITHUB_MIRRORS: Dict[str, str] = {
 }
 
 
+def bind_on_change(value, callback):
+    """将 callback 绑定到 value 中的 ConfigBaseModel（包括 dict / list 中的元素）"""
+    if isinstance(value, ConfigBaseModel):
+        value._on_change = callback
+    elif isinstance(value, dict):
+        for item in value.values():
+            bind_on_change(item, callback)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            bind_on_change(item, callback)
+
+
 class ConfigBaseModel(BaseModel):
     _on_change: callable = PrivateAttr(default=None)
 
     def __init__(self, **data):
         super().__init__(**data)
         for name, value in self.__dict__.items():
-            if isinstance(value, ConfigBaseModel):
-                value._on_change = self._on_change
+            bind_on_change(value, self._on_change)
+
+    def __getstate__(self):  # pickle 时不带回调（见 ConfigSnapshotCache）
+        state = super().__getstate__()
+        private = state.get("__pydantic_private__")
+        if private and private.get("_on_change") is not None:
+            state = {**state, "__pydantic_private__": {**private, "_on_change": None}}
+        return state
 
     def __setattr__(self, name, value):  # 实时发送更新信号
+        old = self.__dict__.get(name, value)
         super().__setattr__(name, value)
-        if isinstance(value, ConfigBaseModel):
-            value._on_change = self._on_change
+        if name != "_on_change":
+            bind_on_change(self.__dict__.get(name, value), self._on_change)  # validate_assignment 后为新对象
+        if old == value and not isinstance(value, (dict, list, set)):  # 值未变化（如拖动滑块时重复赋值）
+            return
         if self._on_change and name != "_on_change":
             self._on_change()
 
@@ -133,9 +154,22 @@ class InteractionsConfig(ConfigBaseModel):
     hide: HideInteractionsConfig = Field(default_factory=HideInteractionsConfig)  # 隐藏配置
 
 
+class PluginWatchdogConfig(ConfigBaseModel):
+    """
+    插件资源预算
+    """
+    enabled: bool = True  # 检查预算
+    tick_budget_ms: float = 50  # 单个插件每秒的耗时上限（自动化任务 + 信号槽 + QML 后端槽）
+    load_budget_ms: float = 3000  # on_load 耗时上限（仅警告）
+    memory_budget_mb: float = 64  # 归属内存上限（需开启 trace_memory）
+    trace_memory: bool = False  # 使用 tracemalloc 统计插件内存（有额外开销，重启后生效）
+    auto_disable: bool = False  # 持续超出预算时停用插件
+
+
 class PluginsConfig(ConfigBaseModel):
     enabled: List[str] = ["builtin.classwidgets.widgets"]
     configs: Dict[str, Dict] = Field(default_factory=dict)
+    watchdog: PluginWatchdogConfig = Field(default_factory=PluginWatchdogConfig)  # 资源预算
 
 
 class ScheduleConfig(ConfigBaseModel):
@@ -156,6 +190,10 @@ class NetworkConfig(ConfigBaseModel):
     releases_url: str = "https://classwidgets.rinlit.cn/2/releases.json"  # 版本更新地址
     auto_check_updates: bool = True  # 自动检查更新
 
+class ProviderConfig(ConfigBaseModel, NotificationProviderConfig):
+    """保存在配置中的提供者设置（修改时标记 notifications 分区）"""
+
+
 class NotificationsConfig(ConfigBaseModel):
     """
     所有通知配置，包括全局设置和各提供者配置
@@ -163,7 +201,14 @@ class NotificationsConfig(ConfigBaseModel):
     enabled: bool = True  # 全局通知开关
     default_sound: Optional[str] = None  # 默认铃声
     volume: float = 0.7  # 通知音量 (0.0-1.0)
-    providers: Dict[str, NotificationProviderConfig] = Field(default_factory=dict)
+    providers: Dict[str, ProviderConfig] = Field(default_factory=dict)
+
+    # 分发队列
+    queue_size: int = 32  # 排队上限
+    rate_limit: float = 1.0  # 每个提供者每秒最多发送条数（<= 0 不限）
+    rate_burst: int = 5  # 允许的突发条数
+    coalesce_window: float = 5.0  # 秒，窗口内相同标题/内容的通知只发送一次
+    back_pressure: str = "drop_oldest"  # 队列满时：drop_oldest / merge
     
     # 按通知级别设置的默认音频文件（默认为空字符串）
     level_sounds: Dict[int, str] = Field(default_factory=lambda: {
@@ -173,6 +218,16 @@ class NotificationsConfig(ConfigBaseModel):
         3: ""      # SYSTEM - 系统音
     })
 
+    def provider(self, provider_id: str) -> ProviderConfig:
+        """获取提供者设置，不存在时创建（dict 赋值不会触发 _on_change，这里手动绑定并通知）"""
+        cfg = self.providers.get(provider_id)
+        if cfg is None:
+            cfg = self.providers[provider_id] = ProviderConfig()
+            cfg._on_change = self._on_change
+            if self._on_change:
+                self._on_change()
+        return cfg
+
     class Config:
         extra = Extra.allow
         validate_assignment = True
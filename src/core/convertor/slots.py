@@ -60,14 +60,8 @@ class ScheduleIO(QObject):
             with open(dest_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
 
-            self.manager.schedule = ScheduleData.model_validate(data)
-            self.manager.current_schedule_name = dest_path.stem
-            self.manager.schedule_path = dest_path
-
-            # 保存并触发信号
-            self.manager.save()
-            self.manager.scheduleSwitched.emit(self.manager.schedule)
-            self.manager.scheduleModified.emit(self.manager.schedule)
+            # 替换当前课表（重新打开日志、重建索引）并保存
+            self.manager.replace(ScheduleData.model_validate(data), dest_path)
 
             logger.success(f"Imported CSES schedule from {file_path}")
             return True
@@ -0,0 +1,194 @@
+import heapq
+import time
+from enum import Enum
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Callable
+
+from .model import NotificationData, NotificationLevel, NotificationProviderConfig
+
+
+class BackPressurePolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"  # 队列满时丢弃优先级最低中最早的一条
+    MERGE = "merge"  # 队列满时与同一来源排队中的通知合并（保留最新内容）
+
+
+class TokenBucket:
+    """令牌桶：平均每秒 rate 条，最多突发 burst 条"""
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: int, now: float):  # rate > 0
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = now
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def try_take(self, now: float) -> bool:
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, now: float) -> float:
+        """距离下一个令牌的秒数"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class QueuedNotification:
+    __slots__ = ("data", "cfg", "seq", "merged")
+
+    def __init__(self, data: NotificationData, cfg: NotificationProviderConfig, seq: int):
+        self.data = data
+        self.cfg = cfg
+        self.seq = seq
+        self.merged = 0  # 被合并 / 去重的条数
+
+    @property
+    def key(self) -> Tuple[str, str, Optional[str]]:
+        return self.data.provider_id, self.data.title, self.data.message
+
+
+class NotificationDispatchQueue:
+    """
+    通知分发队列（线程安全，可从任意线程 push）
+    - 按 NotificationLevel 排序的有界优先队列，同级先进先出
+    - 每个 Provider 独立的令牌桶限流（SYSTEM 级别不受限）
+    - 时间窗口内相同 provider/title/message 的通知只发送一次
+    - 队列满时按 BackPressurePolicy 丢弃或合并
+    """
+
+    def __init__(self, max_size: int = 32, rate: float = 1.0, burst: int = 5,
+                 coalesce_window: float = 5.0,
+                 policy: BackPressurePolicy = BackPressurePolicy.DROP_OLDEST,
+                 clock: Callable[[], float] = time.monotonic):
+        self._lock = Lock()
+        self._clock = clock
+        self._heap: List[Tuple[int, int, QueuedNotification]] = []  # (-level, seq, item)
+        self._queued: Dict[Tuple, QueuedNotification] = {}  # key -> 排队中的通知
+        self._recent: Dict[Tuple, float] = {}  # key -> 上次入队时间
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._seq = 0
+        self.dropped = 0
+        self.configure(max_size, rate, burst, coalesce_window, policy)
+
+    def configure(self, max_size: int, rate: float, burst: int, coalesce_window: float,
+                  policy: BackPressurePolicy):
+        with self._lock:
+            self.max_size = max(1, int(max_size))
+            self.rate = float(rate)
+            self.burst = max(1, int(burst))
+            self.coalesce_window = float(coalesce_window)
+            self.policy = BackPressurePolicy(policy)
+            now = self._clock()
+            for bucket in self._buckets.values():  # 保留已消耗的令牌，只调整速率与容量
+                bucket._refill(now)  # 之前的时间按旧速率计算
+                bucket.rate = self.rate
+                bucket.burst = self.burst
+                bucket.tokens = min(bucket.tokens, self.burst)
+            if self.rate <= 0:
+                self._buckets.clear()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, data: NotificationData, cfg: NotificationProviderConfig) -> bool:
+        """
+        入队
+        :return: 是否产生了新的待发送通知（被去重 / 合并 / 丢弃时返回 False）
+        """
+        now = self._clock()
+        with self._lock:
+            item = QueuedNotification(data, cfg, self._seq)
+            key = item.key
+
+            queued = self._queued.get(key)
+            if queued is not None:  # 同样的通知还在排队
+                queued.merged += 1
+                return False
+            last = self._recent.get(key)
+            if last is not None and now - last < self.coalesce_window:
+                return False
+            self._remember(key, now)
+
+            if len(self._heap) >= self.max_size and not self._make_room(item):
+                return False
+
+            self._seq += 1
+            self._queued[key] = item
+            heapq.heappush(self._heap, (-int(data.level), item.seq, item))
+            return True
+
+    def pop_ready(self) -> Tuple[List[QueuedNotification], Optional[float]]:
+        """
+        取出当前可以发送的通知（按优先级）
+        :return: (通知列表, 距离下一条可发送的秒数；队列为空时为 None)
+        """
+        now = self._clock()
+        ready, blocked = [], []
+        wait = None
+        with self._lock:
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                item = entry[2]
+                provider_id = item.data.provider_id
+                if (self.rate <= 0 or item.data.level >= NotificationLevel.SYSTEM
+                        or self._bucket(provider_id, now).try_take(now)):
+                    self._queued.pop(item.key, None)
+                    ready.append(item)
+                else:
+                    blocked.append(entry)
+                    delay = self._bucket(provider_id, now).wait_time(now)
+                    wait = delay if wait is None else min(wait, delay)
+            for entry in blocked:
+                heapq.heappush(self._heap, entry)
+        return ready, wait
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._queued.clear()
+
+    def _bucket(self, provider_id: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(provider_id)
+        if bucket is None:
+            bucket = self._buckets[provider_id] = TokenBucket(self.rate, self.burst, now)
+        return bucket
+
+    def _remember(self, key: Tuple, now: float):
+        self._recent[key] = now
+        if len(self._recent) > 256:  # 清理过期记录
+            self._recent = {k: t for k, t in self._recent.items() if now - t < self.coalesce_window}
+
+    def _make_room(self, item: QueuedNotification) -> bool:
+        """队列已满：按策略腾出位置，返回新通知是否可以入队"""
+        if self.policy == BackPressurePolicy.MERGE:
+            same = [e for e in self._heap if e[2].data.provider_id == item.data.provider_id]
+            if same:
+                target = max(same, key=lambda e: e[1])  # 同一来源最新的一条，用新内容替换
+                self._heap.remove(target)
+                self._queued.pop(target[2].key, None)
+                level = max(int(item.data.level), -target[0])
+                merged = QueuedNotification(item.data.model_copy(update={"level": level}), item.cfg, target[1])
+                merged.merged = target[2].merged + 1
+                self._heap.append((-level, merged.seq, merged))
+                heapq.heapify(self._heap)
+                self._queued[merged.key] = merged
+                return False
+
+        # 丢弃优先级最低中最早的一条（新通知优先级更低时丢弃新通知）
+        victim = max(self._heap, key=lambda e: (e[0], -e[1]))
+        if -victim[0] > int(item.data.level):
+            self.dropped += 1
+            return False
+        self._heap.remove(victim)
+        heapq.heapify(self._heap)
+        self._queued.pop(victim[2].key, None)
+        self.dropped += 1
+        return True
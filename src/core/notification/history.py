@@ -0,0 +1,174 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple, Union
+
+from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtQml import QJSValue
+from loguru import logger
+
+from .model import NotificationData
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    provider_id TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT,
+    icon TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_time ON notifications (timestamp);
+CREATE INDEX IF NOT EXISTS idx_notifications_provider ON notifications (provider_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_notifications_level ON notifications (level, timestamp);
+"""
+
+_COLUMNS = ("id", "timestamp", "provider_id", "level", "title", "message", "icon")
+
+
+class NotificationHistory(QObject):
+    """
+    通知历史（SQLite）
+    写入与查询都在单独的线程中串行执行：写入只提交不等待；
+    查询（query / count / page / total）与 clear 会阻塞调用线程直到工作线程返回（排在未完成的写入之后），
+    因此每页最多 MAX_PAGE 条，界面应分页加载。
+    最多保留 MAX_ROWS 条，超出时删除最早的记录。
+
+    过滤条件（filters）：
+        provider_id: 提供者 ID
+        min_level: 最低级别
+        since / until: 时间范围（Unix 时间戳，秒）
+    """
+    recorded = Signal(dict)  # 新增一条记录
+
+    MAX_ROWS = 5000
+    PRUNE_EVERY = 100  # 每写入多少条检查一次上限
+    MAX_PAGE = 200  # 单次查询的最大条数（查询会阻塞调用线程）
+
+    def __init__(self, path: Optional[Path] = None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notification-history")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self._executor.submit(self._open)
+
+    # 以下方法在工作线程中执行
+    def _open(self):
+        try:
+            if self.path is not None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path) if self.path else ":memory:", check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to open notification history: {e}")
+            self._conn = None
+
+    def _insert(self, row: Tuple) -> Optional[Dict]:
+        if self._conn is None:
+            return None
+        try:
+            cursor = self._conn.execute(
+                "INSERT INTO notifications (timestamp, provider_id, level, title, message, icon) "
+                "VALUES (?, ?, ?, ?, ?, ?)", row
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._conn.execute("DELETE FROM notifications WHERE id <= ?", (cursor.lastrowid - self.MAX_ROWS,))
+            self._conn.commit()
+            record = dict(zip(_COLUMNS, (cursor.lastrowid, *row)))
+            self.recorded.emit(record)  # 跨线程信号，在接收者线程中处理
+            return record
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record notification: {e}")
+            return None
+
+    @staticmethod
+    def _where(filters: Optional[Dict]) -> Tuple[str, List]:
+        clauses, params = [], []
+        filters = filters or {}
+        if filters.get("provider_id"):
+            clauses.append("provider_id = ?")
+            params.append(filters["provider_id"])
+        if filters.get("min_level") is not None:
+            clauses.append("level >= ?")
+            params.append(int(filters["min_level"]))
+        if filters.get("since") is not None:
+            clauses.append("timestamp >= ?")
+            params.append(float(filters["since"]))
+        if filters.get("until") is not None:
+            clauses.append("timestamp < ?")
+            params.append(float(filters["until"]))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _select(self, filters: Optional[Dict], offset: int, limit: int) -> List[Dict]:
+        if self._conn is None:
+            return []
+        where, params = self._where(filters)
+        rows = self._conn.execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM notifications{where} "
+            f"ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+            (*params, int(limit), int(offset))
+        ).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def _count(self, filters: Optional[Dict]) -> int:
+        if self._conn is None:
+            return 0
+        where, params = self._where(filters)
+        return self._conn.execute(f"SELECT COUNT(*) FROM notifications{where}", params).fetchone()[0]
+
+    def _clear(self):
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM notifications")
+            self._conn.commit()
+
+    # 公共接口
+    def record(self, data: NotificationData, timestamp: Optional[float] = None):
+        """记录一条通知（异步）"""
+        icon = str(data.icon) if data.icon is not None else None
+        row = (timestamp or time.time(), data.provider_id, int(data.level), data.title, data.message, icon)
+        self._executor.submit(self._insert, row)
+
+    def query(self, filters: Optional[Dict] = None, offset: int = 0, limit: int = 50) -> List[Dict]:
+        """按时间倒序分页查询（阻塞，limit 不超过 MAX_PAGE）"""
+        limit = max(0, min(int(limit), self.MAX_PAGE))
+        return self._executor.submit(self._select, filters, max(0, int(offset)), limit).result()
+
+    def count(self, filters: Optional[Dict] = None) -> int:
+        """符合条件的记录数（阻塞）"""
+        return self._executor.submit(self._count, filters).result()
+
+    def close(self):
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        self._executor.submit(_close)
+        self._executor.shutdown(wait=True)
+
+    # QML
+    @Slot("QVariant", int, int, result=list)
+    def page(self, filters: Union[QJSValue, Dict, None], offset: int, limit: int) -> List[Dict]:
+        """分页查询（QML）：page({provider_id: "...", min_level: 1}, 0, 20)"""
+        return self.query(_to_dict(filters), offset, limit)
+
+    @Slot("QVariant", result=int)
+    def total(self, filters: Union[QJSValue, Dict, None]) -> int:
+        """符合条件的记录数（QML）"""
+        return self.count(_to_dict(filters))
+
+    @Slot()
+    def clear(self):
+        self._executor.submit(self._clear).result()
+
+
+def _to_dict(value) -> Optional[Dict]:
+    if isinstance(value, QJSValue):
+        value = value.toVariant()
+    return value if isinstance(value, dict) else None
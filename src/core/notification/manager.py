@@ -1,17 +1,21 @@
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Optional
 from threading import Lock
 
-from PySide6.QtCore import Signal, QObject, Slot
+from PySide6.QtCore import Signal, QObject, Slot, QTimer, Property
 from loguru import logger
 
 from src.core.notification import NotificationData, NotificationLevel, NotificationProviderConfig
+from src.core.notification.dispatcher import NotificationDispatchQueue, BackPressurePolicy
+from src.core.notification.history import NotificationHistory
 from src.core.notification.model import NotificationPayload
 
 
 class NotificationManager(QObject):
     notified = Signal(dict)
+    _wake = Signal()  # 任意线程入队后唤醒 GUI 线程分发
 
-    def __init__(self, config_manager, app_central=None):
+    def __init__(self, config_manager, app_central=None, history_path: Optional[Path] = None):
         super().__init__()
         self.providers: Dict[str, object] = {}
         self.configs = config_manager
@@ -19,6 +23,38 @@ class NotificationManager(QObject):
         self._qml_ready = False
         self._pending_notifications: List[dict] = []
         self._lock = Lock()
+        self._history = NotificationHistory(history_path, self)  # 未指定路径时仅保存在内存中
+
+        # 分发队列：优先级、限流、去重
+        self._queue = NotificationDispatchQueue()
+        self._queue_settings: Optional[tuple] = None  # 上次应用到队列的设置
+        self._drain_timer = QTimer(self)
+        self._drain_timer.setSingleShot(True)
+        self._drain_timer.timeout.connect(self._drain)
+        self._wake.connect(self._schedule_drain)
+        self._configure_queue()
+        if hasattr(config_manager, "sectionChanged"):
+            config_manager.sectionChanged.connect(
+                lambda section: section == "notifications" and self._configure_queue()
+            )
+
+    def _configure_queue(self):
+        """队列相关设置变化时重新配置（notifications 分区的其它修改如音量不影响队列）"""
+        cfg = self.configs.notifications
+        settings = (cfg.queue_size, cfg.rate_limit, cfg.rate_burst, cfg.coalesce_window, cfg.back_pressure)
+        if settings == self._queue_settings:
+            return
+        self._queue_settings = settings
+        try:
+            policy = BackPressurePolicy(cfg.back_pressure)
+        except ValueError:
+            logger.warning(f"Unknown notification back pressure policy: {cfg.back_pressure}")
+            policy = BackPressurePolicy.DROP_OLDEST
+        self._queue.configure(cfg.queue_size, cfg.rate_limit, cfg.rate_burst, cfg.coalesce_window, policy)
+
+    @Property(QObject, constant=True)
+    def history(self) -> NotificationHistory:
+        return self._history
 
     def register_provider(self, provider):
         if not hasattr(provider, "id") or not hasattr(provider, "name"):
@@ -78,9 +114,10 @@ class NotificationManager(QObject):
             self.notified.emit(payload)
 
     def dispatch(self, data: NotificationData, cfg=None):
-        # 记录通知分发信息
-        logger.info(f"Dispatching notification: {data.provider_id} - {data.title} (Level: {data.level})")
-
+        """
+        分发通知（可从任意线程调用）
+        通知先进入分发队列，由 GUI 线程按优先级与限流依次发送
+        """
         if cfg is None:
             cfg = self.configs.notifications.providers.get(data.provider_id)
         if cfg is None:
@@ -92,6 +129,27 @@ class NotificationManager(QObject):
         if not getattr(cfg, "enabled", True):
             return
 
+        if not self._queue.push(data, cfg):
+            logger.debug(f"Notification coalesced or dropped: {data.provider_id} - {data.title}")
+            return
+        self._wake.emit()
+
+    def _schedule_drain(self):
+        if not self._drain_timer.isActive() or self._drain_timer.remainingTime() > 0:
+            self._drain_timer.start(0)
+
+    def _drain(self):
+        items, wait = self._queue.pop_ready()
+        for item in items:
+            self._deliver(item.data, item.cfg)
+        if wait is not None:  # 仍有被限流的通知
+            self._drain_timer.start(int(wait * 1000) + 1)
+
+    def _deliver(self, data: NotificationData, cfg):
+        # 记录通知分发信息
+        logger.info(f"Dispatching notification: {data.provider_id} - {data.title} (Level: {data.level})")
+        self._history.record(data)
+
         payload = data.model_dump()
         payload: NotificationPayload
         use_system_notify = getattr(cfg, "use_system_notify", False)
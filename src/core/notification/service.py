@@ -1,9 +1,8 @@
-from PySide6.QtCore import QObject, Signal, Slot, QUrl
-from PySide6.QtMultimedia import QSoundEffect
+from PySide6.QtCore import QObject, Signal, Slot
 from pathlib import Path
 from loguru import logger
 
-from .model import NotificationProviderConfig
+from .sounds import SoundBank
 from src.core.directories import ASSETS_PATH
 
 
@@ -16,8 +15,13 @@ class NotificationService(QObject):
         super().__init__()
         self.notification_manager = notification_manager
         self.config_manager = config_manager
-        self._sound_effects = {}
-        
+        self._sound_bank = SoundBank(config_manager, self)  # 预加载、共享的铃声
+        self._sound_bank.preload()
+        if hasattr(config_manager, "sectionChanged"):
+            config_manager.sectionChanged.connect(
+                lambda section: section == "notifications" and self._sound_bank.refresh()
+            )
+
     @property
     def notificationProviders(self):
         """
@@ -30,27 +34,21 @@ class NotificationService(QObject):
         """
         设置特定通知提供者的启用状态
         """
-        if provider_id not in self.config_manager.notifications.providers:
-            self.config_manager.notifications.providers[provider_id] = NotificationProviderConfig()
-        self.config_manager.notifications.providers[provider_id].enabled = enabled
+        self.config_manager.notifications.provider(provider_id).enabled = enabled
 
     @Slot(str, bool)
     def setNotificationProviderSystemNotify(self, provider_id, use_system):
         """
         设置特定通知提供者是否使用系统通知
         """
-        if provider_id not in self.config_manager.notifications.providers:
-            self.config_manager.notifications.providers[provider_id] = NotificationProviderConfig()
-        self.config_manager.notifications.providers[provider_id].use_system_notify = use_system
+        self.config_manager.notifications.provider(provider_id).use_system_notify = use_system
 
     @Slot(str, bool)
     def setNotificationProviderAppNotify(self, provider_id, use_app):
         """
         设置特定通知提供者是否使用应用内通知
         """
-        if provider_id not in self.config_manager.notifications.providers:
-            self.config_manager.notifications.providers[provider_id] = NotificationProviderConfig()
-        self.config_manager.notifications.providers[provider_id].use_app_notify = use_app
+        self.config_manager.notifications.provider(provider_id).use_app_notify = use_app
 
     # === 声音管理方法 ===
     @Slot(int, str)
@@ -59,6 +57,7 @@ class NotificationService(QObject):
         if not hasattr(self.config_manager.notifications, 'level_sounds'):
             self.config_manager.notifications.level_sounds = {}
         self.config_manager.notifications.level_sounds[str(level)] = sound
+        self.config_manager.notifications._on_change()  # dict 修改不会触发通知，手动标记并重新加载铃声
         logger.debug(f"Set sound for level {level}: {sound}")
 
     @Slot(int, result=str)
@@ -137,55 +136,11 @@ class NotificationService(QObject):
 
     @Slot(str, int)
     def playNotificationSound(self, provider_id, level):
-        """播放通知级别对应的铃声"""
+        """播放通知级别对应的铃声（所有 Provider 共用预加载的铃声）"""
         try:
             if not self.getNotificationsEnabled():
                 return
-
-            # 获取全局级别声音配置
-            global_level_sounds = getattr(self.config_manager.notifications, 'level_sounds', {})
-            custom_sound = global_level_sounds.get(str(level), "")
-
-            # 根据级别设置默认声音文件
-            level_audio_mapping = {
-                0: "info.wav",      # INFO级别
-                1: "announcement.wav", # ANNOUNCEMENT级别
-                2: "warning.wav",   # WARNING级别
-                3: "system.wav",    # SYSTEM级别
-            }
-            audio_filename = level_audio_mapping.get(level, "info.wav")
-
-            # 如果配置了自定义声音文件路径，使用自定义路径
-            if custom_sound:
-                sound_file = custom_sound
-            else:
-                sound_file = str(ASSETS_PATH / "audio" / audio_filename)
-
-            # 检查声音文件是否存在
-            if not Path(sound_file).exists():
-                return
-
-            # 使用Qt的QSoundEffect播放声音
-            # 创建唯一的键来标识不同的声音效果
-            effect_key = f"{provider_id}_{level}"
-            
-            # 获取或创建声音效果对象
-            if effect_key not in self._sound_effects:
-                self._sound_effects[effect_key] = QSoundEffect()
-            
-            effect = self._sound_effects[effect_key]
-            
-            # 设置声音源
-            source_url = QUrl.fromLocalFile(sound_file)
-            effect.setSource(source_url)
-            
-            # 设置音量
-            volume = self.getNotificationVolume()
-            effect.setVolume(volume)
-            
-            # 播放声音
-            effect.play()
-            
+            self._sound_bank.play(level)
         except Exception as e:
             logger.error(f"Failed to play notification sound for provider {provider_id}, level {level}: {e}")
 
@@ -0,0 +1,135 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QUrl, QFileSystemWatcher
+from PySide6.QtMultimedia import QSoundEffect
+from loguru import logger
+
+from src.core.directories import ASSETS_PATH
+
+# 各通知级别的默认铃声
+LEVEL_AUDIO_MAPPING = {
+    0: "info.wav",  # INFO级别
+    1: "announcement.wav",  # ANNOUNCEMENT级别
+    2: "warning.wav",  # WARNING级别
+    3: "system.wav",  # SYSTEM级别
+}
+
+
+class SoundBank(QObject):
+    """
+    通知铃声库
+    每个不同的音频文件只解码一次（启动或配置变化时预加载），所有 Provider 共用；
+    每个文件有 VOICES 个 QSoundEffect 组成的声部池，允许重叠播放。
+    自定义铃声文件被修改时自动重新加载。
+    """
+    VOICES = 3
+
+    def __init__(self, config_manager, parent=None):
+        super().__init__(parent)
+        self.config_manager = config_manager
+        self._level_files: Dict[int, str] = {}  # level -> 文件路径
+        self._voices: Dict[str, List[QSoundEffect]] = {}  # 文件路径 -> 声部池
+        self._next_voice: Dict[str, int] = {}
+        self._volume: Optional[float] = None
+        self._level_sounds: Optional[Dict] = None  # 上次预加载时的 level_sounds 配置
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._reload_file)
+
+    def _resolve(self, level: int) -> str:
+        level_sounds = getattr(self.config_manager.notifications, "level_sounds", {}) or {}
+        custom_sound = level_sounds.get(str(level)) or level_sounds.get(level)  # 键可能是 str 或 int
+        if custom_sound:
+            return str(custom_sound)
+        return str(ASSETS_PATH / "audio" / LEVEL_AUDIO_MAPPING.get(level, "info.wav"))
+
+    def refresh(self):
+        """notifications 配置变化：铃声设置变化时重新预加载，否则只同步音量"""
+        level_sounds = dict(getattr(self.config_manager.notifications, "level_sounds", {}) or {})
+        if level_sounds != self._level_sounds:
+            self.preload()
+        else:
+            self.set_volume(getattr(self.config_manager.notifications, "volume", 1.0))
+
+    def preload(self):
+        """按当前配置解析各级别铃声并预加载，移除不再使用的文件"""
+        self._level_sounds = dict(getattr(self.config_manager.notifications, "level_sounds", {}) or {})
+        self._level_files.clear()
+        for level in LEVEL_AUDIO_MAPPING:
+            self._resolve_level(level)
+
+        used = set(self._level_files.values())
+        for sound_file in [f for f in self._voices if f not in used]:
+            for effect in self._voices.pop(sound_file):
+                effect.deleteLater()
+            self._next_voice.pop(sound_file, None)
+        self._load_files(used)
+
+        watched = self._watcher.files()
+        if watched:
+            self._watcher.removePaths(watched)
+        if used:
+            self._watcher.addPaths(sorted(used))
+        self.set_volume(getattr(self.config_manager.notifications, "volume", 1.0))
+
+    def _resolve_level(self, level: int) -> Optional[str]:
+        """解析级别对应的铃声文件并记录，文件不存在时返回 None"""
+        sound_file = self._resolve(level)
+        if not Path(sound_file).exists():
+            logger.warning(f"Notification sound not found for level {level}: {sound_file}")
+            return None
+        self._level_files[level] = sound_file
+        return sound_file
+
+    def _load_files(self, sound_files):
+        for sound_file in set(sound_files) - set(self._voices):
+            self._voices[sound_file] = [self._create_effect(sound_file) for _ in range(self.VOICES)]
+            self._next_voice[sound_file] = 0
+
+    def _create_effect(self, sound_file: str) -> QSoundEffect:
+        effect = QSoundEffect(self)
+        effect.setSource(QUrl.fromLocalFile(sound_file))
+        if self._volume is not None:
+            effect.setVolume(self._volume)
+        return effect
+
+    def _reload_file(self, sound_file: str):
+        """文件被替换 / 修改后重新解码"""
+        voices = self._voices.get(sound_file)
+        if voices is None:
+            return
+        logger.debug(f"Reloading notification sound: {sound_file}")
+        url = QUrl.fromLocalFile(sound_file)
+        for effect in voices:
+            effect.setSource(QUrl())
+            effect.setSource(url)
+        if Path(sound_file).exists() and sound_file not in self._watcher.files():
+            self._watcher.addPath(sound_file)  # 部分编辑器以替换文件的方式保存
+
+    def set_volume(self, volume: float):
+        if volume == self._volume:
+            return
+        self._volume = volume
+        for voices in self._voices.values():
+            for effect in voices:
+                effect.setVolume(volume)
+
+    def play(self, level: int):
+        """播放指定级别的铃声（使用空闲声部，全部占用时复用最早的声部）"""
+        sound_file = self._level_files.get(level)
+        if sound_file is None:  # 未预加载的级别：自定义铃声或 info.wav
+            sound_file = self._resolve_level(level)
+            if sound_file is None:
+                return
+            self._load_files([sound_file])
+            if sound_file not in self._watcher.files():
+                self._watcher.addPath(sound_file)
+        voices = self._voices[sound_file]
+        effect = next((e for e in voices if not e.isPlaying()), None)
+        if effect is None:
+            index = self._next_voice[sound_file]
+            self._next_voice[sound_file] = (index + 1) % len(voices)
+            effect = voices[index]
+            effect.stop()
+        effect.play()
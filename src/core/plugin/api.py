@@ -42,6 +42,12 @@ class PluginAPI:
         """获取当前插件"""
         return self._current_plugin
 
+    def disconnect_plugin(self, plugin_id: str) -> int:
+        """断开某个插件连接到 API 信号的全部槽（停用插件时使用）"""
+        components = (self.widgets, self.notification, self.schedule, self.theme,
+                      self.runtime, self.config, self.automation, self.ui)
+        return sum(component.disconnect_plugin(plugin_id) for component in components)
+
 
 class CW2Plugin(QObject):
     """所有插件的基类"""
@@ -0,0 +1,461 @@
+"""
+隔离模式插件的子进程入口（app.py --plugin-host <server> <plugin_id>）
+在子进程中提供与 PluginAPI 相同接口的代理，调用以消息转发给宿主，运行时状态由宿主以增量推送。
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Signal, Slot
+from PySide6.QtNetwork import QLocalSocket
+from loguru import logger
+
+from src.core.config.model import ConfigBaseModel
+from src.core.plugin.api import PluginAPI
+from src.core.plugin.components import BaseAPI
+from src.core.plugin.ipc import MessageChannel
+from src.core.schedule.model import ScheduleData
+
+CONNECT_TIMEOUT_MS = 5000
+STATS_INTERVAL_MS = 2000  # 向宿主报告 CPU / 内存占用的间隔
+
+
+def process_memory() -> int:
+    """当前进程的常驻内存（字节），无法获取时返回 0"""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class ProcessMemoryCounters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return 0
+            return counters.WorkingSetSize
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # macOS：峰值，单位为字节
+    except Exception:
+        return 0
+
+
+def _jsonable(value):
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class ObjectMirror(QObject):
+    """把 QObject 的属性同步到宿主的 RemoteBackend（属性的 notify 信号触发时发送变化的部分）"""
+
+    def __init__(self, channel: MessageChannel, handle: str, obj: QObject):
+        super().__init__(obj)
+        self.channel = channel
+        self.handle = handle
+        self.obj = obj
+        self._values: Dict = {}
+        self._scheduled = False
+
+        meta_object = obj.metaObject()
+        self._names = []
+        for i in range(QObject.staticMetaObject.propertyCount(), meta_object.propertyCount()):
+            prop = meta_object.property(i)
+            self._names.append(prop.name())
+            if prop.hasNotifySignal():
+                signal = getattr(obj, prop.notifySignal().name().data().decode(), None)
+                if signal is not None:
+                    signal.connect(self._schedule)
+        self.push()
+
+    def _schedule(self, *args):
+        if not self._scheduled:  # 同一轮事件循环内的多次变化合并发送
+            self._scheduled = True
+            QTimer.singleShot(0, self.push)
+
+    def push(self):
+        self._scheduled = False
+        values = {name: _jsonable(self.obj.property(name)) for name in self._names}
+        delta = {k: v for k, v in values.items() if k not in self._values or self._values[k] != v}
+        self._values = values
+        if delta:
+            self.channel.send("backend", handle=self.handle, data=delta)
+
+    def call(self, method: str, args: List):
+        getattr(self.obj, method)(*args)
+
+
+def _field(name: str, default=None):
+    return property(lambda self: self._state.get(name, default))
+
+
+class RemoteWidgetsAPI(BaseAPI):
+    def register(self, widget_id: str, name: str, qml_path: Union[str, Path],
+                 backend_obj: QObject = None,
+                 settings_qml: Optional[Union[str, Path]] = None,
+                 default_settings: Optional[dict] = None):
+        if not self.current_plugin:
+            raise ValueError("No plugin context available. Make sure this method is called within a plugin.")
+        # 先发送注册消息，宿主收到镜像数据前已创建对应的 RemoteBackend
+        self._plugin_api.channel.send(
+            "widgets.register",
+            widget_id=widget_id, name=name,
+            qml_path=str(self._resolve_path(qml_path)),
+            settings_qml=str(self._resolve_path(settings_qml)) if settings_qml else None,
+            default_settings=default_settings,
+            backend=widget_id if backend_obj is not None else None,
+        )
+        if backend_obj is not None:
+            self._plugin_api.mirror(widget_id, backend_obj)
+
+
+class RemoteNotificationProvider(QObject):
+    """宿主中 NotificationProvider 的代理"""
+
+    def __init__(self, channel: MessageChannel, id: str, name: str, icon=None, use_system_notify: bool = False):
+        super().__init__()
+        self.channel = channel
+        self.id = id
+        self.name = name
+        self.icon = icon
+        self.use_system_notify = use_system_notify
+
+    @Slot(int, str, str, int, bool, result=None)
+    def push(self, level: int, title: str, message: Optional[str] = None,
+             duration: int = 4000, closable: bool = True):
+        self.channel.send(
+            "notification.push", provider_id=self.id, level=int(level), title=title,
+            message=message, duration=duration, closable=closable
+        )
+
+
+class RemoteNotificationAPI(BaseAPI):
+    pushed = Signal(dict)
+
+    def get_provider(self, provider_id: str, name: str = None,
+                     icon: Union[str, Path] = None, use_system_notify: bool = False) -> RemoteNotificationProvider:
+        return self.register_provider(provider_id, name, icon, use_system_notify)
+
+    def register_provider(self, provider_id: str, name: str = None,
+                          icon: Union[str, Path] = None, use_system_notify: bool = False) -> RemoteNotificationProvider:
+        if not self.current_plugin:
+            raise ValueError("No plugin context available. Make sure this method is called within a plugin.")
+        if name is None:
+            name = f"Plugin Provider ({provider_id})"
+        if icon:
+            icon = str(self._resolve_path(icon))
+        channel = self._plugin_api.channel
+        channel.send(
+            "notification.provider", provider_id=provider_id, name=name, icon=icon,
+            use_system_notify=use_system_notify
+        )
+        return RemoteNotificationProvider(channel, provider_id, name, icon, use_system_notify)
+
+    def history(self, provider_id: Optional[str] = None, min_level: Optional[int] = None,
+                since: Optional[datetime] = None, until: Optional[datetime] = None,
+                offset: int = 0, limit: int = 50) -> List[Dict]:
+        filters = {
+            "provider_id": provider_id,
+            "min_level": min_level,
+            "since": since.timestamp() if since else None,
+            "until": until.timestamp() if until else None,
+        }
+        return self._plugin_api.channel.request("notification.history", filters=filters, offset=offset, limit=limit)
+
+
+class RemoteScheduleAPI(BaseAPI):
+    def get(self) -> Optional[ScheduleData]:
+        """当前课表的副本（同步请求，修改不会同步回主程序）"""
+        data = self._plugin_api.channel.request("schedule.get")
+        return ScheduleData.model_validate(data) if data is not None else None
+
+    def reload(self):
+        self._plugin_api.channel.send("schedule.reload")
+
+
+class RemoteThemeAPI(BaseAPI):
+    changed = Signal(str)
+
+    def __init__(self, plugin_api, theme: Optional[str]):
+        super().__init__(plugin_api)
+        self._theme = theme
+        self.changed.connect(self._on_changed)
+
+    def _on_changed(self, theme: str):
+        self._theme = theme
+
+    def current(self) -> Optional[str]:
+        return self._theme
+
+
+class RemoteRuntimeAPI(BaseAPI):
+    """RuntimeAPI 的代理，属性读取宿主推送的状态（不访问宿主）"""
+    updated = Signal()
+    statusChanged = Signal(str)
+    entryChanged = Signal(dict)
+    boundaryReached = Signal()
+
+    def __init__(self, plugin_api, state: dict):
+        super().__init__(plugin_api)
+        self._state = dict(state)
+
+    def apply(self, delta: dict, full: bool = False):
+        if full:
+            self._state.clear()
+        self._state.update(delta)
+
+    @property
+    def current_time(self) -> Optional[datetime]:
+        value = self._state.get("current_time")
+        return datetime.fromisoformat(value) if value else None
+
+    current_day_of_week = _field("current_day_of_week")
+    current_week = _field("current_week")
+    current_week_of_cycle = _field("current_week_of_cycle")
+    time_offset = _field("time_offset", 0)
+    schedule_meta = _field("schedule_meta")
+    current_day_entries = _field("current_day_entries", [])
+    current_entry = _field("current_entry")
+    next_entries = _field("next_entries", [])
+    remaining_time = _field("remaining_time", {"minute": 0, "second": 0})
+    progress = _field("progress", 0.0)
+    current_status = _field("current_status")
+    current_subject = _field("current_subject")
+    current_title = _field("current_title")
+
+
+class RemoteConfigAPI(BaseAPI):
+    def __init__(self, plugin_api):
+        super().__init__(plugin_api)
+        self._plugin_models: Dict[str, ConfigBaseModel] = {}
+        self._batching = 0
+        self._pending = set()
+
+    def register_plugin_model(self, plugin_id: str, model: ConfigBaseModel):
+        saved_config = self._plugin_api.channel.request("config.get", plugin_id=plugin_id)
+        if saved_config is not None:
+            try:
+                validated = type(model).model_validate(saved_config)
+                for field in model.__fields__:
+                    if hasattr(validated, field):
+                        setattr(model, field, getattr(validated, field))
+            except Exception as e:
+                logger.warning(f"Failed to load saved config for {plugin_id}: {e}")
+        self._plugin_models[plugin_id] = model
+        original_on_change = getattr(model, '_on_change', None)
+
+        def _sync_to_host():
+            if original_on_change:
+                try:
+                    original_on_change()
+                except Exception as e:
+                    logger.error(f"Error in original _on_change for {plugin_id}: {e}")
+            if self._batching:
+                self._pending.add(plugin_id)
+            else:
+                self._send(plugin_id)
+
+        model._on_change = _sync_to_host
+        model._on_change()
+
+    def _send(self, plugin_id: str):
+        model = self._plugin_models[plugin_id]
+        self._plugin_api.channel.send("config.update", plugin_id=plugin_id, data=model.model_dump(mode="json"))
+
+    def get_plugin_model(self, plugin_id: str) -> Optional[ConfigBaseModel]:
+        return self._plugin_models.get(plugin_id)
+
+    @contextmanager
+    def batch(self):
+        """配置事务：with 块内的多次修改只同步一次"""
+        self._batching += 1
+        try:
+            yield
+        finally:
+            self._batching -= 1
+            if not self._batching:
+                pending, self._pending = self._pending, set()
+                for plugin_id in pending:
+                    self._send(plugin_id)
+
+    def save(self):
+        self._plugin_api.channel.send("config.save")
+
+
+class RemoteAutomationAPI(BaseAPI):
+    """自动化任务在插件进程中运行，由宿主每次 tick 的消息驱动"""
+
+    def __init__(self, plugin_api):
+        super().__init__(plugin_api)
+        self.tasks: Dict[str, QObject] = {}
+
+    def register(self, task):
+        self.tasks[task.name] = task
+
+    def update(self):
+        for task in list(self.tasks.values()):
+            if not getattr(task, "enabled", True):
+                continue
+            try:
+                task.update()
+            except Exception as e:
+                logger.error(f"Error executing task '{task.name}': {e}")
+
+
+class RemoteUiAPI(BaseAPI):
+    settingsPageRegistered = Signal()
+
+    def __init__(self, plugin_api):
+        super().__init__(plugin_api)
+        self._registered_pages: list = []
+
+    @property
+    def pages(self):
+        return self._registered_pages
+
+    def unregister_settings_page(self, qml_path: Union[str, Path]):
+        page = str(self._resolve_path(qml_path))
+        self._registered_pages = [p for p in self._registered_pages if p["page"] != page]
+        self._plugin_api.channel.send("ui.settings_page", page=page, remove=True)
+        self.settingsPageRegistered.emit()
+
+    def register_settings_page(self, qml_path: Union[str, Path], title: str | None = None, icon: str | None = None):
+        if not self.current_plugin:
+            raise ValueError("No plugin context available. Make sure this method is called within a plugin.")
+        page = str(self._resolve_path(qml_path))
+        self._registered_pages.append({"id": self.current_plugin.meta.get("id"), "page": page, "title": title, "icon": icon})
+        self._plugin_api.channel.send("ui.settings_page", page=page, title=title, icon=icon)
+        self.settingsPageRegistered.emit()
+
+
+class IsolatedPluginAPI(PluginAPI):
+    """插件进程中的 PluginAPI：接口与宿主相同，实现为代理"""
+
+    def __init__(self, channel: MessageChannel, init: dict):
+        self._app = None
+        self._current_plugin = None
+        self.channel = channel
+        self._mirrors: Dict[str, ObjectMirror] = {}
+
+        self.widgets = RemoteWidgetsAPI(self)
+        self.notification = RemoteNotificationAPI(self)
+        self.schedule = RemoteScheduleAPI(self)
+        self.theme = RemoteThemeAPI(self, init.get("theme"))
+        self.runtime = RemoteRuntimeAPI(self, init.get("state") or {})
+        self.config = RemoteConfigAPI(self)
+        self.automation = RemoteAutomationAPI(self)
+        self.ui = RemoteUiAPI(self)
+
+    def mirror(self, handle: str, obj: QObject):
+        self._mirrors[handle] = ObjectMirror(self.channel, handle, obj)
+
+
+class PluginProcess(QObject):
+    """插件进程：加载插件并处理宿主的消息"""
+
+    def __init__(self, channel: MessageChannel, init: dict):
+        super().__init__()
+        self.channel = channel
+        self.meta = dict(init["meta"])
+        self.meta["_path"] = Path(self.meta["_path"])
+        self.api = IsolatedPluginAPI(channel, init)
+        self.plugin = None
+
+        channel.received.connect(self._on_message)
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setInterval(STATS_INTERVAL_MS)
+        self._stats_timer.timeout.connect(self._send_stats)
+
+    def load(self) -> bool:
+        from src.core.plugin.loader import PluginLoader
+
+        loader = PluginLoader(self.api, self.meta["_path"].parent)
+        self.plugin = loader.load_plugin(self.meta)
+        if self.plugin is None:
+            self.channel.send("failed", error="see plugin process log")
+            self.channel.flush()
+            return False
+        self.api.mirror("plugin", self.plugin)
+        self.channel.send("loaded")
+        self._send_stats()
+        self._stats_timer.start()
+        return True
+
+    def _send_stats(self):
+        self.channel.send("stats", cpu_time=time.process_time(), rss=process_memory())
+
+    def _on_message(self, message: dict):
+        op = message.get("op")
+        try:
+            if op == "state":
+                self.api.runtime.apply(message.get("delta") or {}, message.get("full", False))
+            elif op == "tick":
+                self.api.automation.update()
+            elif op == "event":
+                component, signal = message["name"].split(".", 1)
+                getattr(getattr(self.api, component), signal).emit(*message.get("args", []))
+            elif op == "call":
+                mirror = self.api._mirrors.get(message["handle"])
+                if mirror is not None:
+                    mirror.call(message["method"], message.get("args") or [])
+            elif op == "shutdown":
+                self.shutdown()
+        except Exception as e:
+            logger.exception(f"Failed to handle host message '{op}': {e}")
+
+    def shutdown(self):
+        self._stats_timer.stop()
+        if self.plugin is not None:
+            try:
+                self.plugin.on_unload()
+            except Exception as e:
+                logger.error(f"Plugin {self.meta['id']} on_unload raised: {e}")
+            self.plugin = None
+        self.channel.close()
+        QCoreApplication.quit()
+
+
+def main(argv: List[str]) -> int:
+    """:param argv: [server_name, plugin_id]"""
+    server_name, plugin_id = argv[:2]
+    app = QCoreApplication(sys.argv[:1])
+
+    socket = QLocalSocket()
+    socket.connectToServer(server_name)
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        logger.error(f"Plugin host {plugin_id}: cannot connect to {server_name}: {socket.errorString()}")
+        return 2
+    channel = MessageChannel(socket)
+    channel.closed.connect(app.quit)  # 宿主退出或断开时随之退出
+
+    try:
+        init = channel.request("hello", plugin_id=plugin_id, os_pid=os.getpid())
+    except Exception as e:
+        logger.error(f"Plugin host {plugin_id}: handshake failed: {e}")
+        return 2
+
+    process = PluginProcess(channel, init)
+    if not process.load():
+        return 1
+    code = app.exec()
+    if process.plugin is not None:  # 未收到 shutdown 就断开
+        process.shutdown()
+    return code
@@ -1,14 +1,16 @@
+import inspect
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Union, cast
+from typing import Optional, List, Dict, Union, Callable, cast
 from datetime import datetime
-from PySide6.QtCore import Signal, QObject
+from PySide6.QtCore import Signal, QObject, SignalInstance
 from loguru import logger
 
 from src.core.config.model import ConfigBaseModel, PluginsConfig
 from src.core.plugin.bridge import PluginBackendBridge
 from src.core.notification import NotificationProvider
 from src.core.schedule.model import EntryType
+from src.core.utils.profiler import plugin_profiler
 
 from src.core.plugin.models import (
     PluginNotificationPayload,
@@ -26,6 +28,69 @@ if TYPE_CHECKING:
     from src.core.plugin.api import PluginAPI
 
 
+def _positional_arity(func: Callable) -> Optional[int]:
+    """可接受的位置参数个数（*args 时为 None）"""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    count = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            return None
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            count += 1
+    return count
+
+
+class PluginSignal:
+    """
+    提供给插件连接的信号（包装 Qt 信号，用法相同）
+    插件代码中的槽耗时计入该插件；停用插件时可断开它的全部连接
+    """
+    __slots__ = ("_signal", "_name", "_connections")
+
+    def __init__(self, signal: SignalInstance, name: str):
+        self._signal = signal
+        self._name = name
+        self._connections: List[tuple] = []  # (slot, plugin_id, 实际连接的函数)
+
+    def connect(self, slot, *args, **kwargs):
+        plugin_id = plugin_profiler.owner_of(slot) if callable(slot) else None
+        if plugin_id is None:
+            return self._signal.connect(slot, *args, **kwargs)
+        arity = _positional_arity(slot)
+        # 与 Qt 一样，槽可以少接收信号的参数
+        target = slot if arity is None else (lambda *values: slot(*values[:arity]))
+        wrapper = plugin_profiler.wrap(plugin_id, f"signal {self._name}", target)
+        self._connections.append((slot, plugin_id, wrapper))
+        return self._signal.connect(wrapper, *args, **kwargs)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self._connections.clear()
+            return self._signal.disconnect()
+        for connection in self._connections:
+            if connection[0] == slot:
+                self._connections.remove(connection)
+                return self._signal.disconnect(connection[2])
+        return self._signal.disconnect(slot)
+
+    def disconnect_plugin(self, plugin_id: str) -> int:
+        """断开某个插件的全部连接"""
+        removed = [c for c in self._connections if c[1] == plugin_id]
+        for connection in removed:
+            self._connections.remove(connection)
+            try:
+                self._signal.disconnect(connection[2])
+            except (RuntimeError, TypeError):
+                pass
+        return len(removed)
+
+    def emit(self, *args):
+        self._signal.emit(*args)
+
+
 class BaseAPI(QObject):
     """所有API类的基类，提供通用的方法和属性"""
 
@@ -42,6 +107,17 @@ class BaseAPI(QObject):
         """获取当前插件"""
         return self._plugin_api.current_plugin
     
+    def _plugin_signals(self, *names: str):
+        """把这些信号替换为 PluginSignal（在实例上，类上的 Qt 信号不变）"""
+        for name in names:
+            setattr(self, name, PluginSignal(getattr(self, name), name))
+
+    def disconnect_plugin(self, plugin_id: str) -> int:
+        return sum(
+            value.disconnect_plugin(plugin_id)
+            for value in vars(self).values() if isinstance(value, PluginSignal)
+        )
+
     def _resolve_path(self, path: Union[str, Path]) -> Path:
         """统一的路径解析方法"""
         path = Path(path)
@@ -69,6 +145,10 @@ class WidgetsAPI(BaseAPI):
         settings_qml_processed = None
         if settings_qml:
             settings_qml_processed = self._resolve_path(settings_qml)
+
+        plugin_id = getattr(self.current_plugin, "pid", None) or self.current_plugin.meta.get("id")
+        if backend_obj is not None and plugin_id:
+            plugin_profiler.instrument(backend_obj, plugin_id)  # QML 调用后端槽的耗时
         
         self._app.widgets_model.add_widget(
             widget_id, name, qml_path, backend_obj, settings_qml_processed, default_settings
@@ -81,6 +161,7 @@ class NotificationAPI(BaseAPI):
     def __init__(self, plugin_api: "PluginAPI"):
         super().__init__(plugin_api)
         self._plugin_api._app.notification.notified.connect(self.pushed)
+        self._plugin_signals("pushed")
 
     def get_provider(
             self, provider_id: str, name: str = None,
@@ -122,6 +203,25 @@ class NotificationAPI(BaseAPI):
         logger.debug(f"Created notification provider: {provider_id} with icon: {icon}")
         return provider
 
+    def history(
+            self, provider_id: Optional[str] = None, min_level: Optional[int] = None,
+            since: Optional[datetime] = None, until: Optional[datetime] = None,
+            offset: int = 0, limit: int = 50
+    ) -> List[Dict]:
+        """
+        查询通知历史（按时间倒序分页，每页最多 200 条；在 GUI 线程中调用时会等待查询完成）
+
+        returns:
+            List[Dict]: 通知记录（id, timestamp, provider_id, level, title, message, icon）
+        """
+        filters = {
+            "provider_id": provider_id,
+            "min_level": min_level,
+            "since": since.timestamp() if since else None,
+            "until": until.timestamp() if until else None,
+        }
+        return self._app.notification.history.query(filters, offset, limit)
+
 
 class ScheduleAPI(BaseAPI):
     def get(self):
@@ -142,6 +242,7 @@ class ThemeAPI(BaseAPI):
             self.changed.emit(theme_id)
         
         self._plugin_api._app.themeManager.themeChanged.connect(on_theme_changed)
+        self._plugin_signals("changed")
 
     def current(self) -> Optional[str]:
         return self._app.themeManager.current_theme
@@ -152,12 +253,16 @@ class RuntimeAPI(BaseAPI):
     updated = Signal()       # 课表/时间更新
     statusChanged = Signal(str)  # 当前日程状态变化
     entryChanged = Signal(dict)  # 当前 Entry 更新（RuntimeEntryChangedPayload）
+    boundaryReached = Signal()  # 到达日程边界（上下课/预备铃），不需要每秒更新的插件可只监听此信号
 
     def __init__(self, plugin_api):
         super().__init__(plugin_api)
         self._runtime = self._app.runtime
-        self._runtime.updated.connect(self._on_runtime_updated)
+        self._runtime.updated.connect(self.updated.emit)
+        self._runtime.entryChanged.connect(self._on_entry_changed)
+        self._app.union_update_timer.boundary.connect(self.boundaryReached.emit)
         self._runtime.currentsChanged.connect(lambda t: self.statusChanged.emit(t.value))
+        self._plugin_signals("updated", "statusChanged", "entryChanged", "boundaryReached")
 
     # ------------------- 时间 -------------------
     @property
@@ -230,8 +335,7 @@ class RuntimeAPI(BaseAPI):
     def current_title(self) -> Optional[str]:
         return self._runtime.current_title
 
-    def _on_runtime_updated(self):
-        self.updated.emit()
+    def _on_entry_changed(self):
         payload = cast(RuntimeEntryChangedPayload, self.current_entry or {})
         self.entryChanged.emit(payload)
 
@@ -272,10 +376,13 @@ class ConfigAPI(BaseAPI):
                 except Exception as e:
                     logger.error(f"Error in original _on_change for {plugin_id}: {e}")
 
-            # 同步到 ConfigManager
+            # 同步到 ConfigManager（事务中合并为提交时的一次 model_dump）
+            self._cm.defer(f"plugin:{plugin_id}", _dump_to_config_manager)
+
+        def _dump_to_config_manager():
             try:
                 self._cm.plugins.configs[plugin_id] = model.model_dump()
-                self._cm._config._on_change()
+                self._cm.plugins._on_change()
             except Exception as e:
                 logger.error(f"Failed to sync config for {plugin_id}: {e}")
         model._on_change = _sync_to_config_manager
@@ -286,6 +393,12 @@ class ConfigAPI(BaseAPI):
     def get_plugin_model(self, plugin_id: str) -> Optional[ConfigBaseModel]:
         return self._plugin_models.get(plugin_id)
 
+    def batch(self):
+        """
+        配置事务：with 块内的多次修改只触发一次通知和一次保存
+        """
+        return self._cm.batch()
+
     def save(self):
         return self._cm.save()
 
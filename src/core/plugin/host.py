@@ -0,0 +1,501 @@
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, Signal, Slot, Property, QProcess, QTimer, QCoreApplication
+from PySide6.QtNetwork import QLocalServer
+from loguru import logger
+
+from src.core.directories import SRC_PATH
+from src.core.notification import NotificationData, NotificationLevel
+from src.core.plugin.bridge import PluginBackendBridge
+from src.core.plugin.ipc import MessageChannel
+
+# 同步给插件进程的 RuntimeAPI 属性
+RUNTIME_FIELDS = (
+    "current_time", "current_day_of_week", "current_week", "current_week_of_cycle", "time_offset",
+    "schedule_meta", "current_day_entries", "current_entry", "next_entries",
+    "remaining_time", "progress", "current_status", "current_subject", "current_title",
+)
+# 转发给插件进程的信号：事件名 -> (PluginAPI 组件, 信号名)
+FORWARDED_EVENTS = {
+    "runtime.updated": ("runtime", "updated"),
+    "runtime.statusChanged": ("runtime", "statusChanged"),
+    "runtime.entryChanged": ("runtime", "entryChanged"),
+    "runtime.boundaryReached": ("runtime", "boundaryReached"),
+    "theme.changed": ("theme", "changed"),
+    "notification.pushed": ("notification", "pushed"),
+}
+
+
+def host_command(server_name: str, plugin_id: str) -> Tuple[str, List[str]]:
+    """启动插件进程的命令（打包后直接运行主程序，开发环境运行入口脚本）"""
+    frozen = getattr(sys, "frozen", False) or "__compiled__" in globals()
+    args = [] if frozen else [str(SRC_PATH / "app.py")]
+    return sys.executable, [*args, "--plugin-host", server_name, plugin_id]
+
+
+def _plain_meta(meta: dict) -> dict:
+    """可序列化的 meta（Path / QUrl 转为字符串）"""
+    return {k: v if isinstance(v, (str, int, float, bool, list, dict, type(None))) else str(v)
+            for k, v in meta.items()}
+
+
+class RemoteBackend(QObject):
+    """
+    插件进程中 QObject 的镜像（供 QML 使用）
+    data 为其属性的快照，call() 把调用转发给插件进程（异步，无返回值）
+    """
+    dataChanged = Signal()
+
+    def __init__(self, plugin: "IsolatedPlugin", handle: str):
+        super().__init__(plugin)
+        self._plugin = plugin
+        self._handle = handle
+        self._data: Dict = {}
+
+    @Property("QVariant", notify=dataChanged)
+    def data(self):
+        return self._data
+
+    def update(self, values: dict):
+        self._data = {**self._data, **values}
+        self.dataChanged.emit()
+
+    @Slot(str)
+    @Slot(str, "QVariant")
+    def call(self, method: str, args=None):
+        if hasattr(args, "toVariant"):
+            args = args.toVariant()
+        if args is None:
+            args = []
+        elif not isinstance(args, list):
+            args = [args]
+        self._plugin.send("call", handle=self._handle, method=method, args=args)
+
+
+class IsolatedPlugin(QObject):
+    """
+    运行在独立进程中的插件（宿主端）
+    同时作为 PluginAPI 的插件上下文（提供 PATH / meta），代插件调用真实的 API。
+    """
+    stateChanged = Signal(str)
+
+    MAX_BACKLOG = 1024 * 1024  # 插件进程积压未读的数据超过此值时暂停推送，恢复后重发完整状态
+    MAX_RESTARTS = 3  # 崩溃后自动重启的次数
+    RESTART_DELAY_MS = 2000  # 首次重启的延迟，之后每次翻倍
+    STABLE_MS = 60 * 1000  # 运行超过此时长后重置重启计数
+    SHUTDOWN_TIMEOUT_MS = 3000
+
+    def __init__(self, host: "PluginHost", meta: dict):
+        super().__init__(host)
+        self.host = host
+        self.api = host.api
+        self.meta = meta
+        self.PATH = Path(meta["_path"])
+        self.pid = meta["id"]
+        self.state = "stopped"
+        self.restarts = 0
+        self.channel: Optional[MessageChannel] = None
+        self.backends: Dict[str, RemoteBackend] = {}
+        self.providers: Dict[str, QObject] = {}
+        self.stats = {"os_pid": None, "cpu_time": 0.0, "cpu_percent": 0.0, "rss": 0, "started_at": None}
+        self.stale = False  # 积压期间跳过了状态推送
+        self._stopping = False
+        self._dispose = False
+        self._last_sample: Optional[Tuple[float, float]] = None  # (wall, cpu)
+
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._on_connection)
+        self._process = QProcess(self)
+        self._process.setProcessChannelMode(QProcess.ProcessChannelMode.ForwardedChannels)
+        self._process.finished.connect(self._on_finished)
+        self._process.errorOccurred.connect(self._on_process_error)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            self.state = state
+            self.stateChanged.emit(state)
+
+    # ---------------- 进程 ----------------
+    def start(self):
+        if self._process.state() != QProcess.ProcessState.NotRunning:
+            return
+        self._stopping = False
+        self.stale = False
+        self._last_sample = None
+        server_name = f"cw-plugin-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        QLocalServer.removeServer(server_name)
+        if not self._server.listen(server_name):
+            logger.error(f"Plugin {self.pid}: failed to listen on {server_name}: {self._server.errorString()}")
+            self._set_state("failed")
+            return
+        program, args = host_command(server_name, self.pid)
+        logger.info(f"Starting isolated plugin {self.meta['name']} ({self.pid})")
+        self._set_state("starting")
+        self._process.start(program, args)
+
+    def stop(self, dispose: bool = False):
+        """
+        请求插件进程退出（on_unload 在插件进程中执行），超时后强制结束；不等待进程退出
+        :param dispose: 进程退出后删除本对象
+        """
+        self._stopping = True
+        self._dispose = self._dispose or dispose
+        if self._process.state() == QProcess.ProcessState.NotRunning:
+            self._set_state("stopped")
+            if self._dispose:
+                self.deleteLater()
+            return
+        if self.channel is not None and self.channel.connected:
+            self.channel.send("shutdown")
+            self.channel.flush()
+        else:  # 尚未连接，无法通知插件
+            self._process.kill()
+            return
+        QTimer.singleShot(self.SHUTDOWN_TIMEOUT_MS, self, self._kill)
+
+    def wait_finished(self, timeout_ms: int) -> bool:
+        """阻塞等待进程退出（只在程序退出时使用）"""
+        if self._process.state() == QProcess.ProcessState.NotRunning:
+            return True
+        return self._process.waitForFinished(max(0, timeout_ms))
+
+    def _kill(self):
+        if self._process.state() != QProcess.ProcessState.NotRunning:
+            logger.warning(f"Isolated plugin {self.pid} did not exit in time, killing")
+            self._process.kill()
+
+    def _on_connection(self):
+        socket = self._server.nextPendingConnection()
+        if socket is None:
+            return
+        if self.channel is not None:
+            self.channel.deleteLater()
+        self.channel = MessageChannel(socket, self)
+        self.channel.received.connect(self._on_message)
+        self._server.close()  # 每个进程只接受一个连接
+
+    def _on_process_error(self, error: QProcess.ProcessError):
+        if error == QProcess.ProcessError.FailedToStart:
+            logger.error(f"Isolated plugin {self.pid} failed to start: {self._process.errorString()}")
+            self._server.close()
+            self._set_state("failed")
+
+    def _on_finished(self, exit_code: int, exit_status: QProcess.ExitStatus):
+        self._server.close()
+        if self.channel is not None:
+            self.channel.deleteLater()
+            self.channel = None
+        self.stats["os_pid"] = None
+
+        if self._stopping:
+            self._set_state("stopped")
+            if self._dispose:
+                self.deleteLater()
+            return
+        if self.state == "failed":  # 插件本身加载失败，不重启
+            return
+
+        uptime = time.time() - (self.stats["started_at"] or time.time())
+        if uptime * 1000 > self.STABLE_MS:
+            self.restarts = 0
+        crashed = exit_status == QProcess.ExitStatus.CrashExit
+        logger.error(
+            f"Isolated plugin {self.pid} exited unexpectedly "
+            f"({'crashed' if crashed else f'exit code {exit_code}'}, after {uptime:.0f} s)"
+        )
+        self._set_state("crashed")
+        if self.restarts < self.MAX_RESTARTS:
+            delay = self.RESTART_DELAY_MS * 2 ** self.restarts
+            self.restarts += 1
+            logger.info(f"Restarting isolated plugin {self.pid} in {delay} ms ({self.restarts}/{self.MAX_RESTARTS})")
+            QTimer.singleShot(delay, self.start)
+        else:
+            self.host.report_crash(self)
+
+    # ---------------- 发送 ----------------
+    def send(self, op: str, **fields):
+        if self.channel is not None and self.state == "running":
+            self.channel.send(op, **fields)
+
+    def push_state(self, delta: dict, full: dict) -> bool:
+        """
+        推送运行时状态增量；插件进程未就绪（加载中）或积压过多时跳过（返回 False），
+        之后第一次推送改发完整状态
+        """
+        if self.channel is None or self.state != "running":
+            self.stale = True
+            return False
+        if self.channel.backlog > self.MAX_BACKLOG:
+            if not self.stale:
+                logger.warning(f"Isolated plugin {self.pid} is not reading messages, pausing updates")
+            self.stale = True
+            return False
+        if self.stale:
+            self.stale = False
+            self.channel.send("state", delta=full, full=True)
+        elif delta:
+            self.channel.send("state", delta=delta)
+        return True
+
+    # ---------------- 处理插件进程的消息 ----------------
+    @contextmanager
+    def _context(self):
+        """以本插件的身份调用 PluginAPI"""
+        previous = self.api.current_plugin
+        self.api.set_current_plugin(self)
+        try:
+            yield
+        finally:
+            self.api.set_current_plugin(previous)
+
+    def _backend(self, handle: Optional[str]) -> Optional[RemoteBackend]:
+        if not handle:
+            return None
+        backend = self.backends.get(handle)
+        if backend is None:
+            backend = self.backends[handle] = RemoteBackend(self, handle)
+        return backend
+
+    def _on_message(self, message: dict):
+        op = message.get("op")
+        handler = self._handlers.get(op)
+        if handler is None:
+            logger.debug(f"Isolated plugin {self.pid}: unknown message '{op}'")
+            return
+        try:
+            result = handler(self, message)
+            if "id" in message:
+                self.channel.reply(message, result)
+        except Exception as e:
+            logger.exception(f"Isolated plugin {self.pid}: failed to handle '{op}': {e}")
+            if "id" in message and self.channel is not None:
+                self.channel.reply(message, error=str(e))
+
+    def _on_hello(self, message: dict) -> dict:
+        self.stats["os_pid"] = message.get("os_pid")
+        self.stats["started_at"] = time.time()
+        self._set_state("loading")
+        return {
+            "meta": _plain_meta(self.meta),
+            "state": self.host.snapshot(),
+            "theme": self.api.theme.current(),
+        }
+
+    def _on_loaded(self, message: dict):
+        logger.success(f"Loaded isolated plugin {self.meta['name']} ({self.pid}), pid {self.stats['os_pid']}")
+        PluginBackendBridge.register_backend(self.pid, self._backend("plugin"))
+        self._set_state("running")
+        self.host.push_state()  # 补发加载期间的状态变化（stale 时为完整状态）
+
+    def _on_failed(self, message: dict):
+        logger.error(f"Isolated plugin {self.pid} failed to load: {message.get('error')}")
+        self._set_state("failed")
+
+    def _on_widget(self, message: dict):
+        widgets_model = self.api._app.widgets_model
+        with self._context():
+            self.api.widgets.register(
+                message["widget_id"], message["name"], message["qml_path"],
+                backend_obj=self._backend(message.get("backend")),
+                settings_qml=message.get("settings_qml"),
+                default_settings=message.get("default_settings"),
+            )
+        if widgets_model.currentPreset:  # 预设中已有该组件时显示出来
+            widgets_model.load_preset(widgets_model.currentPreset)
+
+    def _on_backend(self, message: dict):
+        self._backend(message["handle"]).update(message.get("data") or {})
+
+    def _on_provider(self, message: dict):
+        with self._context():
+            self.providers[message["provider_id"]] = self.api.notification.register_provider(
+                message["provider_id"], message.get("name"), message.get("icon"),
+                message.get("use_system_notify", False)
+            )
+
+    def _on_notify(self, message: dict):
+        provider = self.providers.get(message["provider_id"])
+        if provider is None:
+            raise KeyError(f"Notification provider {message['provider_id']} is not registered")
+        provider.push(
+            message.get("level", 0), message.get("title", ""), message.get("message"),
+            message.get("duration", 4000), message.get("closable", True)
+        )
+
+    def _on_history(self, message: dict) -> List[Dict]:
+        return self.api._app.notification.history.query(
+            message.get("filters"), message.get("offset", 0), message.get("limit", 50)
+        )
+
+    def _config_id(self, message: dict) -> str:
+        """隔离插件只能读写自己的配置，忽略子进程发来的 plugin_id"""
+        requested = message.get("plugin_id")
+        if requested is not None and requested != self.pid:
+            logger.warning(f"Isolated plugin {self.pid} tried to access config of {requested}, using its own")
+        return self.pid
+
+    def _on_config_get(self, message: dict):
+        return self.api._app.configs.plugins.configs.get(self._config_id(message))
+
+    def _on_config_update(self, message: dict):
+        configs = self.api._app.configs
+        configs.plugins.configs[self._config_id(message)] = message["data"]
+        configs.plugins._on_change()
+
+    def _on_config_save(self, message: dict):
+        self.api.config.save()
+
+    def _on_settings_page(self, message: dict):
+        with self._context():
+            if message.get("remove"):
+                self.api.ui.unregister_settings_page(message["page"])
+            else:
+                self.api.ui.register_settings_page(message["page"], message.get("title"), message.get("icon"))
+
+    def _on_schedule_get(self, message: dict) -> Optional[Dict]:
+        schedule = self.api.schedule.get()
+        return schedule.model_dump(mode="json") if schedule is not None else None
+
+    def _on_schedule_reload(self, message: dict):
+        self.api.schedule.reload()
+
+    def _on_stats(self, message: dict):
+        now, cpu = time.monotonic(), float(message.get("cpu_time", 0.0))
+        if self._last_sample is not None and now > self._last_sample[0]:
+            self.stats["cpu_percent"] = round(
+                max(0.0, cpu - self._last_sample[1]) / (now - self._last_sample[0]) * 100, 1
+            )
+        self._last_sample = (now, cpu)
+        self.stats["cpu_time"] = round(cpu, 3)
+        self.stats["rss"] = int(message.get("rss", 0))
+
+    _handlers = {
+        "hello": _on_hello,
+        "loaded": _on_loaded,
+        "failed": _on_failed,
+        "widgets.register": _on_widget,
+        "backend": _on_backend,
+        "notification.provider": _on_provider,
+        "notification.push": _on_notify,
+        "notification.history": _on_history,
+        "config.get": _on_config_get,
+        "config.update": _on_config_update,
+        "config.save": _on_config_save,
+        "ui.settings_page": _on_settings_page,
+        "schedule.get": _on_schedule_get,
+        "schedule.reload": _on_schedule_reload,
+        "stats": _on_stats,
+    }
+
+
+class PluginHost(QObject):
+    """
+    隔离模式插件的宿主（清单中 "isolation": "process" 的外部插件）
+    每个插件运行在单独的子进程中，通过本地套接字与宿主交换批量消息：
+    RuntimeAPI 的状态每次 tick 以增量推送，插件的 API 调用以消息异步转发。
+    运行期间宿主从不等待插件进程；只有程序退出时 stop_all() 会有限等待各进程执行 on_unload。
+    """
+    pluginStateChanged = Signal(str, str)  # plugin_id, state
+
+    def __init__(self, plugin_api, app_central):
+        super().__init__()
+        self.api = plugin_api
+        self.app_central = app_central
+        self._plugins: Dict[str, IsolatedPlugin] = {}
+        self._state: Dict = {}  # 上次推送的运行时状态
+
+        app_central.union_update_timer.tick.connect(self._on_tick)
+        for event, (component, signal) in FORWARDED_EVENTS.items():
+            getattr(getattr(plugin_api, component), signal).connect(
+                lambda *args, _event=event: self._forward(_event, *args)
+            )
+
+    def __contains__(self, plugin_id: str) -> bool:
+        return plugin_id in self._plugins
+
+    def start(self, meta: dict):
+        plugin = self._plugins.get(meta["id"])
+        if plugin is None:
+            plugin = self._plugins[meta["id"]] = IsolatedPlugin(self, meta)
+            plugin.stateChanged.connect(lambda state, pid=meta["id"]: self.pluginStateChanged.emit(pid, state))
+        plugin.start()
+
+    def stop(self, plugin_id: str):
+        """停止插件进程（异步，进程退出后释放）"""
+        plugin = self._plugins.pop(plugin_id, None)
+        if plugin is not None:
+            plugin.stop(dispose=True)
+
+    def stop_all(self):
+        """程序退出时停止全部插件进程：先同时通知退出，再统一等待（总计最多 SHUTDOWN_TIMEOUT_MS）"""
+        plugins = list(self._plugins.values())
+        self._plugins.clear()
+        for plugin in plugins:
+            plugin.stop()
+        deadline = time.monotonic() + IsolatedPlugin.SHUTDOWN_TIMEOUT_MS / 1000
+        for plugin in plugins:
+            if not plugin.wait_finished(int((deadline - time.monotonic()) * 1000)):
+                plugin._kill()
+                plugin.wait_finished(1000)
+
+    def stats(self) -> List[Dict]:
+        """各隔离插件的进程状态与资源占用"""
+        return [
+            {"id": pid, "state": plugin.state, "restarts": plugin.restarts, **plugin.stats}
+            for pid, plugin in self._plugins.items()
+        ]
+
+    def report_crash(self, plugin: IsolatedPlugin):
+        """插件进程多次崩溃后放弃重启，提示用户"""
+        self.app_central.notification.dispatch(NotificationData(
+            provider_id="com.classwidgets.plugins",
+            level=NotificationLevel.WARNING,
+            title=QCoreApplication.translate("PluginHost", "Plugin stopped"),
+            message=QCoreApplication.translate(
+                "PluginHost", "{name} crashed repeatedly and has been stopped."
+            ).format(name=plugin.meta["name"]),
+            duration=10000,
+            closable=True,
+        ))
+
+    # ---------------- 状态同步 ----------------
+    def _runtime_state(self) -> dict:
+        runtime = self.api.runtime
+        state = {name: getattr(runtime, name) for name in RUNTIME_FIELDS}
+        if state["current_time"] is not None:
+            state["current_time"] = state["current_time"].isoformat()
+        return state
+
+    def snapshot(self) -> dict:
+        """当前完整状态（先把变化推送给已连接的插件，保证之后的增量一致）"""
+        self.push_state()
+        return dict(self._state)
+
+    def push_state(self):
+        state = self._runtime_state()
+        delta = {k: v for k, v in state.items() if k not in self._state or self._state[k] != v}
+        self._state = state
+        for plugin in self._plugins.values():
+            plugin.push_state(delta, state)
+
+    def _on_tick(self):
+        if not self._plugins:
+            return
+        self.push_state()
+        for plugin in self._plugins.values():
+            if not plugin.stale:
+                plugin.send("tick")
+
+    def _forward(self, event: str, *args):
+        if not self._plugins:
+            return
+        self.push_state()
+        for plugin in self._plugins.values():
+            if not plugin.stale:
+                plugin.send("event", name=event, args=list(args))
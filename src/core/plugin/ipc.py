@@ -0,0 +1,156 @@
+import json
+import struct
+import time
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, Signal, QTimer
+from PySide6.QtNetwork import QLocalSocket
+from loguru import logger
+
+PROTOCOL_VERSION = 1  # 消息格式不兼容变化时递增，两端版本不同时断开连接
+MAX_FRAME = 16 * 1024 * 1024
+
+_HEADER = struct.Struct(">I")  # 帧长度前缀
+
+
+class ProtocolError(RuntimeError):
+    pass
+
+
+def encode_frame(messages: List[dict]) -> bytes:
+    """一批消息编码为一帧：4 字节长度 + JSON {"v": 版本, "m": [消息, ...]}"""
+    body = json.dumps(
+        {"v": PROTOCOL_VERSION, "m": messages}, ensure_ascii=False, default=str
+    ).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+class FrameDecoder:
+    """按长度前缀拆帧（数据可以分多次到达）"""
+    __slots__ = ("_buffer",)
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[dict]:
+        self._buffer += data
+        messages = []
+        while len(self._buffer) >= _HEADER.size:
+            (size,) = _HEADER.unpack_from(self._buffer)
+            if size > MAX_FRAME:
+                raise ProtocolError(f"Frame too large: {size} bytes")
+            end = _HEADER.size + size
+            if len(self._buffer) < end:
+                break
+            frame = json.loads(bytes(self._buffer[_HEADER.size:end]).decode("utf-8"))
+            del self._buffer[:end]
+            if frame.get("v") != PROTOCOL_VERSION:
+                raise ProtocolError(f"Unsupported protocol version: {frame.get('v')}")
+            messages.extend(frame.get("m") or [])
+        return messages
+
+
+class MessageChannel(QObject):
+    """
+    基于 QLocalSocket 的消息通道（宿主与插件进程两端共用）
+    同一轮事件循环内 send() 的消息合并为一帧发送；消息为 {"op": 名称, ...} 字典。
+    request() 同步等待回复，只能在插件进程中使用（宿主不得阻塞 GUI 线程）。
+    """
+    received = Signal(dict)
+    closed = Signal()
+
+    def __init__(self, socket: QLocalSocket, parent=None):
+        super().__init__(parent)
+        self.socket = socket
+        socket.setParent(self)
+        self._decoder = FrameDecoder()
+        self._outbox: List[dict] = []
+        self._inbox: List[dict] = []  # request() 等待期间收到的其它消息
+        self._replies: Dict[int, dict] = {}
+        self._next_id = 0
+        self._waiting = 0
+        self._flush_scheduled = False
+        socket.readyRead.connect(self._on_ready_read)
+        socket.disconnected.connect(self.closed)
+
+    @property
+    def connected(self) -> bool:
+        return self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState
+
+    @property
+    def backlog(self) -> int:
+        """尚未被对端读取的字节数"""
+        return self.socket.bytesToWrite()
+
+    def send(self, op: str, **fields):
+        self._outbox.append({"op": op, **fields})
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        self._flush_scheduled = False
+        if not self._outbox:
+            return
+        messages, self._outbox = self._outbox, []
+        if not self.connected:
+            logger.debug(f"Dropped {len(messages)} message(s): channel closed")
+            return
+        self.socket.write(encode_frame(messages))
+        self.socket.flush()
+
+    def reply(self, request: dict, result=None, error: Optional[str] = None):
+        self.send("reply", re=request.get("id"), result=result, error=error)
+
+    def request(self, op: str, timeout_ms: int = 5000, **fields):
+        """发送请求并等待回复（阻塞）"""
+        self._next_id += 1
+        request_id = self._next_id
+        self.send(op, id=request_id, **fields)
+        self.flush()
+
+        deadline = time.monotonic() + timeout_ms / 1000
+        self._waiting += 1
+        try:
+            while request_id not in self._replies:
+                remaining = int((deadline - time.monotonic()) * 1000)
+                if remaining <= 0 or not self.connected:
+                    raise TimeoutError(f"No reply to '{op}' within {timeout_ms} ms")
+                if self.socket.waitForReadyRead(remaining):
+                    self._on_ready_read()
+        finally:
+            self._waiting -= 1
+        if self._inbox and not self._waiting:
+            QTimer.singleShot(0, self._drain)
+
+        reply = self._replies.pop(request_id)
+        if reply.get("error"):
+            raise RuntimeError(reply["error"])
+        return reply.get("result")
+
+    def close(self):
+        self.flush()
+        self.socket.disconnectFromServer()
+
+    def _on_ready_read(self):
+        data = self.socket.readAll().data()
+        if not data:
+            return
+        try:
+            messages = self._decoder.feed(data)
+        except (ProtocolError, ValueError) as e:
+            logger.error(f"Plugin channel protocol error, closing: {e}")
+            self.socket.abort()
+            return
+        for message in messages:
+            if message.get("op") == "reply":
+                self._replies[message.get("re")] = message
+            elif self._waiting:
+                self._inbox.append(message)
+            else:
+                self.received.emit(message)
+
+    def _drain(self):
+        messages, self._inbox = self._inbox, []
+        for message in messages:
+            self.received.emit(message)
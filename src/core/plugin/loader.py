@@ -1,22 +1,30 @@
+import copy
 import importlib
+import inspect
 import importlib.util
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
+from types import ModuleType
 from typing import List, Dict, Optional
 
-from PySide6.QtCore import QCoreApplication
+from PySide6.QtCore import QCoreApplication, QUrl
 from loguru import logger
 from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 
 from src.core.directories import BUILTIN_PLUGINS_PATH
+from src.core.utils.profiler import profiler, plugin_profiler
 from src.core.plugin import CW2Plugin, PluginAPI
 from src.core.plugin.api import __version__ as __API_VERSION__
+from src.core.plugin.manifest import PluginManifestCache
 from src.plugins import BUILTIN_PLUGINS
 
 class PluginLoader:
+    MAX_IMPORT_WORKERS = 4  # 并行导入插件模块的线程数上限
+
     def __init__(self, plugin_api: PluginAPI, external_path: Path):
         """
         :param plugin_api: PluginAPI实例
@@ -25,6 +33,7 @@ class PluginLoader:
         self.api = plugin_api
         self.external_path = external_path
         self.builtin_path = BUILTIN_PLUGINS_PATH
+        self.manifests = PluginManifestCache(external_path)  # 外部插件清单索引
         
         # 注入运行时SDK
         self._inject_runtime_sdk()
@@ -109,19 +118,19 @@ class PluginLoader:
             meta["_path"] = None
             metas.append(meta)
         
-        # 扫描外部插件
-        for plugin_dir in self.discover_plugins_in_dir(external_path):
+        # 扫描外部插件（未变化的清单直接取自索引）
+        plugin_dirs = self.discover_plugins_in_dir(external_path)
+        for plugin_dir in plugin_dirs:
             meta = self._load_meta(plugin_dir, "external")
             if meta:
                 # API版本兼容性检查 - 标记但不阻止显示
-                if not check_api_version(meta["api_version"]):
+                if not meta["_compatible"]:
                     logger.warning(f"Plugin {meta['name']} API version {meta['api_version']} is incompatible.")
-                    meta["_compatible"] = False
-                else:
-                    meta["_compatible"] = True
-                
                 metas.append(meta)
-        
+
+        if Path(external_path) == Path(self.manifests.path.parent):
+            self.manifests.prune(plugin_dirs)
+            self.manifests.save()
         return metas
     
     @staticmethod
@@ -135,21 +144,42 @@ class PluginLoader:
         return found
     
     def _load_meta(self, plugin_dir: Path, type: str = "external") -> dict:
-        """加载单个插件的meta信息"""
+        """加载单个插件的meta信息（优先使用清单索引）"""
         try:
-            meta_path = plugin_dir / "cwplugin.json"
-            meta = json.loads(meta_path.read_text(encoding="utf-8"))
-            meta["_path"] = plugin_dir
-            meta["_type"] = type
-            
-            if not self.validate_meta(meta, plugin_dir):
-                logger.warning(f"Plugin meta invalid, skipped: {plugin_dir}")
-                return None
-                
-            return meta
+            stamp = self.manifests.stamp(plugin_dir)
+            entry = self.manifests.lookup(plugin_dir, stamp)
+            if entry is None:
+                raw = (plugin_dir / "cwplugin.json").read_bytes()
+                digest = self.manifests.digest(raw)
+                entry = self.manifests.lookup(plugin_dir, stamp, digest)
+                if entry is None:
+                    entry = self.manifests.put(plugin_dir, stamp, digest, self._parse_meta(raw, plugin_dir))
+        except Exception as e:
+            logger.exception(f"Failed to read plugin meta from {plugin_dir}: {e}")
+            return None
+
+        if entry["meta"] is None:
+            return None
+        meta = copy.deepcopy(entry["meta"])  # 调用方可能修改
+        meta["_path"] = plugin_dir
+        meta["_type"] = type
+        return meta
+
+    def _parse_meta(self, raw: bytes, plugin_dir: Path) -> Optional[dict]:
+        """解析并校验清单，附带兼容性判断与图标 URL（结果写入索引）"""
+        try:
+            meta = json.loads(raw.decode("utf-8"))
         except Exception as e:
             logger.exception(f"Failed to read plugin meta from {plugin_dir}: {e}")
             return None
+        if not self.validate_meta(meta, plugin_dir):
+            logger.warning(f"Plugin meta invalid, skipped: {plugin_dir}")
+            return None
+
+        meta["_compatible"] = check_api_version(meta["api_version"])
+        if meta.get("icon"):
+            meta["_icon_url"] = QUrl.fromLocalFile(str(plugin_dir / meta["icon"])).toString()
+        return meta
     
     @staticmethod
     def validate_meta(meta: dict, plugin_dir: Path) -> bool:
@@ -170,24 +200,101 @@ class PluginLoader:
             return self._load_external_plugin(meta)
     
     def load_plugins(self, metas: List[dict], enabled_plugins: List[str]) -> Dict[str, CW2Plugin]:
-        """加载多个插件实例"""
-        loaded_plugins = {}
-        
+        """
+        加载多个插件实例
+        1. 按清单中的 "dependencies" 解析加载顺序（拓扑排序，缺失依赖或循环依赖的插件不加载）
+        2. 声明了 "parallel_import": true 的外部插件，其模块按依赖层级在线程池中并行导入
+        3. 在 GUI 线程中按拓扑顺序实例化并调用 on_load()
+        """
+        selected = {}
         for pid in enabled_plugins:
             meta = next((m for m in metas if m["id"] == pid), None)
             if meta:
-                try:
-                    logger.info(f"Loading plugin {meta['name']} ({meta['id']}) v{meta['version']}")
-                    plugin = self.load_plugin(meta)
-                    if plugin:
-                        loaded_plugins[pid] = plugin
-                except Exception as e:
-                    logger.exception(f"Failed to initialize plugin {meta['id']}: {e}")
+                selected[pid] = meta
             else:
                 logger.warning(f"Enabled plugin {pid} not found in metas")
-                
+
+        levels = self.resolve_load_order(selected)
+        modules = self._preimport(levels, selected)
+
+        loaded_plugins = {}
+        for pid in (pid for level in levels for pid in level):
+            meta = selected[pid]
+            missing = [dep for dep in plugin_dependencies(meta) if dep not in loaded_plugins]
+            if missing:
+                logger.error(f"Plugin {pid} skipped: dependencies not loaded ({', '.join(missing)})")
+                continue
+            try:
+                logger.info(f"Loading plugin {meta['name']} ({meta['id']}) v{meta['version']}")
+                with profiler.span(f"plugin {pid}", "plugin", type=meta.get("_type", "external")):
+                    if pid in modules:
+                        plugin = self._load_external_plugin(meta, modules[pid])
+                    else:
+                        plugin = self.load_plugin(meta)
+                if plugin:
+                    loaded_plugins[pid] = plugin
+            except Exception as e:
+                logger.exception(f"Failed to initialize plugin {meta['id']}: {e}")
+
         return loaded_plugins
-    
+
+    @staticmethod
+    def resolve_load_order(metas: Dict[str, dict]) -> List[List[str]]:
+        """
+        按依赖分层：每一层只依赖之前的层，层内插件互不依赖
+        依赖不存在或存在循环依赖的插件会被排除
+        """
+        pending = dict(metas)
+        levels, placed = [], set()
+        while pending:
+            level = [
+                pid for pid, meta in pending.items()
+                if all(dep in placed for dep in plugin_dependencies(meta))
+            ]
+            if not level:
+                break
+            levels.append(level)
+            placed.update(level)
+            for pid in level:
+                del pending[pid]
+
+        for pid, meta in pending.items():
+            missing = [dep for dep in plugin_dependencies(meta) if dep not in metas]
+            if missing:
+                logger.error(f"Plugin {pid} skipped: missing dependencies ({', '.join(missing)})")
+            else:
+                logger.error(f"Plugin {pid} skipped: circular dependency")
+        return levels
+
+    def _preimport(self, levels: List[List[str]], metas: Dict[str, dict]) -> Dict[str, ModuleType]:
+        """
+        逐层在线程池中并行导入外部插件模块（同一层内并行，层与层之间按依赖顺序）
+        模块顶层代码会在工作线程中执行，因此只导入清单中明确声明 "parallel_import": true 的插件
+        导入失败的插件不在此报告，交由 GUI 线程按原流程重新导入并记录错误
+        """
+        candidates = [
+            [pid for pid in level
+             if metas[pid].get("_type") == "external" and metas[pid].get("parallel_import", False)]
+            for level in levels
+        ]
+        workers = min(self.MAX_IMPORT_WORKERS, max(map(len, candidates), default=0))
+        if workers < 2:
+            return {}
+
+        modules = {}
+        plugin_dirs = [metas[pid]["_path"] for level in candidates for pid in level]
+        with profiler.span("parallel import", "plugin", workers=workers), \
+                self._import_paths_context(plugin_dirs), \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="plugin-import") as pool:
+            for level in candidates:
+                futures = {pid: pool.submit(self._import_module, metas[pid]) for pid in level}
+                for pid, future in futures.items():
+                    try:
+                        modules[pid] = future.result()
+                    except Exception as e:
+                        logger.debug(f"Parallel import of plugin {pid} failed, retrying on the main thread: {e}")
+        return modules
+
     def _load_builtin_plugin(self, meta: dict) -> Optional[CW2Plugin]:
         """加载内置插件"""
         plugin_id = meta["id"]
@@ -200,6 +307,7 @@ class PluginLoader:
                 )
             
             PluginClass = meta["_class"]
+            plugin_profiler.register_plugin(plugin_id, Path(inspect.getfile(PluginClass)).parent)
             plugin_instance = PluginClass(self.api)
             
             # 注入PATH和meta
@@ -209,7 +317,9 @@ class PluginLoader:
             if not isinstance(plugin_instance, CW2Plugin):
                 raise TypeError("Builtin plugin must inherit from CW2Plugin")
             
-            plugin_instance.on_load()
+            with profiler.span(f"{plugin_id}.on_load", "plugin"), plugin_profiler.measure(plugin_id, "on_load"):
+                plugin_instance.on_load()
+            plugin_profiler.instrument(plugin_instance, plugin_id)
             logger.success(f"Loaded builtin plugin {meta['name']} ({plugin_id}) v{meta['version']}")
             return plugin_instance
             
@@ -217,8 +327,34 @@ class PluginLoader:
             logger.exception(f"Failed to load builtin plugin {plugin_id}: {e}")
             return None
     
-    def _load_external_plugin(self, meta: dict) -> Optional[CW2Plugin]:
-        """加载外部插件"""
+    def _import_module(self, meta: dict) -> ModuleType:
+        """导入插件入口模块（可在工作线程中执行，调用方负责 sys.path）"""
+        plugin_dir: Path = meta["_path"]
+        plugin_id = meta["id"]
+        module_name = f"cw_plugin_{plugin_id}"
+        plugin_profiler.register_plugin(plugin_id, plugin_dir)
+
+        entry_file = plugin_dir / meta["entry"]
+        if not entry_file.exists():
+            raise FileNotFoundError(f"Entry file not found: {entry_file}")
+
+        sys.modules.pop(module_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, str(entry_file))
+        if not spec or not spec.loader:
+            raise RuntimeError("Invalid plugin entry (spec loader not found)")
+
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            with profiler.span(f"{plugin_id} import", "plugin"):
+                spec.loader.exec_module(module)
+        except Exception:
+            sys.modules.pop(module_name, None)
+            raise
+        return module
+
+    def _load_external_plugin(self, meta: dict, module: Optional[ModuleType] = None) -> Optional[CW2Plugin]:
+        """加载外部插件（module 为已预先导入的入口模块）"""
         plugin_dir: Path = meta["_path"]
         plugin_id = meta["id"]
         module_name = f"cw_plugin_{plugin_id}"
@@ -237,27 +373,10 @@ class PluginLoader:
                     f"is not compatible with app version"
                 )
             
-            entry_file = plugin_dir / meta["entry"]
-            if not entry_file.exists():
-                raise FileNotFoundError(f"Entry file not found: {entry_file}")
-            
-            cleanup()
-            
             plugin_instance = None
             with self.plugin_import_context(plugin_dir):
-                spec = importlib.util.spec_from_file_location(module_name, str(entry_file))
-                if not spec or not spec.loader:
-                    raise RuntimeError("Invalid plugin entry (spec loader not found)")
-                
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[module_name] = module
-                
-                try:
-                    spec.loader.exec_module(module)
-                except Exception as e:
-                    logger.exception(f"Plugin {plugin_id} failed to exec module: {e}")
-                    cleanup()
-                    raise
+                if module is None:
+                    module = self._import_module(meta)
                 
                 if not hasattr(module, "Plugin"):
                     cleanup()
@@ -281,7 +400,9 @@ class PluginLoader:
                     raise TypeError("Plugin class must inherit from CW2Plugin (runtime class)")
                 
                 try:
-                    plugin_instance.on_load()
+                    with profiler.span(f"{plugin_id}.on_load", "plugin"), \
+                            plugin_profiler.measure(plugin_id, "on_load"):
+                        plugin_instance.on_load()
                 except Exception as e:
                     logger.exception(f"Plugin {plugin_id} on_load raised: {e}")
                     try:
@@ -293,6 +414,7 @@ class PluginLoader:
 
             # with 块结束后 sys.path 已恢复，此时持久化插件路径供运行时使用
             self._persist_plugin_paths(plugin_dir)
+            plugin_profiler.instrument(plugin_instance, plugin_id)  # 设置页面调用插件槽的耗时
 
             logger.success(f"Loaded plugin {meta['name']} ({plugin_id}) v{meta['version']}")
             return plugin_instance
@@ -313,13 +435,22 @@ class PluginLoader:
     @contextmanager
     def plugin_import_context(self, plugin_dir: Path):
         """插件导入上下文管理器"""
+        with self._import_paths_context([plugin_dir]):
+            yield
+
+    @staticmethod
+    @contextmanager
+    def _import_paths_context(plugin_dirs: List[Path]):
+        """临时把插件目录及其 libs/ 放到 sys.path 最前面（按给定顺序），结束后恢复"""
         old_path = sys.path.copy()
         try:
-            # 插件目录优先
-            to_insert = [str(plugin_dir)]
-            libs_dir = plugin_dir / "libs"
-            if libs_dir.exists() and libs_dir.is_dir():
-                to_insert.insert(0, str(libs_dir))
+            to_insert = []
+            for plugin_dir in plugin_dirs:
+                # 插件目录优先
+                libs_dir = plugin_dir / "libs"
+                if libs_dir.exists() and libs_dir.is_dir():
+                    to_insert.append(str(libs_dir))
+                to_insert.append(str(plugin_dir))
             for p in reversed(to_insert):
                 if p in sys.path:
                     sys.path.remove(p)
@@ -330,6 +461,11 @@ class PluginLoader:
             sys.path[:] = old_path
 
 
+def plugin_dependencies(meta: dict) -> List[str]:
+    """清单中声明的依赖插件 ID"""
+    return list(meta.get("dependencies") or [])
+
+
 def check_api_version(plugin_api_version: str) -> bool:
     """检查插件API版本兼容性"""
     if not plugin_api_version or plugin_api_version.strip() == "*":
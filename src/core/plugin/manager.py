@@ -3,19 +3,22 @@ import shutil
 import sys
 from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from PySide6.QtCore import Slot, QObject, Signal, Property, QUrl, QThread, QCoreApplication
+from PySide6.QtCore import Slot, QObject, Signal, Property, QUrl, QThread, QCoreApplication, QTimer
 from PySide6.QtGui import QDesktopServices
 from PySide6.QtWidgets import QApplication, QFileDialog
 from loguru import logger
 
 from src.core.directories import PLUGINS_PATH
 from src.core.plugin import CW2Plugin, PluginAPI
-from src.core.plugin.loader import PluginLoader, check_api_version
+from src.core.plugin.host import PluginHost
+from src.core.plugin.watchdog import PluginWatchdog
+from src.core.plugin.loader import PluginLoader, check_api_version, plugin_dependencies
 from src.core.plugin.worker import PluginImportWorker
 from src.core.plugin.api import __version__ as __API_VERSION__
 from src.core.notification import NotificationData, NotificationLevel
+from src.core.utils.profiler import profiler, plugin_profiler
 
 
 class PluginManager(QObject):
@@ -35,6 +38,8 @@ class PluginManager(QObject):
 
         # 存放 plugin_id -> plugin instance
         self._plugins: Dict[str, CW2Plugin] = {}
+        self._lazy: Dict[str, dict] = {}  # 尚未激活的延迟插件 plugin_id -> meta
+        self._host: Optional[PluginHost] = None  # 隔离模式插件的宿主（按需创建）
         self.metas: List[dict] = []  # 所有找到的插件 meta
         self.enabled_plugins = set(getattr(self.app_central.configs.plugins, "enabled", []))
 
@@ -42,6 +47,7 @@ class PluginManager(QObject):
 
         # 创建 PluginLoader 实例
         self.loader = PluginLoader(plugin_api, self.external_path)
+        self.watchdog = PluginWatchdog(self)  # 资源预算检查
 
         # 连接到 retranslate 信号
         app_central.retranslate.connect(self._on_retranslate)
@@ -57,9 +63,11 @@ class PluginManager(QObject):
         # 使用 PluginLoader 扫描插件
         self.metas = self.loader.scan_plugins(self.external_path)
         
-        # 修复图标路径（使用 QUrl）
+        # 修复图标路径（使用 QUrl，外部插件的 URL 已由清单索引预先计算）
         for meta in self.metas:
-            if meta.get("icon"):
+            if meta.get("_icon_url"):
+                meta["icon"] = QUrl(meta["_icon_url"])
+            elif meta.get("icon"):
                 meta["icon"] = QUrl.fromLocalFile(str(Path(meta["_path"]) / meta["icon"]))
             # 动态翻译内置插件的名称
             if meta.get("_type") == "builtin":
@@ -115,8 +123,146 @@ class PluginManager(QObject):
     
     # 加载启用插件
     def load_plugins(self):
-        """加载已启用的插件实例（批量）"""
-        self._plugins = self.loader.load_plugins(self.metas, list(self.enabled_plugins))
+        """
+        加载已启用的插件实例（批量）
+        清单中声明 "activation": "lazy" 的外部插件只注册占位，首次使用其能力时才导入，见 activate()
+        声明 "isolation": "process" 的外部插件在独立进程中运行，见 PluginHost
+        """
+        self.watchdog.start()
+        selected = {m["id"]: m for m in self.metas if m["id"] in self.enabled_plugins}
+        for pid in self.enabled_plugins - selected.keys():
+            logger.warning(f"Enabled plugin {pid} not found in metas")
+
+        # 依赖关系在全部启用的插件上解析（缺失依赖或循环依赖的插件被排除）
+        order = [pid for level in self.loader.resolve_load_order(selected) for pid in level]
+        isolated = {pid for pid in order if self._is_isolated(selected[pid])}
+        skipped = set()
+        for pid in order:
+            deps = plugin_dependencies(selected[pid])
+            if deps and pid in isolated:
+                logger.error(f"Plugin {pid} skipped: process-isolated plugins cannot declare dependencies")
+                skipped.add(pid)
+            elif any(dep in isolated for dep in deps):
+                logger.error(f"Plugin {pid} skipped: it depends on a process-isolated plugin "
+                             f"({', '.join(dep for dep in deps if dep in isolated)})")
+                skipped.add(pid)
+            elif any(dep in skipped for dep in deps):
+                logger.error(f"Plugin {pid} skipped: dependencies not loaded")
+                skipped.add(pid)
+
+        # 启动时加载的插件所依赖的延迟插件也在启动时加载
+        lazy = {pid for pid in order if self._is_lazy(selected[pid]) and pid not in isolated}
+        required = set()
+        for pid in reversed(order):
+            if pid in skipped or pid in isolated:
+                continue
+            if pid not in lazy or pid in required:
+                required.update(plugin_dependencies(selected[pid]))
+
+        eager = []
+        for pid in order:
+            if pid in skipped:
+                continue
+            if pid in isolated:
+                self.host.start(selected[pid])
+            elif pid in lazy and pid not in required:
+                self._register_lazy(selected[pid])
+            else:
+                eager.append(pid)
+        self._plugins = self.loader.load_plugins(self.metas, eager)
+        self.watchdog.check_load()
+
+        if any(self._needs_background(meta) for meta in self._lazy.values()):
+            QTimer.singleShot(0, self._activate_background)  # 启动完成后（事件循环开始时）激活
+
+    @property
+    def loaded_plugins(self) -> Dict[str, CW2Plugin]:
+        return self._plugins
+
+    @property
+    def host(self) -> PluginHost:
+        if self._host is None:
+            self._host = PluginHost(self.api, self.app_central)
+        return self._host
+
+    @staticmethod
+    def _is_isolated(meta: dict) -> bool:
+        return meta.get("_type") == "external" and meta.get("isolation") == "process"
+
+    @staticmethod
+    def _is_lazy(meta: dict) -> bool:
+        return meta.get("_type") == "external" and meta.get("activation") == "lazy"
+
+    @staticmethod
+    def _lazy_provides(meta: dict, *kinds: str) -> bool:
+        provides = meta.get("provides") or {}
+        return any(provides.get(kind) for kind in kinds)
+
+    def _needs_background(self, meta: dict) -> bool:
+        """自动化任务每次 tick 都要运行；未声明任何能力的插件无法按需触发"""
+        return (self._lazy_provides(meta, "automations")
+                or not self._lazy_provides(meta, "widgets", "settings_pages"))
+
+    def _register_lazy(self, meta: dict):
+        """按清单注册延迟插件的占位"""
+        pid = meta["id"]
+        self._lazy[pid] = meta
+        for widget in (meta.get("provides") or {}).get("widgets") or []:
+            if isinstance(widget, str):
+                widget = {"id": widget}
+            self.app_central.widgets_model.add_placeholder(
+                widget.get("id"), widget.get("name"), pid, widget.get("default_settings")
+            )
+        logger.info(f"Plugin {meta['name']} ({pid}) will be activated on first use")
+
+    def activate(self, pid: str) -> bool:
+        """激活延迟插件（导入模块并调用 on_load），已加载时直接返回 True"""
+        if pid in self._plugins:
+            return True
+        meta = self._lazy.pop(pid, None)
+        if meta is None:
+            return False
+        for dep in plugin_dependencies(meta):  # 先激活依赖的延迟插件
+            if not self.activate(dep):
+                logger.error(f"Plugin {pid} not activated: dependency {dep} is not loaded")
+                return False
+        logger.info(f"Activating plugin {meta['name']} ({pid})")
+        with profiler.span(f"plugin {pid}", "plugin", type="lazy"):
+            plugin = self.loader.load_plugin(meta)
+        if plugin is None:
+            return False
+        self._plugins[pid] = plugin
+        return True
+
+    def activate_capability(self, kind: str):
+        """激活所有声明了某类能力（widgets / settings_pages / automations）的延迟插件"""
+        for pid, meta in list(self._lazy.items()):
+            if self._lazy_provides(meta, kind):
+                self.activate(pid)
+
+    def _activate_background(self):
+        """提供自动化任务或未声明能力的延迟插件在启动完成后激活（任务需要每次 tick 运行）"""
+        for pid, meta in list(self._lazy.items()):
+            if self._needs_background(meta):
+                self.activate(pid)
+
+    def disable_plugin(self, pid: str) -> bool:
+        """
+        停用运行中的插件：断开其 API 信号连接、移除自动化任务并调用 on_unload()
+        已注册的组件保留到重启
+        """
+        plugin = self._plugins.pop(pid, None)
+        if plugin is None:
+            return False
+        disconnected = self.api.disconnect_plugin(pid)
+        self.app_central.automation_manager.remove_plugin_tasks(pid)
+        try:
+            plugin.on_unload()
+        except Exception as e:
+            logger.error(f"Error while unloading plugin {pid}: {e}")
+        logger.warning(f"Disabled plugin {pid} ({disconnected} signal connection(s) removed)")
+        self.setPluginEnabled(pid, False)
+        return True
 
     def _on_retranslate(self):
         """翻译变更时重新扫描插件以更新翻译"""
@@ -161,6 +307,8 @@ class PluginManager(QObject):
                 except Exception:
                     pass
         self._plugins.clear()
+        if self._host is not None:
+            self._host.stop_all()
 
     @Slot(result='QVariant')
     def importPlugin(self) -> List[dict]:
@@ -315,6 +463,24 @@ class PluginManager(QObject):
             return False
         return check_api_version(meta["api_version"])
 
+    @Slot(result="QVariant")
+    def pluginUsage(self) -> Dict[str, dict]:
+        """
+        各插件的资源占用：plugin_id -> {total_ms, rate_ms（每秒耗时的滑动平均）, memory, categories}
+        隔离模式插件另有 cpu_percent / rss（进程级）
+        """
+        usage = plugin_profiler.stats()
+        for stats in self._host.stats() if self._host is not None else []:
+            usage.setdefault(stats["id"], {"total_ms": 0.0, "rate_ms": 0.0, "memory": 0, "categories": {}}).update(
+                cpu_percent=stats["cpu_percent"], rss=stats["rss"], state=stats["state"]
+            )
+        return usage
+
+    @Slot(result=list)
+    def isolatedPluginStats(self) -> List[dict]:
+        """隔离模式插件的进程状态与 CPU / 内存占用"""
+        return self._host.stats() if self._host is not None else []
+
     @Slot(result=str)
     def getAPIVersion(self) -> str:
         """获取当前 API 版本"""
@@ -370,6 +536,12 @@ class PluginManager(QObject):
 
         try:
             # 终止插件运行
+            self._lazy.pop(pid, None)
+            self.api.disconnect_plugin(pid)
+            self.app_central.automation_manager.remove_plugin_tasks(pid)
+            plugin_profiler.forget(pid)
+            if self._host is not None:
+                self._host.stop(pid)
             if pid in self._plugins:
                 try:
                     self._plugins[pid].on_unload()
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable
+
+from loguru import logger
+
+from src.core.plugin.api import __version__ as __API_VERSION__
+
+MANIFEST_FORMAT = 1  # 索引结构变化时递增
+
+
+class PluginManifestCache:
+    """
+    插件清单索引（插件目录下的隐藏 JSON 文件）
+    每个插件记录目录 / cwplugin.json 的修改时间与大小（stamp）以及内容哈希：
+    stamp 未变化时直接使用缓存的 meta，不读取文件；stamp 变化但内容哈希相同时只更新 stamp。
+    同时缓存 API 兼容性判断与图标 URL，宿主 API 版本变化时整个索引失效。
+    """
+    FILENAME = ".manifest_cache.json"
+
+    def __init__(self, plugins_dir: Path):
+        self.path = Path(plugins_dir) / self.FILENAME
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception as e:  # 损坏时忽略并重建
+            logger.debug(f"Ignored plugin manifest cache: {e}")
+            return
+        if data.get("format") != MANIFEST_FORMAT or data.get("api_version") != __API_VERSION__:
+            return
+        self._entries = data.get("entries", {})
+
+    @staticmethod
+    def stamp(plugin_dir: Path) -> List[int]:
+        manifest = os.stat(plugin_dir / "cwplugin.json")
+        return [os.stat(plugin_dir).st_mtime_ns, manifest.st_mtime_ns, manifest.st_size]
+
+    @staticmethod
+    def digest(raw: bytes) -> str:
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def lookup(self, plugin_dir: Path, stamp: List[int], digest: Optional[str] = None) -> Optional[dict]:
+        """
+        stamp 匹配（或给出的内容哈希匹配）时返回缓存条目 {"meta": dict | None, ...}
+        meta 为 None 表示该清单无效
+        """
+        entry = self._entries.get(str(plugin_dir))
+        if entry is None:
+            return None
+        if entry["stamp"] == stamp:
+            return entry
+        if digest is not None and entry["hash"] == digest:
+            entry["stamp"] = stamp
+            self._dirty = True
+            return entry
+        return None
+
+    def put(self, plugin_dir: Path, stamp: List[int], digest: str, meta: Optional[dict]) -> dict:
+        entry = {"stamp": stamp, "hash": digest, "meta": meta}
+        self._entries[str(plugin_dir)] = entry
+        self._dirty = True
+        return entry
+
+    def prune(self, plugin_dirs: Iterable[Path]):
+        """移除已不存在的插件"""
+        alive = {str(d) for d in plugin_dirs}
+        for key in [k for k in self._entries if k not in alive]:
+            del self._entries[key]
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {"format": MANIFEST_FORMAT, "api_version": __API_VERSION__, "entries": self._entries}
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:  # 写入失败不影响扫描结果
+            logger.debug(f"Failed to write plugin manifest cache: {e}")
+
+    def clear(self):
+        self._entries.clear()
+        self._dirty = False
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
@@ -0,0 +1,105 @@
+import tracemalloc
+from typing import Dict, Set, Tuple
+
+from PySide6.QtCore import QObject, Signal, QCoreApplication
+from loguru import logger
+
+from src.core.notification import NotificationData, NotificationLevel
+from src.core.utils.profiler import plugin_profiler
+
+
+class PluginWatchdog(QObject):
+    """
+    插件资源预算检查（每次 tick）
+    单个插件每秒的耗时连续 STRIKES 次超出 tick_budget_ms、或归属内存超出 memory_budget_mb 时警告，
+    开启 auto_disable 时停用该插件；on_load 超出 load_budget_ms 时仅警告。
+    预算见 configs.plugins.watchdog，统计数据来自 plugin_profiler。
+    """
+    budgetExceeded = Signal(str, str)  # plugin_id, 原因
+
+    STRIKES = 5
+    MEMORY_EVERY = 30  # 每隔多少次 tick 统计一次内存（快照有一定开销）
+
+    def __init__(self, manager):
+        super().__init__()
+        self.manager = manager
+        self._strikes: Dict[str, int] = {}
+        self._warned: Set[Tuple[str, str]] = set()  # 已提示过的 (plugin_id, 类型)
+        self._ticks = 0
+        self._started = False
+
+    @property
+    def config(self):
+        return self.manager.app_central.configs.plugins.watchdog
+
+    def start(self):
+        """在加载插件之前调用（需要追踪内存时尽早开始）"""
+        if self._started:
+            return
+        self._started = True
+        if self.config.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            logger.info("Plugin memory tracing enabled (tracemalloc)")
+        self.manager.app_central.union_update_timer.tick.connect(self._on_tick)
+
+    def check_load(self):
+        """检查各插件 on_load 的耗时"""
+        if not self.config.enabled:
+            return
+        for plugin_id, stats in plugin_profiler.stats().items():
+            on_load = stats["categories"].get("on_load")
+            if on_load and on_load["max_ms"] > self.config.load_budget_ms:
+                self._exceeded(plugin_id, "load", f"on_load took {on_load['max_ms']:.0f} ms", disable=False)
+
+    def _on_tick(self):
+        window = plugin_profiler.take_window()
+        config = self.config
+        if not config.enabled:
+            return
+
+        for plugin_id, ms in window.items():
+            if ms > config.tick_budget_ms:
+                strikes = self._strikes[plugin_id] = self._strikes.get(plugin_id, 0) + 1
+                if strikes >= self.STRIKES:
+                    self._strikes[plugin_id] = 0
+                    self._exceeded(plugin_id, "time", f"{ms:.0f} ms in one tick, budget {config.tick_budget_ms:.0f} ms")
+            else:
+                self._strikes.pop(plugin_id, None)
+
+        self._ticks += 1
+        if self._ticks % self.MEMORY_EVERY == 0 and tracemalloc.is_tracing():
+            budget = config.memory_budget_mb * 1024 * 1024
+            for plugin_id, size in plugin_profiler.sample_memory().items():
+                if size > budget:
+                    self._exceeded(
+                        plugin_id, "memory",
+                        f"{size / 1048576:.1f} MB allocated, budget {config.memory_budget_mb:.0f} MB"
+                    )
+
+    def _exceeded(self, plugin_id: str, kind: str, reason: str, disable: bool = True):
+        disable = disable and self.config.auto_disable and plugin_id in self.manager.loaded_plugins
+        if (plugin_id, kind) in self._warned and not disable:
+            return
+        self._warned.add((plugin_id, kind))
+        logger.warning(f"Plugin {plugin_id} exceeded its {kind} budget: {reason}")
+        self.budgetExceeded.emit(plugin_id, reason)
+
+        name = next((m["name"] for m in self.manager.metas if m["id"] == plugin_id), plugin_id)
+        if disable:
+            self.manager.disable_plugin(plugin_id)
+            message = QCoreApplication.translate(
+                "PluginWatchdog", "{name} used too many resources and has been disabled."
+            )
+        else:
+            message = QCoreApplication.translate(
+                "PluginWatchdog", "{name} is using a lot of resources and may slow down Class Widgets."
+            )
+        self.manager.app_central.notification.dispatch(NotificationData(
+            provider_id="com.classwidgets.plugins",
+            level=NotificationLevel.WARNING,
+            title=QCoreApplication.translate("PluginWatchdog", "Plugin resource usage"),
+            message=message.format(name=name),
+            duration=10000,
+            closable=True,
+            silent=True,
+        ))
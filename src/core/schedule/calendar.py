@@ -0,0 +1,81 @@
+from datetime import date, datetime
+from typing import Optional, Dict, Tuple, Iterable, Callable
+
+from src.core.schedule.model import ScheduleData, Timeline
+from src.core.schedule.overrides import OverrideIndex
+
+
+class ScheduleCalendar:
+    """
+    学期日历索引：日期 -> 已应用 override 的 Timeline
+    每个课表加载时创建一次，按需填充；编辑器修改时只失效受影响的日期。
+    """
+
+    def __init__(self, schedule: ScheduleData,
+                 resolver: Callable[[ScheduleData, int, int, OverrideIndex], Optional[Timeline]],
+                 overrides: Optional[OverrideIndex] = None):
+        self.schedule = schedule
+        self.overrides = overrides or OverrideIndex(schedule.overrides)
+        self._resolver = resolver
+        self._start: Optional[date] = None
+        self._dates: Dict[date, Tuple[int, Optional[Timeline]]] = {}  # date -> (weekday, timeline)
+        self._load_meta()
+
+    def _load_meta(self):
+        try:
+            self._start = datetime.fromisoformat(self.schedule.meta.startDate).date()
+        except (AttributeError, TypeError, ValueError):
+            self._start = None
+
+    def week_index(self, day: date) -> int:
+        """当前是第几周（开学第一周为 1）"""
+        if self._start is None:
+            return 1  # fallback 默认第1周
+        return (day - self._start).days // 7 + 1
+
+    def get(self, day: date, reschedule_map: dict) -> Optional[Timeline]:
+        """
+        获取某日的日程
+        :param day: 日期
+        :param reschedule_map: 调休映射表 {"yyyy-mm-dd": weekday}
+        """
+        weekday = reschedule_map.get(day.isoformat()) if reschedule_map else None
+        weekday = weekday or day.isoweekday()
+
+        cached = self._dates.get(day)
+        if cached is not None and cached[0] == weekday:  # 调休变化时自动失效
+            return cached[1]
+
+        timeline = self._resolver(self.schedule, weekday, self.week_index(day), self.overrides)
+        self._dates[day] = (weekday, timeline)
+        return timeline
+
+    # 失效
+    def clear(self):
+        """全部失效（开学日期、周期等变化）"""
+        self._dates.clear()
+        self._load_meta()
+
+    def invalidate_date(self, day: date):
+        self._dates.pop(day, None)
+
+    def invalidate_weekdays(self, weekdays: Optional[Iterable[int]]):
+        """失效落在指定星期的日期（日程的 dayOfWeek / weeks 变化）"""
+        if not weekdays:
+            self.clear()
+            return
+        weekdays = set(weekdays)
+        self._drop(lambda weekday, timeline: weekday in weekdays)
+
+    def invalidate_timeline(self, day_id: str):
+        """失效使用了指定 Timeline 的日期（条目变化）"""
+        self._drop(lambda weekday, timeline: timeline is not None and timeline.id == day_id)
+
+    def invalidate_entry(self, entry_id: str):
+        """失效包含指定条目的日期（override 变化）"""
+        self._drop(lambda weekday, timeline: timeline is not None
+                   and any(e.id == entry_id for e in timeline.entries))
+
+    def _drop(self, predicate):
+        for day in [d for d, (weekday, timeline) in self._dates.items() if predicate(weekday, timeline)]:
+            del self._dates[day]
@@ -9,6 +9,9 @@ from loguru import logger
 from src.core.schedule import ScheduleData, Subject, Timeline, Entry, EntryType
 from src.core.schedule import ScheduleManager
 from src.core.schedule.model import WeekType, Timetable
+from src.core.schedule.editor_models import ScheduleListModel, EntryListModel
+from src.core.schedule.history import EditHistory
+from src.core.schedule.journal import make_record, apply_record, find_index
 from src.core.utils import generate_id, get_default_subjects
 
 
@@ -33,13 +36,30 @@ def _jsvalue_to_python(value):
 
 
 class ScheduleEditor(QObject):
-    updated = Signal()
+    updated = Signal()  # 任意修改
+    metaChanged = Signal()
+    subjectsChanged = Signal()
+    daysChanged = Signal()
+    overridesChanged = Signal()
+    historyChanged = Signal()
 
     def __init__(self, manager: ScheduleManager):
         super().__init__()
         self.manager = manager
         self._filename = manager.schedule_path.stem
         self.schedule: ScheduleData = self.manager.schedule
+
+        # 给 QML 的 dict 投影缓存，按分区失效
+        self._projections: Dict[str, object] = {}
+        self._day_projections: Dict[str, Dict] = {}  # day_id -> dict
+
+        # 列表模型（行级更新，避免 ListView 重建全部 delegate）
+        self._days_model = ScheduleListModel(lambda: self.schedule.days, self._day_projection, parent=self)
+        self._entries_model = EntryListModel(self, parent=self)
+        self._subjects_model = ScheduleListModel(lambda: self.schedule.subjects, parent=self)
+        self._overrides_model = ScheduleListModel(lambda: self.schedule.overrides, parent=self)
+        self._reset_models()
+        self._history = EditHistory()  # 撤销 / 重做
         self.updated.connect(self.refresh_manager)
         self.manager.scheduleSwitched.connect(self.refresh)
 
@@ -71,11 +91,152 @@ class ScheduleEditor(QObject):
     def refresh(self, schedule: ScheduleData):  # 接受来自 manager 的更新
         self.schedule = schedule
         self._filename = self.manager.schedule_path.stem
+        self._history.clear()
+        self.historyChanged.emit()
+        self._invalidate(all_sections=True)
+
+    def _invalidate(self, *sections: str, day_ids: Optional[List[str]] = None,
+                    override_ids: Optional[List[str]] = None, all_sections: bool = False):
+        """
+        标记分区为脏并发送对应信号，最后发送 updated
+        :param sections: "meta" / "subjects" / "days" / "overrides"
+        :param day_ids: 内容发生变化的日程（只重建这些日程的 dict）
+        :param override_ids: 内容发生变化的 override
+        :param all_sections: 整个课表被替换
+        """
+        if all_sections:
+            sections = ("meta", "subjects", "days", "overrides")
+            self._day_projections.clear()
+        for day_id in day_ids or ():
+            self._day_projections.pop(day_id, None)
+        if day_ids and "days" not in sections:
+            sections = (*sections, "days")
+
+        for section in sections:
+            self._projections.pop(section, None)
+        self._sync_models(sections, day_ids or [], override_ids, all_sections)
+        for section in sections:
+            getattr(self, f"{section}Changed").emit()
         self.updated.emit()
 
+    def _reset_models(self):
+        self._days_model.reset()
+        self._entries_model.reset()
+        self._subjects_model.reset()
+        self._overrides_model.reset()
+
+    def _sync_models(self, sections, day_ids: List[str], override_ids: Optional[List[str]], all_sections: bool):
+        if all_sections:
+            self._reset_models()
+            return
+        if "subjects" in sections:
+            self._subjects_model.sync()
+        if "days" in sections:
+            self._days_model.sync(day_ids)
+            if self._entries_model.dayId in day_ids:
+                self._entries_model.sync()
+        if "overrides" in sections:
+            self._overrides_model.sync(override_ids)
+
+    def _day_projection(self, day: Timeline) -> Dict:
+        data = self._day_projections.get(day.id)
+        if data is None:
+            data = self._day_projections[day.id] = day.model_dump()
+        return data
+
     def refresh_manager(self):
         self.manager.modify(self.schedule)  # 提交给 manager
 
+    def _record(self, op: str, kind: str, item_id: Optional[str] = None, data=None,
+                inverse: Optional[List[Dict]] = None, **extra):
+        """
+        写入编辑日志（崩溃后可恢复未保存的修改），并作为一步压入撤销栈
+        :param inverse: 撤销这一步所需的记录
+        """
+        record = make_record(op, kind, item_id, data, **extra)
+        self.manager.record(record)
+        self._history.push([record], inverse or [])
+        self.historyChanged.emit()
+
+    def _replay(self, records: List[Dict]):
+        """应用撤销 / 重做的记录，与正向编辑一样只失效涉及的分区、日期与 override 索引项"""
+        calendar, override_index = self.manager.calendar, self.manager.override_index
+        sections, day_ids, override_ids = set(), set(), set()
+        for record in records:
+            kind, item_id, index = record["type"], record.get("id"), record.get("index")
+
+            # 修改前
+            if kind == "subject" and record["op"] == "del":  # 级联删除条目
+                for day in self.schedule.days:
+                    if any(e.subjectId == item_id for e in day.entries):
+                        day_ids.add(day.id)
+                        calendar.invalidate_timeline(day.id)
+            elif kind == "day":
+                i = find_index(self.schedule.days, item_id, index)
+                if i is not None:
+                    calendar.invalidate_weekdays(self.schedule.days[i].dayOfWeek)
+            elif kind == "override":
+                i = find_index(self.schedule.overrides, item_id, index)
+                if i is not None:
+                    old = self.schedule.overrides[i]
+                    override_index.remove(old)
+                    calendar.invalidate_entry(old.entryId)
+
+            apply_record(self.schedule, record)
+            self.manager.record(record)
+
+            # 修改后
+            if kind in ("subject", "subjects"):
+                sections.add("subjects")
+            elif kind == "meta":
+                sections.add("meta")
+                calendar.clear()
+            elif kind == "day":
+                sections.add("days")
+                day_ids.add(item_id)
+                i = find_index(self.schedule.days, item_id, index)
+                if i is not None:
+                    calendar.invalidate_weekdays(self.schedule.days[i].dayOfWeek)
+            elif kind == "entry":
+                day_ids.add(record["day"])
+                calendar.invalidate_timeline(record["day"])
+            elif kind == "override":
+                sections.add("overrides")
+                override_ids.add(item_id)
+                i = find_index(self.schedule.overrides, item_id, index)
+                if i is not None:
+                    override_index.place(self.schedule.overrides, i)
+                    calendar.invalidate_entry(self.schedule.overrides[i].entryId)
+
+        self.historyChanged.emit()
+        self._invalidate(*sections, day_ids=list(day_ids), override_ids=list(override_ids))
+
+    @Slot(result=bool)
+    def undo(self) -> bool:
+        """撤销"""
+        records = self._history.undo()
+        if records is None:
+            return False
+        self._replay(records)
+        return True
+
+    @Slot(result=bool)
+    def redo(self) -> bool:
+        """重做"""
+        records = self._history.redo()
+        if records is None:
+            return False
+        self._replay(records)
+        return True
+
+    @Property(bool, notify=historyChanged)
+    def canUndo(self) -> bool:
+        return self._history.can_undo
+
+    @Property(bool, notify=historyChanged)
+    def canRedo(self) -> bool:
+        return self._history.can_redo
+
     # Subject 操作
     @Slot(str, str, str, str, str, bool, result=str)
     def addSubject(self, name: str, teacher: str = "", icon: str = "", color: str = "",
@@ -91,7 +252,10 @@ class ScheduleEditor(QObject):
             isLocalClassroom=is_local_classroom
         )
         self.schedule.subjects.append(subject)
-        self.updated.emit()
+        index = len(self.schedule.subjects) - 1
+        self._record("put", "subject", subject.id, subject, index=index,
+                     inverse=[make_record("del", "subject", subject.id, index=index)])
+        self._invalidate("subjects")
         return subject.id
 
     @Slot(str, str, str, str, str, str, str, bool)
@@ -101,6 +265,8 @@ class ScheduleEditor(QObject):
         subject = self.getSubject(subject_id)
         if not subject:
             return
+        index = self.schedule.subjects.index(subject)
+        before = make_record("put", "subject", subject.id, subject, index=index)
 
         if name:
             subject.name = name
@@ -111,7 +277,8 @@ class ScheduleEditor(QObject):
         subject.teacher = teacher
         subject.location = location
         subject.isLocalClassroom = is_local_classroom
-        self.updated.emit()
+        self._record("put", "subject", subject.id, subject, index=index, inverse=[before])
+        self._invalidate("subjects")
 
     @Slot(str)
     def removeSubject(self, subject_id: str) -> None:
@@ -120,12 +287,23 @@ class ScheduleEditor(QObject):
         if not subject:
             return
 
+        index = self.schedule.subjects.index(subject)
+        inverse = [make_record("put", "subject", subject.id, subject, index=index)]
+
         # 删除相关的课程条目
+        modified_days = []
         for day in self.schedule.days:
-            day.entries = [e for e in day.entries if e.subjectId != subject_id]
+            entries = [e for e in day.entries if e.subjectId != subject_id]
+            if len(entries) != len(day.entries):
+                inverse.extend(make_record("put", "entry", e.id, e, day=day.id, index=i)
+                               for i, e in enumerate(day.entries) if e.subjectId == subject_id)
+                day.entries = entries
+                modified_days.append(day.id)
+                self.manager.calendar.invalidate_timeline(day.id)
 
         self.schedule.subjects.remove(subject)
-        self.updated.emit()
+        self._record("del", "subject", subject_id, index=index, inverse=inverse)
+        self._invalidate("subjects", day_ids=modified_days)
 
     @Slot(str, result="QVariant")
     def getSubject(self, subject_id: str) -> Optional[Subject]:
@@ -144,7 +322,10 @@ class ScheduleEditor(QObject):
             date=date or None
         )
         self.schedule.days.append(day)
-        self.updated.emit()
+        self.manager.calendar.invalidate_weekdays(day.dayOfWeek)
+        index = len(self.schedule.days) - 1
+        self._record("put", "day", day.id, day, index=index, inverse=[make_record("del", "day", day.id, index=index)])
+        self._invalidate("days")
         return day.id
 
     @Slot(str, list, "QVariant", str)
@@ -154,6 +335,9 @@ class ScheduleEditor(QObject):
         day = self.getDay(day_id)
         if not day:
             return
+        index = self.schedule.days.index(day)
+        before = make_record("put", "day", day.id, day.model_dump(mode="json", exclude={"entries"}), index=index)
+        self.manager.calendar.invalidate_weekdays(day.dayOfWeek)  # 修改前的星期
 
         if day_of_week:
             day.dayOfWeek = day_of_week
@@ -165,7 +349,10 @@ class ScheduleEditor(QObject):
                 day.weeks = weeks
         if date:
             day.date = date
-        self.updated.emit()
+        self.manager.calendar.invalidate_weekdays(day.dayOfWeek)
+        self._record("put", "day", day.id, day.model_dump(mode="json", exclude={"entries"}), index=index,
+                     inverse=[before])
+        self._invalidate(day_ids=[day.id])
 
     @Slot(str)
     def removeDay(self, day_id: str) -> None:
@@ -175,8 +362,12 @@ class ScheduleEditor(QObject):
             logger.warning(f"Day: {day_id} not found")
             return
 
-        self.schedule.days.remove(day)
-        self.updated.emit()
+        index = self.schedule.days.index(day)
+        inverse = [make_record("put", "day", day.id, day, index=index)]
+        del self.schedule.days[index]
+        self.manager.calendar.invalidate_weekdays(day.dayOfWeek)
+        self._record("del", "day", day.id, index=index, inverse=inverse)
+        self._invalidate("days", day_ids=[day.id])
 
     @Slot(str, result=str)
     def duplicateDay(self, day_id: str) -> Optional[str]:
@@ -196,7 +387,11 @@ class ScheduleEditor(QObject):
             entry.id = generate_id("entry")
 
         self.schedule.days.append(new_day)
-        self.updated.emit()
+        self.manager.calendar.invalidate_weekdays(new_day.dayOfWeek)
+        index = len(self.schedule.days) - 1
+        self._record("put", "day", new_day.id, new_day, index=index,
+                     inverse=[make_record("del", "day", new_day.id, index=index)])
+        self._invalidate("days")
         return new_day.id
 
     @Slot(str, result="QVariant")
@@ -229,7 +424,11 @@ class ScheduleEditor(QObject):
         )
         day.entries.append(entry)
         day.entries.sort(key=lambda e: e.startTime)  # 排序
-        self.updated.emit()
+        self.manager.calendar.invalidate_timeline(day.id)
+        index = day.entries.index(entry)
+        self._record("put", "entry", entry.id, entry, day=day.id, index=index,
+                     inverse=[make_record("del", "entry", entry.id, day=day.id, index=index)])
+        self._invalidate(day_ids=[day.id])
         return entry.id
 
     @Slot(str, str, str, str, str, str)
@@ -251,6 +450,7 @@ class ScheduleEditor(QObject):
             if not self._validate_time_range(current_start, current_end):
                 logger.error(f"Cannot update entry: invalid time range {current_start} - {current_end}")
                 return
+        before = entry.model_copy()
 
         if entry_type:
             entry.type = EntryType(entry_type)
@@ -261,11 +461,16 @@ class ScheduleEditor(QObject):
         entry.subjectId = subject_id
         entry.title = title
 
+        modified_days = []
         for day in self.schedule.days:  # 排序
             if entry in day.entries:
+                modified_days.append(day.id)
                 day.entries.sort(key=lambda e: e.startTime)
+                self.manager.calendar.invalidate_timeline(day.id)
+                self._record("put", "entry", entry.id, entry, day=day.id, index=day.entries.index(entry),
+                             inverse=[make_record("put", "entry", entry.id, before, day=day.id)])
                 break
-        self.updated.emit()
+        self._invalidate(day_ids=modified_days)
 
     @Slot(str)
     def removeEntry(self, entry_id: str) -> None:
@@ -273,8 +478,12 @@ class ScheduleEditor(QObject):
         for day in self.schedule.days:
             entry = next((e for e in day.entries if e.id == entry_id), None)
             if entry:
-                day.entries.remove(entry)
-                self.updated.emit()
+                index = day.entries.index(entry)
+                inverse = [make_record("put", "entry", entry.id, entry, day=day.id, index=index)]
+                del day.entries[index]
+                self.manager.calendar.invalidate_timeline(day.id)
+                self._record("del", "entry", entry_id, day=day.id, index=index, inverse=inverse)
+                self._invalidate(day_ids=[day.id])
                 return
 
     @Slot(str, result="QVariant")
@@ -294,9 +503,7 @@ class ScheduleEditor(QObject):
         """
         day_of_week_list = day_of_week or None
         weeks = _jsvalue_to_python(weeks)
-        for o in self.schedule.overrides:
-            if o.entryId != entry_id:
-                continue
+        for o in self.manager.override_index.for_entry(entry_id):
             if o.dayOfWeek != day_of_week_list:
                 continue
             if o.weeks != weeks:
@@ -316,27 +523,39 @@ class ScheduleEditor(QObject):
             title=title or None
         )
         self.schedule.overrides.append(override)
-        self.updated.emit()
+        self.manager.override_index.add(override)
+        self.manager.calendar.invalidate_entry(entry_id)
+        index = len(self.schedule.overrides) - 1
+        self._record("put", "override", override.id, override, index=index,
+                     inverse=[make_record("del", "override", override.id, index=index)])
+        self._invalidate("overrides", override_ids=[])
         return True
 
     @Slot(str, str, str, result=bool)
     def updateOverride(self, override_id: str, subject_id=None, title=None):
-        for o in self.schedule.overrides:
+        for index, o in enumerate(self.schedule.overrides):
             if o.id == override_id:
+                before = make_record("put", "override", o.id, o, index=index)
                 if subject_id is not None:
                     o.subjectId = subject_id
                 if title is not None:
                     o.title = title
-                self.updated.emit()
+                self.manager.calendar.invalidate_entry(o.entryId)
+                self._record("put", "override", o.id, o, index=index, inverse=[before])
+                self._invalidate("overrides", override_ids=[o.id])
                 return True
         return False
 
     @Slot(str, result=bool)
     def removeOverride(self, override_id: str):
-        for override in self.schedule.overrides:
+        for index, override in enumerate(self.schedule.overrides):
             if override.id == override_id:
-                self.schedule.overrides.remove(override)
-                self.updated.emit()
+                inverse = [make_record("put", "override", override.id, override, index=index)]
+                del self.schedule.overrides[index]
+                self.manager.override_index.remove(override)
+                self.manager.calendar.invalidate_entry(override.entryId)
+                self._record("del", "override", override_id, index=index, inverse=inverse)
+                self._invalidate("overrides", override_ids=[])
                 return True
         return False
 
@@ -359,14 +578,7 @@ class ScheduleEditor(QObject):
         applicable = None
         best_priority = -1
 
-        for o in self.schedule.overrides:
-            if o.entryId != entry_id:
-                continue
-
-            valid_day = not o.dayOfWeek or day_of_week in o.dayOfWeek
-            if not valid_day:
-                continue
-
+        for o in self.manager.override_index.for_weekday(entry_id, day_of_week):
             # 判断优先级
             if isinstance(o.weeks, list) and week in o.weeks:
                 priority = 3  # 特定周最高
@@ -406,8 +618,11 @@ class ScheduleEditor(QObject):
             logger.warning("No schedule or meta data available.")
             return False
 
+        before = make_record("put", "meta", data=self.schedule.meta)
         self.schedule.meta.startDate = date_str
-        self.updated.emit()
+        self.manager.calendar.clear()
+        self._record("put", "meta", data=self.schedule.meta, inverse=[before])
+        self._invalidate("meta")
         return True
 
     @Slot(result=str)
@@ -423,10 +638,12 @@ class ScheduleEditor(QObject):
     def restoreDefaultSubjects(self):
         """加载默认学科"""
         default_subjects = get_default_subjects()
+        before = make_record("put", "subjects", data=self.schedule.subjects)
         self.schedule.subjects.clear()
         for subj in default_subjects:
             self.schedule.subjects.append(subj)
-        self.updated.emit()
+        self._record("put", "subjects", data=self.schedule.subjects, inverse=[before])
+        self._invalidate("subjects")
 
     @Slot(int, result=bool)
     def setMaxWeekCycle(self, max_weeks: int):
@@ -435,8 +652,11 @@ class ScheduleEditor(QObject):
             logger.warning("No schedule or meta data available.")
             return False
 
+        before = make_record("put", "meta", data=self.schedule.meta)
         self.schedule.meta.maxWeeks = max_weeks
-        self.updated.emit()
+        self.manager.calendar.clear()
+        self._record("put", "meta", data=self.schedule.meta, inverse=[before])
+        self._invalidate("meta")
         return True
 
     @Slot(result=int)
@@ -447,42 +667,73 @@ class ScheduleEditor(QObject):
         return getattr(self.schedule.meta, "maxWeekCycle", 1)
 
     # 数据访问
-    @Property("QVariant", notify=updated)
+    @Property("QVariant", notify=metaChanged)
     def meta(self) -> Dict:
         """获取课程表元数据"""
         if not self.schedule or not self.schedule.meta:
             return {}
-        return self.schedule.meta.model_dump()
+        if "meta" not in self._projections:
+            self._projections["meta"] = self.schedule.meta.model_dump()
+        return self._projections["meta"]
 
-    @Property(list, notify=updated)
+    @Property(list, notify=subjectsChanged)
     def subjects(self) -> List[Dict]:
         """获取所有科目"""
         if not self.schedule:
             return []
-        return [subject.model_dump() for subject in self.schedule.subjects]
+        if "subjects" not in self._projections:
+            self._projections["subjects"] = [subject.model_dump() for subject in self.schedule.subjects]
+        return self._projections["subjects"]
 
-    @Property(list, notify=updated)
+    @Property(list, notify=daysChanged)
     def days(self) -> List[Dict]:
         """获取所有日程"""
         if not self.schedule:
             return []
+        if "days" not in self._projections:
+            self._projections["days"] = [self._day_projection(day) for day in self.schedule.days]
+        return self._projections["days"]
 
-        return [day.model_dump() for day in self.schedule.days]
-
-    @Property(list, notify=updated)
+    @Property(list, notify=overridesChanged)
     def overrides(self) -> List[Timetable]:
         """获取所有条目"""
         if not self.schedule:
             return []
-
-        return [override.model_dump() for override in self.schedule.overrides]
+        if "overrides" not in self._projections:
+            self._projections["overrides"] = [override.model_dump() for override in self.schedule.overrides]
+        return self._projections["overrides"]
+
+    @Property(QObject, constant=True)
+    def daysModel(self) -> ScheduleListModel:
+        """日程列表模型"""
+        return self._days_model
+
+    @Property(QObject, constant=True)
+    def entriesModel(self) -> EntryListModel:
+        """条目列表模型（通过 dayId 选择日程）"""
+        return self._entries_model
+
+    @Property(QObject, constant=True)
+    def subjectsModel(self) -> ScheduleListModel:
+        """科目列表模型"""
+        return self._subjects_model
+
+    @Property(QObject, constant=True)
+    def overridesModel(self) -> ScheduleListModel:
+        """override 列表模型"""
+        return self._overrides_model
 
     @Property("QVariant", notify=updated)
     def scheduleData(self) -> Dict:
-        """获取完整的课程表数据"""
+        """获取完整的课程表数据（由各分区投影组合）"""
         if not self.schedule:
             return {}
-        return self.schedule.model_dump()
+        return {
+            "meta": self.meta,
+            "subjects": self.subjects,
+            "days": self.days,
+            "overrides": self.overrides,
+        }
 
     @Property("QVariant", notify=updated)
     def path(self) -> str:
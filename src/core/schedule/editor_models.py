@@ -0,0 +1,149 @@
+from typing import List, Dict, Optional, Callable, Iterable
+
+from PySide6.QtCore import QAbstractListModel, Qt, QModelIndex, Signal, Property
+from pydantic import BaseModel
+
+
+class ScheduleListModel(QAbstractListModel):
+    """
+    编辑器列表模型基类
+    数据源是 ScheduleData 中的某个 pydantic 列表，sync() 时与上一次的行做对比，
+    只对真正变化的行发送 rowsRemoved / rowsMoved / rowsInserted / dataChanged。
+    """
+    IdRole = Qt.UserRole + 1
+    ModelDataRole = Qt.UserRole + 2
+
+    countChanged = Signal()
+
+    def __init__(self, source: Callable[[], Optional[List[BaseModel]]],
+                 dump: Optional[Callable[[BaseModel], Dict]] = None, parent=None):
+        super().__init__(parent)
+        self._source = source
+        self._dump = dump or (lambda item: item.model_dump())
+        self._ids: List[str] = []
+        self._rows: List[Dict] = []
+        self._dump_cache: Dict[str, Dict] = {}  # id -> dict
+
+    def roleNames(self):
+        return {
+            self.IdRole: b"itemId",
+            self.ModelDataRole: b"modelData",
+        }
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._rows)
+
+    def data(self, index, role):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        if role == self.IdRole:
+            return self._ids[index.row()]
+        if role == self.ModelDataRole:
+            return self._rows[index.row()]
+        return None
+
+    @Property(int, notify=countChanged)
+    def count(self) -> int:
+        return len(self._rows)
+
+    def _items(self) -> List[BaseModel]:
+        return self._source() or []
+
+    def reset(self):
+        """整体重建（切换课表时）"""
+        self.beginResetModel()
+        items = self._items()
+        self._ids = [item.id for item in items]
+        self._rows = [self._dump(item) for item in items]
+        self._dump_cache = dict(zip(self._ids, self._rows))
+        self.endResetModel()
+        self.countChanged.emit()
+
+    def sync(self, changed_ids: Optional[Iterable[str]] = None):
+        """
+        与数据源对齐
+        :param changed_ids: 内容可能变化的行；为 None 时重新比较所有行
+        """
+        items = self._items()
+        new_ids = [item.id for item in items]
+        old_count = len(self._rows)
+
+        if changed_ids is None:
+            stale = set(new_ids)
+        else:
+            stale = set(changed_ids)
+        for item_id in stale:
+            self._dump_cache.pop(item_id, None)
+        new_rows = {}
+        for item in items:
+            row = self._dump_cache.get(item.id)
+            if row is None:
+                row = self._dump(item)
+            new_rows[item.id] = row
+
+        # 删除
+        new_set = set(new_ids)
+        for i in range(len(self._ids) - 1, -1, -1):
+            if self._ids[i] not in new_set:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._ids[i]
+                del self._rows[i]
+                self.endRemoveRows()
+
+        # 移动 / 插入
+        for i, item_id in enumerate(new_ids):
+            if i < len(self._ids) and self._ids[i] == item_id:
+                continue
+            try:
+                j = self._ids.index(item_id, i)
+            except ValueError:
+                self.beginInsertRows(QModelIndex(), i, i)
+                self._ids.insert(i, item_id)
+                self._rows.insert(i, new_rows[item_id])
+                self.endInsertRows()
+                continue
+            self.beginMoveRows(QModelIndex(), j, j, QModelIndex(), i)
+            self._ids.insert(i, self._ids.pop(j))
+            self._rows.insert(i, self._rows.pop(j))
+            self.endMoveRows()
+
+        # 内容变化
+        for i, item_id in enumerate(self._ids):
+            row = new_rows[item_id]
+            if self._rows[i] is row:
+                continue
+            changed = self._rows[i] != row
+            self._rows[i] = row
+            if changed:
+                ix = self.index(i)
+                self.dataChanged.emit(ix, ix, [self.ModelDataRole])
+
+        self._dump_cache = new_rows
+        if len(self._rows) != old_count:
+            self.countChanged.emit()
+
+
+class EntryListModel(ScheduleListModel):
+    """某一个日程（Timeline）下的条目"""
+    dayIdChanged = Signal()
+
+    def __init__(self, editor, parent=None):
+        super().__init__(self._entries, parent=parent)
+        self._editor = editor
+        self._day_id = ""
+
+    def _entries(self):
+        day = self._editor.getDay(self._day_id) if self._day_id else None
+        return day.entries if day else []
+
+    @Property(str, notify=dayIdChanged)
+    def dayId(self) -> str:
+        return self._day_id
+
+    @dayId.setter
+    def dayId(self, day_id: str):
+        if day_id == self._day_id:
+            return
+        self._day_id = day_id or ""
+        self.reset()
+        self.dayIdChanged.emit()
@@ -0,0 +1,59 @@
+from collections import deque
+from typing import List, Dict, Optional, Tuple
+
+Step = Tuple[List[Dict], List[Dict]]  # (正向记录, 逆向记录)
+
+
+class EditHistory:
+    """
+    撤销 / 重做栈
+    每一步只保存被修改对象的正向与逆向日志记录（put / del），不复制整个课表；
+    超出 MAX_STEPS 或 MAX_RECORDS 时丢弃最早的步骤。
+    """
+    MAX_STEPS = 100
+    MAX_RECORDS = 2000  # 所有步骤的记录总数上限（内存预算）
+
+    def __init__(self):
+        self._undo: deque[Step] = deque()
+        self._redo: List[Step] = []
+        self._records = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def push(self, forward: List[Dict], inverse: List[Dict]):
+        """记录新的一步（清空重做栈）"""
+        for old_forward, old_inverse in self._redo:
+            self._records -= len(old_forward) + len(old_inverse)
+        self._redo.clear()
+        self._undo.append((forward, inverse))
+        self._records += len(forward) + len(inverse)
+        while self._undo and (len(self._undo) > self.MAX_STEPS or self._records > self.MAX_RECORDS):
+            old_forward, old_inverse = self._undo.popleft()
+            self._records -= len(old_forward) + len(old_inverse)
+
+    def undo(self) -> Optional[List[Dict]]:
+        """弹出一步，返回需要应用的逆向记录"""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return step[1]
+
+    def redo(self) -> Optional[List[Dict]]:
+        """返回需要重新应用的正向记录"""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return step[0]
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._records = 0
@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+from src.core.schedule.model import ScheduleData, Subject, Timeline, Entry, Timetable, MetaInfo
+
+
+class ScheduleJournal:
+    """
+    课表编辑日志（追加写入的 JSON Lines）
+    每次编辑只追加一条记录，记录的是修改后的完整对象（put）或删除（del），
+    重复回放结果不变；快照写入成功后，已包含在快照中的记录被压缩掉。
+    append_record() 只放入内存缓冲，由保存线程调用 write_pending() 批量追加并 fsync（组提交），
+    GUI 线程不等待磁盘。
+
+    记录格式: {"seq": 1, "op": "put"|"del", "type": "subject"|"day"|"entry"|"override"|"meta"|"subjects",
+              "id": "...", "day": "...", "index": 0, "data": {...}}
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()  # 写入与压缩在保存线程中进行
+        self._seq = 0
+        self._count = 0  # 尚未压缩的记录数（包括缓冲中的）
+        self._buffer: List[Tuple[int, str]] = []  # 尚未写入文件的 (seq, 行)
+        records = self._read()
+        if records:  # 接着已有记录编号
+            self._seq = records[-1]["seq"]
+            self._count = len(records)
+
+    @staticmethod
+    def path_for(journal_dir: Path, schedule_path: Path) -> Path:
+        return Path(journal_dir) / f"{Path(schedule_path).stem}.jsonl"
+
+    @property
+    def pending(self) -> int:
+        return self._count
+
+    def append(self, op: str, kind: str, item_id: Optional[str] = None,
+               data: Any = None, **extra) -> Dict:
+        """追加一条记录"""
+        return self.append_record(make_record(op, kind, item_id, data, **extra))
+
+    def append_record(self, record: Dict) -> Dict:
+        """追加一条已构造的记录到缓冲（撤销 / 重做时也会写入）"""
+        with self._lock:
+            self._seq += 1
+            record = {**record, "seq": self._seq}
+            self._buffer.append((self._seq, _dumps(record)))
+            self._count += 1
+            return record
+
+    def write_pending(self) -> int:
+        """
+        将缓冲中的记录追加到文件（一次 fsync），在保存线程中调用
+        :return: 写入的记录数
+        """
+        with self._lock:
+            if not self._buffer:
+                return 0
+            lines = [line for _, line in self._buffer]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:  # 保留在缓冲中，下次再写
+                logger.error(f"Failed to append schedule journal: {e}")
+                return 0
+            self._buffer.clear()
+            return len(lines)
+
+    def mark(self) -> int:
+        """当前位置（快照取值时调用）"""
+        with self._lock:
+            return self._seq
+
+    def compact(self, mark: int):
+        """丢弃 seq <= mark 的记录（它们已写入快照）"""
+        with self._lock:
+            self._buffer = [(seq, line) for seq, line in self._buffer if seq > mark]
+            records = [r for r in self._read() if r["seq"] > mark]
+            try:
+                if not records:
+                    if self.path.exists():
+                        self.path.unlink()
+                else:
+                    tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.write("".join(_dumps(record) for record in records))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.path)
+                self._count = len(records) + len(self._buffer)
+            except OSError as e:
+                logger.error(f"Failed to compact schedule journal: {e}")
+
+    def discard(self):
+        """删除日志（课表被删除或整体替换）"""
+        with self._lock:
+            self._count = 0
+            self._buffer.clear()
+            try:
+                if self.path.exists():
+                    self.path.unlink()
+            except OSError as e:
+                logger.error(f"Failed to remove schedule journal: {e}")
+
+    def replay(self, schedule: ScheduleData) -> int:
+        """
+        将日志中的记录应用到快照上（加载时恢复上次未写入快照的编辑）
+        :return: 应用的记录数
+        """
+        with self._lock:
+            records = self._read()
+            applied = 0
+            for record in records:
+                try:
+                    apply_record(schedule, record)
+                    applied += 1
+                except Exception as e:
+                    logger.warning(f"Skipped invalid journal record {record.get('seq')}: {e}")
+            return applied
+
+    def _read(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:  # 写入中断的最后一行
+                    logger.warning(f"Truncated journal record in {self.path.name}, ignored")
+                    break
+        return records
+
+
+def _dumps(record: Dict) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def make_record(op: str, kind: str, item_id: Optional[str] = None, data: Any = None, **extra) -> Dict:
+    """构造一条日志记录（不含 seq）"""
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    elif isinstance(data, list):
+        data = [item.model_dump(mode="json") if isinstance(item, BaseModel) else item for item in data]
+
+    record = {"op": op, "type": kind}
+    if item_id is not None:
+        record["id"] = item_id
+    if data is not None:
+        record["data"] = data
+    record.update(extra)
+    return record
+
+
+def find_index(items: list, item_id: str, index: Optional[int] = None) -> Optional[int]:
+    """按 id 查找位置；index 为记录中的位置提示，命中时不遍历列表"""
+    if index is not None and 0 <= index < len(items) and items[index].id == item_id:
+        return index
+    return next((i for i, item in enumerate(items) if item.id == item_id), None)
+
+
+def _put(items: list, item: BaseModel, index: Optional[int] = None):
+    """按 id 替换；不存在时插入到 index（默认末尾）"""
+    i = find_index(items, item.id, index)
+    if i is not None:
+        items[i] = item
+    elif index is None:
+        items.append(item)
+    else:
+        items.insert(index, item)
+
+
+def _remove(items: list, item_id: str, index: Optional[int] = None):
+    i = find_index(items, item_id, index)
+    if i is not None:
+        del items[i]
+
+
+def apply_record(schedule: ScheduleData, record: Dict):
+    """将一条记录应用到课表上"""
+    op, kind, data = record["op"], record["type"], record.get("data")
+    item_id = record.get("id")
+    index = record.get("index")
+
+    if kind == "meta":
+        schedule.meta = MetaInfo.model_validate(data)
+    elif kind == "subjects":
+        schedule.subjects = [Subject.model_validate(s) for s in data]
+    elif kind == "subject":
+        if op == "put":
+            _put(schedule.subjects, Subject.model_validate(data), index)
+        else:
+            _remove(schedule.subjects, item_id, index)
+            for day in schedule.days:  # 与编辑器一致：删除科目时删除相关条目
+                day.entries = [e for e in day.entries if e.subjectId != item_id]
+    elif kind == "day":
+        if op == "put":
+            i = find_index(schedule.days, item_id, index)
+            old = schedule.days[i] if i is not None else None
+            merged = {**old.model_dump(), **data} if old else {"entries": [], **data}  # 更新记录不带 entries
+            _put(schedule.days, Timeline.model_validate(merged), index)
+        else:
+            _remove(schedule.days, item_id, index)
+    elif kind == "entry":
+        target = record.get("day")
+        day = next((d for d in schedule.days if d.id == target), None)
+        if op == "put":
+            if day is None:
+                raise KeyError(f"day {target} not found")
+            _put(day.entries, Entry.model_validate(data), index)
+            day.entries.sort(key=lambda e: e.startTime)
+        else:
+            for day in [day] if day else schedule.days:
+                _remove(day.entries, item_id, index)
+    elif kind == "override":
+        if op == "put":
+            _put(schedule.overrides, Timetable.model_validate(data), index)
+        else:
+            _remove(schedule.overrides, item_id, index)
+    else:
+        raise ValueError(f"unknown record type: {kind}")
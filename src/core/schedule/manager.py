@@ -2,6 +2,7 @@ import json
 import shutil
 from datetime import datetime
 from pathlib import Path
+from typing import Dict
 from PySide6.QtCore import QObject, Signal, Slot, Property, QUrl
 from PySide6.QtGui import QDesktopServices
 from PySide6.QtWidgets import QFileDialog, QApplication
@@ -9,7 +10,12 @@ from loguru import logger
 
 from src.core.convertor.slots import ScheduleIO
 from src.core.directories import SCHEDULES_PATH
+from src.core.schedule.calendar import ScheduleCalendar
 from src.core.schedule.model import ScheduleData, MetaInfo
+from src.core.schedule.journal import ScheduleJournal
+from src.core.schedule.overrides import OverrideIndex
+from src.core.schedule.persistence import SchedulePersistence, write_atomic
+from src.core.schedule.service import ScheduleServices
 from src.core.parser import ScheduleParser
 from src.core.utils import generate_id, get_default_subjects
 
@@ -31,6 +37,9 @@ class ScheduleManager(QObject):
     scheduleSwitched = Signal(ScheduleData)
     scheduleModified = Signal(ScheduleData)
 
+    COMPACT_DELAY_MS = 30 * 1000  # 有编辑日志时快照的静默时间
+    COMPACT_THRESHOLD = 200  # 日志记录数超过此值时尽快写入快照
+
     def __init__(self, schedules_dir: Path, app_central):
         super().__init__()
         self.app_central = app_central
@@ -40,7 +49,12 @@ class ScheduleManager(QObject):
         self.schedules_dir.mkdir(parents=True, exist_ok=True)
         self.schedule_path: Path = Path(self.schedules_dir) / "schedule.json"
         self.schedule: ScheduleData = _create_empty_schedule()
+        self.override_index = OverrideIndex(self.schedule.overrides)  # entryId -> override
+        self.calendar = ScheduleCalendar(self.schedule, ScheduleServices.resolve_day, self.override_index)  # 学期日历索引
         self.current_schedule_name: str | None = None  # 当前选中的课程表
+        self.persistence = SchedulePersistence(self.schedules_dir / "backup", self)  # 防抖、后台、原子写入
+        self.journal_dir = self.schedules_dir / "journal"
+        self.journal = ScheduleJournal(ScheduleJournal.path_for(self.journal_dir, self.schedule_path))  # 编辑日志
 
         self.initialized.emit()
 
@@ -59,26 +73,34 @@ class ScheduleManager(QObject):
         self.schedule_path = path
         self.current_schedule_name = name
         self.app_central.configs.schedule.current_schedule = self.current_schedule_name
+        self._open_journal()
 
         parser = ScheduleParser(self.schedule_path)
         try:
             self.schedule = parser.load()
             logger.success(f"Schedule loaded from {self.schedule_path}")
+            recovered = self.journal.replay(self.schedule)
+            if recovered:  # 上次退出前未写入快照的编辑
+                logger.info(f"Recovered {recovered} edit(s) from journal")
+                self.persistence.request_save(self.schedule_path, self.schedule, self.journal)
         except FileNotFoundError:
             logger.warning("Schedule file not found, creating a new one...")
+            self.journal.discard()
             self.schedule = _create_empty_schedule()
             self.save()
         except Exception as e:  # 备份
             logger.error(f"Failed to load schedule: {e}")
-            if path.exists():
-                backup_path = Path(self.schedule_path / "backup" / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-                logger.info(f"Original schedule backed up to {backup_path.name}")
-                self.save(backup_path)
+            backup_path = self.persistence.backup(path, "corrupted")
+            if backup_path:
+                logger.info(f"Original schedule backed up to {backup_path}")
+            self.journal.discard()
             # 创建空课表
             self.schedule = _create_empty_schedule()
+            self._reset_indexes()
             self.save()
             return False
 
+        self._reset_indexes()
         self.scheduleSwitched.emit(self.schedule)
         self.scheduleModified.emit(self.schedule)
         return True
@@ -92,21 +114,70 @@ class ScheduleManager(QObject):
 
     def modify(self, schedule: ScheduleData):
         """ 接受外部修改（如编辑器）"""
+        if schedule is not self.schedule:
+            self.schedule = schedule
+            self._reset_indexes()
+        self.scheduleModified.emit(self.schedule)
+
+        # 编辑已记入日志时，快照只需定期压缩
+        journal = self._current_journal()
+        if journal is not None and 0 < journal.pending < self.COMPACT_THRESHOLD:
+            self.persistence.request_save(self.schedule_path, self.schedule, journal, self.COMPACT_DELAY_MS)
+        else:
+            self.persistence.request_save(self.schedule_path, self.schedule, journal)
+
+    def record(self, record: Dict) -> Dict:
+        """写入编辑日志（缓冲后由保存线程追加，不阻塞 GUI 线程）"""
+        journal = self._current_journal()
+        if journal is None:  # 日志与当前课表不对应，不能写入（回放时会改错课表）
+            logger.warning(f"Journal does not match {self.schedule_path.name}, edit not journaled")
+            return record
+        record = journal.append_record(record)
+        self.persistence.write_journal(journal)
+        return record
+
+    def replace(self, schedule: ScheduleData, path: Path):
+        """
+        整体替换当前课表（导入等）
+        重新打开对应的编辑日志并清空（新课表是完整快照），重建索引后立即保存
+        """
         self.schedule = schedule
+        self.schedule_path = path
+        self.current_schedule_name = path.stem
+        self._open_journal()
+        self.journal.discard()
+        self._reset_indexes()
+        self.save()
+
+        self.scheduleSwitched.emit(self.schedule)
         self.scheduleModified.emit(self.schedule)
 
+    def _reset_indexes(self):
+        """课表整体替换后重建索引（原地修改由编辑器负责维护）"""
+        self.override_index = OverrideIndex(self.schedule.overrides)
+        self.calendar = ScheduleCalendar(self.schedule, ScheduleServices.resolve_day, self.override_index)
+
+    def _open_journal(self):
+        """打开当前课表的编辑日志"""
+        self.journal = ScheduleJournal(ScheduleJournal.path_for(self.journal_dir, self.schedule_path))
+
+    def _current_journal(self) -> ScheduleJournal | None:
+        """与当前课表文件对应的编辑日志（路径被外部直接修改时返回 None）"""
+        if self.journal.path != ScheduleJournal.path_for(self.journal_dir, self.schedule_path):
+            return None
+        return self.journal
+
     @Slot(result=bool)
     def save(self, path: Path | None = None):
-        try:
-            if path is None:
-                path = self.schedule_path
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(self.schedule.model_dump(), f, ensure_ascii=False, indent=4)
-                logger.success(f"Schedule saved to {path.name}")
-                return True
-        except Exception as e:
-            logger.error(f"Error saving schedule: {e}")
-            return False
+        """立即保存（等待写入完成）"""
+        if path is None:
+            path = self.schedule_path
+        journal = self._current_journal() if path == self.schedule_path else None
+        return self.persistence.save_now(path, self.schedule, journal)
+
+    def flush(self):
+        """写出所有待保存的修改（切换、退出前）"""
+        self.persistence.flush()
 
     @Property(str, notify=scheduleSwitched)
     def currentScheduleName(self) -> str | None:
@@ -134,10 +205,9 @@ class ScheduleManager(QObject):
             return False
         new_schedule = _create_empty_schedule()
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(new_schedule.model_dump(), f, ensure_ascii=False, indent=4)
-                logger.success(f"New schedule created: {name}")
-                return True
+            write_atomic(path, new_schedule.model_dump())
+            logger.success(f"New schedule created: {name}")
+            return True
         except Exception as e:
             logger.error(f"Error creating new schedule: {e}")
             return False
@@ -150,6 +220,8 @@ class ScheduleManager(QObject):
             return False
 
         path = self.schedules_dir / f"{name}.json"
+        self.persistence.discard(path)
+        ScheduleJournal(ScheduleJournal.path_for(self.journal_dir, path)).discard()
         try:
             if path.exists():
                 path.unlink()
@@ -164,6 +236,7 @@ class ScheduleManager(QObject):
         """复制课表文件"""
         src_path = self.schedules_dir / f"{src_name}.json"
         dest_path = self.schedules_dir / f"{dest_name}.json"
+        self.flush()
         if not src_path.exists():
             return False
         shutil.copy(src_path, dest_path)
@@ -176,6 +249,7 @@ class ScheduleManager(QObject):
         old_path = self.schedules_dir / f"{old_name}.json"
         new_path = self.schedules_dir / f"{new_name}.json"
 
+        self.flush()
         if not old_path.exists():
             logger.warning(f"Schedule to rename does not exist: {old_name}")
             return False
@@ -185,12 +259,16 @@ class ScheduleManager(QObject):
 
         try:
             old_path.rename(new_path)
+            old_journal = ScheduleJournal.path_for(self.journal_dir, old_path)
+            if old_journal.exists():
+                old_journal.rename(ScheduleJournal.path_for(self.journal_dir, new_path))
             logger.success(f"Schedule renamed: {old_name} -> {new_name}")
 
             # 要更新 runtime 和当前记录
             if self.current_schedule_name == old_name:
                 self.current_schedule_name = new_name
                 self.schedule_path = new_path
+                self._open_journal()
                 self.app_central.configs.schedule.current_schedule = new_name
                 self.scheduleSwitched.emit(self.schedule)
                 self.scheduleModified.emit(self.schedule)
@@ -227,13 +305,7 @@ class ScheduleManager(QObject):
             imported_schedule = ScheduleData.model_validate(data)
 
             # 设置当前 schedule 并保存
-            self.schedule = imported_schedule
-            self.current_schedule_name = src_path.stem
-            self.schedule_path = self.schedules_dir / f"{self.current_schedule_name}.json"
-            self.save()  # 保存到本地
-
-            self.scheduleSwitched.emit(self.schedule)
-            self.scheduleModified.emit(self.schedule)
+            self.replace(imported_schedule, self.schedules_dir / f"{src_path.stem}.json")
             logger.success(f"Schedule imported from {src_path.name}")
             return True
         except Exception as e:
@@ -248,6 +320,7 @@ class ScheduleManager(QObject):
             return False
 
         src_path = self.schedules_dir / f"{filename}.json"
+        self.flush()
         if not src_path.exists():
             logger.error(f"课程表不存在: {filename}")
             return False
@@ -0,0 +1,88 @@
+from bisect import insort
+from heapq import merge
+from typing import Dict, List, Optional, Iterable
+
+from src.core.schedule.model import Timetable
+
+
+class OverrideIndex:
+    """
+    Override 索引：entryId -> dayOfWeek -> [Timetable]
+    dayOfWeek 为空的 override 放在 None 桶中（对所有星期生效）。
+    桶内保持 schedule.overrides 中的先后顺序，保证覆盖优先级与线性遍历一致。
+    """
+
+    def __init__(self, overrides: Iterable[Timetable] = ()):
+        self._by_entry: Dict[str, Dict[Optional[int], List[Timetable]]] = {}
+        self._order: Dict[str, float] = {}  # override.id -> 顺序
+        self._counter = 0
+        self.rebuild(overrides)
+
+    def rebuild(self, overrides: Iterable[Timetable]):
+        self._by_entry.clear()
+        self._order.clear()
+        self._counter = 0
+        for override in overrides:
+            self.add(override)
+
+    def add(self, override: Timetable):
+        """新增（追加到末尾）"""
+        self._order[override.id] = self._counter
+        self._counter += 1
+        buckets = self._by_entry.setdefault(override.entryId, {})
+        for weekday in dict.fromkeys(override.dayOfWeek or [None]):
+            buckets.setdefault(weekday, []).append(override)
+
+    def place(self, overrides: List[Timetable], index: int):
+        """登记 overrides[index]，顺序取列表中前后两项之间（撤销删除时恢复原位置）"""
+        override = overrides[index]
+        prev = self._order.get(overrides[index - 1].id) if index > 0 else None
+        following = self._order.get(overrides[index + 1].id) if index + 1 < len(overrides) else None
+        if following is None:
+            self.add(override)
+            return
+        self._order[override.id] = following - 1 if prev is None else (prev + following) / 2
+        buckets = self._by_entry.setdefault(override.entryId, {})
+        for weekday in dict.fromkeys(override.dayOfWeek or [None]):
+            insort(buckets.setdefault(weekday, []), override, key=self._key)
+
+    def remove(self, override: Timetable):
+        buckets = self._by_entry.get(override.entryId)
+        if buckets is None:
+            return
+        for weekday in list(buckets):
+            bucket = [o for o in buckets[weekday] if o is not override]
+            if bucket:
+                buckets[weekday] = bucket
+            else:
+                del buckets[weekday]
+        if not buckets:
+            del self._by_entry[override.entryId]
+        self._order.pop(override.id, None)
+
+    def _key(self, override: Timetable) -> int:
+        return self._order.get(override.id, 0)
+
+    def for_entry(self, entry_id: str) -> List[Timetable]:
+        """某条目的全部 override（按原顺序）"""
+        buckets = self._by_entry.get(entry_id)
+        if not buckets:
+            return []
+        seen = {}
+        for bucket in buckets.values():
+            for override in bucket:
+                seen[id(override)] = override
+        return sorted(seen.values(), key=self._key)
+
+    def for_weekday(self, entry_id: str, weekday: int) -> List[Timetable]:
+        """某条目在某星期可能生效的 override（按原顺序）"""
+        buckets = self._by_entry.get(entry_id)
+        if not buckets:
+            return []
+        specific = buckets.get(weekday)
+        general = buckets.get(None)
+        if not specific:
+            return general or []
+        if not general:
+            return specific
+        return list(merge(specific, general, key=self._key))
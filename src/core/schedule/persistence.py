@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple, Set
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from loguru import logger
+
+from src.core.schedule.journal import ScheduleJournal
+from src.core.schedule.model import ScheduleData
+from src.core.utils.profiler import tick_profiler
+
+
+def write_atomic(path: Path, data: Any):
+    """
+    原子写入 JSON：先写同目录下的临时文件并 fsync，再 rename 覆盖
+    写入过程中断电时，原文件保持不变
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    content = json.dumps(data, ensure_ascii=False, indent=4)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path):
+    """同步目录项，保证 rename 落盘（Windows 不支持，忽略）"""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SchedulePersistence(QObject):
+    """
+    课表持久化
+    - 连续修改合并为一次写入（静默 DEBOUNCE_MS 后）
+    - 防抖结束时在 GUI 线程用 model_dump() 取 dict 快照（与模型不共享对象，之后的编辑不影响它），
+      JSON 序列化与写盘在后台线程进行，按提交顺序执行；两者耗时见 tick 分析中的 schedule.snapshot / schedule.write
+    - 原子写入 + 定期备份（每个课表最多保留 BACKUP_LIMIT 份）
+    - 编辑日志的缓冲记录在同一线程中追加写入（排队期间的记录合并为一次 fsync）
+    - 快照写入成功后压缩对应的编辑日志
+    """
+    saved = Signal(str)  # path
+    saveFailed = Signal(str, str)  # path, error
+
+    DEBOUNCE_MS = 800
+    BACKUP_LIMIT = 10
+    BACKUP_INTERVAL_S = 5 * 60  # 两次自动备份的最小间隔
+
+    def __init__(self, backup_dir: Path, parent=None):
+        super().__init__(parent)
+        self.backup_dir = Path(backup_dir)
+        self._pending: Dict[Path, Tuple[ScheduleData, Optional[ScheduleJournal]]] = {}  # path -> 待保存的课表
+        self._last_backup: Dict[Path, float] = {}  # path -> 上次备份时间
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="schedule-save")
+        self._last_future: Optional[Future] = None
+        self._journals_queued: Set[ScheduleJournal] = set()  # 已排队等待写入的日志
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._commit_pending)
+
+    def request_save(self, path: Path, schedule: ScheduleData,
+                     journal: Optional[ScheduleJournal] = None, delay_ms: Optional[int] = None):
+        """
+        计划保存（防抖）
+        :param journal: 快照写入后需要压缩的编辑日志
+        :param delay_ms: 静默时间，默认 DEBOUNCE_MS
+        """
+        self._pending[Path(path)] = (schedule, journal)
+        self._timer.start(self.DEBOUNCE_MS if delay_ms is None else delay_ms)
+
+    def write_journal(self, journal: ScheduleJournal):
+        """在后台追加日志中缓冲的记录（已排队时不重复提交）"""
+        if journal in self._journals_queued:
+            return
+        self._journals_queued.add(journal)
+        self._last_future = self._executor.submit(self._write_journal, journal)
+
+    def discard(self, path: Path):
+        """放弃某个文件的待保存内容（如已删除）"""
+        self._pending.pop(Path(path), None)
+
+    def save_now(self, path: Path, schedule: ScheduleData, journal: Optional[ScheduleJournal] = None) -> bool:
+        """立即保存并等待完成（用户手动保存）"""
+        self._pending.pop(Path(path), None)
+        future = self._submit(Path(path), schedule, journal)
+        return future.result()
+
+    def flush(self):
+        """立即写出所有待保存内容并等待完成"""
+        self._commit_pending()
+        if self._last_future is not None:
+            self._last_future.result()
+
+    def shutdown(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def backup(self, path: Path, suffix: str = "") -> Optional[Path]:
+        """将文件当前内容复制到备份目录（不计入自动备份轮换）"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        target = self._backup_path(path, suffix)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+            return target
+        except OSError as e:
+            logger.error(f"Failed to back up {path.name}: {e}")
+            return None
+
+    def _commit_pending(self):
+        self._timer.stop()
+        pending, self._pending = self._pending, {}
+        for path, (schedule, journal) in pending.items():
+            self._submit(path, schedule, journal)
+
+    def _submit(self, path: Path, schedule: ScheduleData, journal: Optional[ScheduleJournal] = None) -> Future:
+        with tick_profiler.measure("schedule.snapshot"):  # 后台线程不能读取正在被编辑的模型
+            data = schedule.model_dump()
+        mark = journal.mark() if journal else 0  # 快照包含的日志位置
+        self._last_future = self._executor.submit(self._write, path, data, journal, mark)
+        return self._last_future
+
+    def _write(self, path: Path, data: dict, journal: Optional[ScheduleJournal], mark: int) -> bool:
+        try:
+            with tick_profiler.measure("schedule.write"):
+                self._rotate_backup(path)
+                write_atomic(path, data)
+        except Exception as e:
+            logger.error(f"Error saving schedule: {e}")
+            self.saveFailed.emit(str(path), str(e))
+            return False
+        if journal is not None:
+            journal.compact(mark)
+        logger.success(f"Schedule saved to {path.name}")
+        self.saved.emit(str(path))
+        return True
+
+    def _write_journal(self, journal: ScheduleJournal):
+        self._journals_queued.discard(journal)  # 之后追加的记录需要再次提交
+        journal.write_pending()
+
+    def _backup_path(self, path: Path, suffix: str = "") -> Path:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.backup_dir / path.stem / f"{stamp}{'_' + suffix if suffix else ''}.json"
+
+    def _rotate_backup(self, path: Path):
+        """覆盖前备份旧文件，超出 BACKUP_LIMIT 的旧备份被删除"""
+        now = time.monotonic()
+        last = self._last_backup.get(path)
+        if not path.exists() or (last is not None and now - last < self.BACKUP_INTERVAL_S):
+            return
+        target = self._backup_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(path, target)
+        self._last_backup[path] = now
+
+        backups = sorted(target.parent.glob("????????_??????.json"))
+        for old in backups[:-self.BACKUP_LIMIT]:
+            try:
+                old.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to remove old backup {old.name}: {e}")
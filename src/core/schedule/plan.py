@@ -0,0 +1,132 @@
+from bisect import bisect_right
+from datetime import datetime
+from typing import Optional, List, Tuple, Dict
+
+from src.core.schedule.model import Entry, EntryType, Timeline, Subject
+
+DISPLAY_TYPES = {EntryType.CLASS, EntryType.ACTIVITY}
+
+
+def parse_minutes(value: str) -> Optional[int]:
+    """
+    "HH:MM" -> 当天的分钟数，格式错误返回 None
+    """
+    try:
+        hour, minute = value.split(":")
+        hour, minute = int(hour), int(minute)
+    except (ValueError, AttributeError):
+        return None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return None
+    return hour * 60 + minute
+
+
+def seconds_of_day(now: datetime) -> float:
+    return now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1_000_000
+
+
+class PlanState:
+    """
+    某一时刻在 DayPlan 中的位置（一个时间段内所有查询结果都相同）
+    """
+    __slots__ = ("index", "entry", "subject", "start", "end", "next_index", "next_start", "next_entries")
+
+    def __init__(self, index: int, entry: Optional[Entry], subject: Optional[Subject],
+                 start: Optional[int], end: Optional[int], next_index: int,
+                 next_start: Optional[int], next_entries: List[Entry]):
+        self.index = index  # 时间段序号，-1 表示第一个边界之前
+        self.entry = entry
+        self.subject = subject
+        self.start = start  # 秒
+        self.end = end  # 秒
+        self.next_index = next_index
+        self.next_start = next_start  # 秒
+        self.next_entries = next_entries
+
+    @property
+    def status(self) -> EntryType:
+        return self.entry.type if self.entry else EntryType.FREE
+
+    def remaining_seconds(self, now_seconds: float) -> float:
+        """距当前条目结束（或下一条目开始）的秒数"""
+        if self.entry is not None:
+            return max(self.end - now_seconds, 0)
+        if self.next_start is not None:
+            return max(self.next_start - now_seconds, 0)
+        return 0
+
+    def progress(self, now_seconds: float) -> float:
+        if self.entry is None:  # 空
+            return 1
+        if now_seconds <= self.start:
+            return 0
+        if now_seconds >= self.end:
+            return 1
+        return round((now_seconds - self.start) / (self.end - self.start), 2)
+
+
+class DayPlan:
+    """
+    编译后的单日日程
+    将 Timeline 转为按时间排序的边界数组，每个时间段的查询结果（当前条目、科目、接下来的条目）预先算好，
+    每次 tick 只需一次二分查找。
+    """
+
+    def __init__(self, day: Timeline, subjects: List[Subject]):
+        self.day = day
+        subject_map: Dict[str, Subject] = {s.id: s for s in subjects}
+
+        # (start, end, entry)，保留原始顺序以便重叠时按原逻辑取第一个
+        spans: List[Tuple[int, int, Entry]] = []
+        for entry in day.entries:
+            start = parse_minutes(entry.startTime)
+            end = parse_minutes(entry.endTime)
+            if start is None or end is None:
+                continue
+            spans.append((start * 60, end * 60, entry))
+
+        displayable = sorted(
+            (span for span in spans if span[2].type in DISPLAY_TYPES),
+            key=lambda span: span[0]
+        )
+        self.display_starts: List[int] = [span[0] for span in displayable]
+        self.display_entries: List[Entry] = [span[2] for span in displayable]
+
+        self.bounds: List[int] = sorted({t for span in spans for t in span[:2]})
+        self._before = self._build_state(-1, None, spans, subject_map)
+        self.states: List[PlanState] = [
+            self._build_state(i, bound, spans, subject_map) for i, bound in enumerate(self.bounds)
+        ]
+
+    def _build_state(self, index: int, at: Optional[int], spans: List[Tuple[int, int, Entry]],
+                     subject_map: Dict[str, Subject]) -> PlanState:
+        current = None
+        if at is not None:
+            current = next((span for span in spans if span[0] <= at < span[1]), None)
+
+        # 接下来的条目：开始时间严格晚于当前时间段起点
+        next_index = 0 if at is None else bisect_right(self.display_starts, at)
+        next_start = self.display_starts[next_index] if next_index < len(self.display_starts) else None
+
+        if current is None:
+            return PlanState(index, None, None, None, None, next_index, next_start,
+                             self.display_entries[next_index:])
+        start, end, entry = current
+        subject = subject_map.get(entry.subjectId) if entry.subjectId else None
+        return PlanState(index, entry, subject, start, end, next_index, next_start,
+                         self.display_entries[next_index:])
+
+    def locate(self, now: datetime) -> PlanState:
+        """二分查找当前时刻所在的时间段"""
+        index = bisect_right(self.bounds, seconds_of_day(now)) - 1
+        return self.states[index] if index >= 0 else self._before
+
+    def next_boundary(self, now: datetime) -> Optional[int]:
+        """下一个状态变化点（秒），当天已无变化返回 None"""
+        index = bisect_right(self.bounds, seconds_of_day(now))
+        return self.bounds[index] if index < len(self.bounds) else None
+
+    @property
+    def all_entries(self) -> List[Entry]:
+        """当天所有可显示的条目（已排序）"""
+        return self.display_entries
@@ -6,14 +6,30 @@ from loguru import logger
 
 from src.core.notification import NotificationProvider, NotificationData, NotificationLevel
 from src.core.schedule.model import ScheduleData, MetaInfo, Timeline, Entry, EntryType, Subject
+from src.core.schedule.plan import DayPlan, PlanState, seconds_of_day
 from src.core.schedule.service import ScheduleServices
 from src.core.utils import get_cycle_week, get_week_number
+from src.core.utils.profiler import tick_profiler
 
 
 class ScheduleRuntime(QObject):
-    updated = Signal()  # 文件更新
+    updated = Signal()  # 每次刷新
     currentsChanged = Signal(EntryType)  # 日程更新
 
+    # 分组变化信号，仅在值真正变化时发送
+    timeChanged = Signal()  # 时间、剩余时间、进度
+    dayChanged = Signal()  # 日期、周数、当天日程
+    entryChanged = Signal()  # 当前/接下来的条目、状态
+    subjectChanged = Signal()  # 科目
+    metaChanged = Signal()  # 课表元数据
+
+    PROJECTION_GROUPS = {
+        "day": ("currentDayEntries",),
+        "entry": ("currentEntry", "nextEntries"),
+        "subject": ("subjects", "currentSubject"),
+        "meta": ("scheduleMeta",),
+    }
+
     def __init__(self, app_central):
         super().__init__()
         self.app_central = app_central
@@ -41,6 +57,23 @@ class ScheduleRuntime(QObject):
         self.current_subject: Optional[Subject] = None
         self.current_title: Optional[str] = None
 
+        # 编译后的当天日程
+        self._day_plan: Optional[DayPlan] = None
+        self._plan_state: Optional[PlanState] = None
+        self._plan_key: Optional[tuple] = None
+        self._time_date = None
+
+        # 分组快照与缓存的 dict 转换
+        self._snapshot: dict = {}
+        self._projections: dict = {}
+        self._group_signals = {
+            "time": self.timeChanged,
+            "day": self.dayChanged,
+            "entry": self.entryChanged,
+            "subject": self.subjectChanged,
+            "meta": self.metaChanged,
+        }
+
         # Separate notification providers for different notification types
         self.class_notification_provider = None
         self.activity_notification_provider = None
@@ -129,60 +162,62 @@ class ScheduleRuntime(QObject):
         self._register_notification_providers()
 
     # TIME
-    @Property(str, notify=updated)
+    @Property(str, notify=timeChanged)
     def currentTime(self) -> str:
         return self.current_time.strftime("%H:%M:%S")
 
-    @Property(int, notify=updated)
+    @Property(int, notify=dayChanged)
     def currentDayOfWeek(self) -> int:
         return self.current_day_of_week
 
-    @Property(dict, notify=updated)
+    @Property(dict, notify=dayChanged)
     def currentDate(self) -> dict:
         return { "year": self.current_time.year, "month": self.current_time.month, "day": self.current_time.day }
 
-    @Property(int, notify=updated)
+    @Property(int, notify=dayChanged)
     def currentWeek(self) -> int:
         return self.current_week
 
-    @Property(int, notify=updated)
+    @Property(int, notify=dayChanged)
     def currentWeekOfCycle(self) -> int:
         return self.current_week_of_cycle
 
     # SCHEDULE
-    @Property(list, notify=updated)
+    @Property(list, notify=subjectChanged)
     def subjects(self) -> list:
         if not self.schedule:
             return []
-        return [s.model_dump() for s in self.schedule.subjects]
+        return self._projection("subjects", lambda: [s.model_dump() for s in self.schedule.subjects])
 
-    @Property(dict, notify=updated)
+    @Property(dict, notify=metaChanged)
     def scheduleMeta(self) -> dict:
         if self.schedule_meta is None:
             return {}
-        return self.schedule_meta.model_dump()
+        return self._projection("scheduleMeta", self.schedule_meta.model_dump)
 
-    @Property(list, notify=updated)
+    @Property(list, notify=dayChanged)
     def currentDayEntries(self) -> list:  # 当前的日程
         if not self.current_day:
             return []
-        return [entry.model_dump() for entry in self.current_day.entries]
+        return self._projection("currentDayEntries", lambda: [entry.model_dump() for entry in self.current_day.entries])
 
-    @Property(dict, notify=updated)
+    @Property(dict, notify=entryChanged)
     def currentEntry(self) -> dict:
-        return self.current_entry.model_dump() if self.current_entry else {}
+        if not self.current_entry:
+            return {}
+        return self._projection("currentEntry", self.current_entry.model_dump)
 
-    @Property(list, notify=updated)
+    @Property(list, notify=entryChanged)
     def nextEntries(self) -> list:  # 接下来的日程
         if not self.next_entries:
             return []
-        return [entry.model_dump() for entry in self.next_entries]
+        return self._projection("nextEntries", lambda: [entry.model_dump() for entry in self.next_entries])
 
-    @Property(int, notify=updated)
+    @Property(int, notify=timeChanged)
     def timeOffset(self):
         return self.time_offset
 
-    @Property(dict, notify=updated)
+    @Property(dict, notify=timeChanged)
     def remainingTime(self) -> dict:
         if not self.remaining_time:
             return {
@@ -195,34 +230,79 @@ class ScheduleRuntime(QObject):
         }
         return result
 
-    @Property(float, notify=updated)
+    @Property(float, notify=timeChanged)
     def progress(self) -> float:
         if not self._progress:
             return 0.0
         return self._progress
 
-    @Property(str, notify=updated)
+    @Property(str, notify=entryChanged)
     def currentStatus(self):
         if not self.current_status:
             return EntryType.FREE.value
         return self.current_status.value
 
     # SUBJECT
-    @Property(dict, notify=updated)
+    @Property(dict, notify=subjectChanged)
     def currentSubject(self) -> dict:
-        return self.current_subject.model_dump() if self.current_subject else None
+        if not self.current_subject:
+            return None
+        return self._projection("currentSubject", self.current_subject.model_dump)
 
-    @Property(str, notify=updated)
+    @Property(str, notify=entryChanged)
     def currentTitle(self) -> str:
         return self.current_title
 
+    def _projection(self, key: str, factory):
+        """缓存的 dict 转换，在所属分组变化前复用"""
+        if key not in self._projections:
+            self._projections[key] = factory()
+        return self._projections[key]
+
     def refresh(self, schedule: ScheduleData = None):
         if schedule is None and self.schedule is None:
             return
-        self._update_schedule(schedule)
-        self._update_time()
-        self._update_notify()
-        self.updated.emit()
+        with tick_profiler.measure("runtime.refresh"):
+            with tick_profiler.measure("runtime.schedule"):
+                self._update_schedule(schedule)
+            with tick_profiler.measure("runtime.time"):
+                self._update_time(schedule is not None)
+            with tick_profiler.measure("runtime.notify"):
+                self._update_notify()
+            self._emit_changes(schedule is not None)
+            with tick_profiler.measure("signal runtime.updated"):
+                self.updated.emit()
+
+    def _emit_changes(self, modified: bool):
+        """
+        对比各分组的快照，只发送真正变化的分组信号
+        :param modified: 课表被修改（科目、元数据可能被原地修改，强制刷新）
+        """
+        snapshot = {
+            "time": (
+                self.current_time.replace(microsecond=0),
+                self.remaining_time.seconds if self.remaining_time else None,
+                self._progress,
+                self.time_offset
+            ),
+            "day": (
+                self.current_time.date(), self.current_day_of_week, self.current_week,
+                self.current_week_of_cycle, self.current_day
+            ),
+            "entry": (self._plan_state, self.current_entry, self.current_status, self.current_title),
+            "subject": (self.current_subject, self.schedule.subjects if self.schedule else None),
+            "meta": (self.schedule_meta,),
+        }
+
+        for group, value in snapshot.items():
+            if not modified or group in {"time", "day", "entry"}:
+                if self._snapshot.get(group) == value:
+                    continue
+            self._snapshot[group] = value
+            for key in self.PROJECTION_GROUPS.get(group, ()):
+                self._projections.pop(key, None)
+            with tick_profiler.measure(f"signal runtime.{group}"):
+                self._group_signals[group].emit()
 
     def _update_schedule(self, schedule: ScheduleData):
         """
@@ -235,18 +315,33 @@ class ScheduleRuntime(QObject):
         self.current_offset_time = self.current_time + timedelta(seconds=self.time_offset)  # 内部计算时间
         self.schedule = schedule or self.schedule
         self.schedule_meta = self.schedule.meta
-        self.current_day = self.services.get_day_entries(self.schedule, self.current_offset_time)
-
-        if self.current_day:
-            self.current_entry = self.services.get_current_entry(self.current_day, self.current_offset_time)
-            self.all_entries = self.services.get_all_entries(self.current_day)
-            self.next_entries = self.services.get_next_entries(self.current_day, self.current_offset_time)
-            self.remaining_time = self.services.get_remaining_time(self.current_day, self.current_offset_time)
-            self.current_status = self.services.get_current_status(self.current_day, self.current_offset_time)
-            self.current_subject = self.services.get_current_subject(self.current_day, self.schedule.subjects,
-                                                                     self.current_offset_time)
-            self.current_title = getattr(self.current_entry, "title", None)
+
+        # 仅在课表或日期变化时重新编译当天日程
+        plan_key = self._get_plan_key()
+        if schedule is not None or plan_key != self._plan_key:
+            self._plan_key = plan_key
+            self.current_day = self.services.get_day_entries(self.schedule, self.current_offset_time)
+            self._day_plan = (
+                self.services.compile_day_plan(self.current_day, self.schedule.subjects)
+                if self.current_day else None
+            )
+            self._plan_state = None
+
+        if self._day_plan:
+            state = self._day_plan.locate(self.current_offset_time)
+            now_seconds = seconds_of_day(self.current_offset_time)
+            if state is not self._plan_state:  # 进入新的时间段
+                self._plan_state = state
+                self.current_entry = state.entry
+                self.all_entries = self._day_plan.all_entries
+                self.next_entries = state.next_entries
+                self.current_status = state.status
+                self.current_subject = state.subject
+                self.current_title = getattr(self.current_entry, "title", None)
+            self.remaining_time = timedelta(seconds=state.remaining_seconds(now_seconds))
+            self._progress = state.progress(now_seconds)
         else:
+            self._plan_state = None
             self.current_entry = None
             self.all_entries = None
             self.next_entries = None
@@ -254,27 +349,50 @@ class ScheduleRuntime(QObject):
             self.current_status = EntryType.FREE
             self.current_subject = None
             self.current_title = None
+            self._progress = 1
 
-        self._progress = self.get_progress_percent()
         if self.previous_entry != self.current_entry:
             self.currentsChanged.emit(self.current_status)
 
-    def _update_time(self):  # 更新时间
+    def _get_plan_key(self) -> tuple:
+        date = self.current_offset_time.date()
+        reschedule = self.app_central.configs.schedule.reschedule_day.get(date.strftime("%Y-%m-%d"))
+        return date, reschedule
+
+    def _update_time(self, modified: bool = False):  # 更新时间
+        date = self.current_offset_time.date()
+        if not modified and date == self._time_date:  # 周数只随日期和课表变化
+            return
+        self._time_date = date
         self.current_day_of_week = self.current_offset_time.isoweekday()
         self.current_week = get_week_number(self.schedule.meta.startDate, self.current_offset_time)
         self.current_week_of_cycle = get_cycle_week(self.current_week, self.schedule.meta.maxWeekCycle)
 
+    def next_boundary_time(self) -> Optional[datetime]:
+        """
+        下一个需要唤醒的时间点（条目边界或预备铃），以本地真实时间表示
+        """
+        if not self._day_plan:
+            return None
+        now_seconds = seconds_of_day(self.current_offset_time)
+        candidates = []
+        boundary = self._day_plan.next_boundary(self.current_offset_time)
+        if boundary is not None:
+            candidates.append(boundary)
+        if self._plan_state and self._plan_state.next_start is not None:
+            prep_min = getattr(self.app_central.configs.schedule, 'preparation_time', 2) or 2
+            bell = self._plan_state.next_start - prep_min * 60
+            if bell > now_seconds:
+                candidates.append(bell)
+        if not candidates:
+            return None
+        when = self.current_time + timedelta(seconds=min(candidates) - now_seconds)
+        return (when + timedelta(microseconds=500_000)).replace(microsecond=0)  # 边界都落在整秒
+
     def get_progress_percent(self) -> float:
-        if not self.current_entry:  # 空
+        if not self.current_entry or not self._plan_state:  # 空
             return 1
-
-        now = self.current_offset_time
-        start = datetime.combine(now.date(), datetime.strptime(self.current_entry.startTime, "%H:%M").time())
-        end = datetime.combine(now.date(), datetime.strptime(self.current_entry.endTime, "%H:%M").time())
-
-        if now <= start: return 0
-        if now >= end: return 1
-        return round((now - start).total_seconds() / (end - start).total_seconds(), 2)
+        return self._plan_state.progress(seconds_of_day(self.current_offset_time))
 
     def _update_notify(self):
         if self.previous_entry != self.current_entry:
@@ -426,11 +544,10 @@ class ScheduleRuntime(QObject):
         ):
             try:
                 next_entry = self.next_entries[0]
-                next_start = datetime.strptime(next_entry.startTime, "%H:%M")
-                next_start = datetime.combine(self.current_offset_time.date(), next_start.time())
+                next_start = self._plan_state.next_start
                 prep_min = getattr(self.app_central.configs.schedule, 'preparation_time', 2) or 2
 
-                if next_start - timedelta(minutes=prep_min) == self.current_offset_time.replace(microsecond=0):
+                if next_start - prep_min * 60 == int(seconds_of_day(self.current_offset_time)):
                     subject_dict = None
                     if self.schedule and hasattr(self.schedule, 'subjects') and self.schedule.subjects:
                         sub = self.services.get_subject(next_entry.subjectId, self.schedule.subjects)
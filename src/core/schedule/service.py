@@ -1,46 +1,73 @@
 from datetime import datetime, timedelta
 from typing import Optional, List, Union
 
+from loguru import logger
+
 from src.core.schedule.model import Entry, EntryType, Timeline, Subject, ScheduleData, Timetable, WeekType
+from src.core.schedule.calendar import ScheduleCalendar
+from src.core.schedule.overrides import OverrideIndex
+from src.core.schedule.plan import DayPlan
 
 
 class ScheduleServices:
     def __init__(self, app_central):
         self.app_central = app_central
+        self._calendar: Optional[ScheduleCalendar] = None
+        self._mismatched: Optional[ScheduleData] = None  # 已警告过的、与 manager 索引不一致的课表
 
     def _get_reschedule_map(self) -> dict:
         return self.app_central.configs.schedule.reschedule_day
 
     def get_day_entries(self, schedule: ScheduleData, now: datetime) -> Optional[Timeline]:
         """
-        返回当前日期对应的 DayEntry（深拷贝，应用 override，不修改原始数据）
+        返回当前日期对应的 DayEntry（应用 override 的副本，不修改原始数据）
+        结果由学期日历索引缓存
         """
-        current_week = self._get_week_index(schedule, now)  # 当前第几周
-        reschedule_map = self._get_reschedule_map()
+        return self.get_calendar(schedule).get(now.date(), self._get_reschedule_map())
 
-        # 调休处理：优先使用调休映射表
-        date_str = now.strftime("%Y-%m-%d")
-        if date_str in reschedule_map:
-            weekday = reschedule_map[date_str]  # 1-7
-        else:
-            weekday = now.isoweekday()  # 默认 1-7
+    def get_calendar(self, schedule: ScheduleData) -> ScheduleCalendar:
+        """
+        获取课表对应的日历索引，使用 ScheduleManager 维护的那份（编辑器按日期失效）
+        manager 的索引不属于该课表时（课表被替换但未重建索引）不缓存，每次重新解析，避免返回过期的日程
+        """
+        manager = getattr(self.app_central, "schedule_manager", None)
+        if manager is None:  # 启动早期，没有编辑器会修改课表
+            if self._calendar is None or self._calendar.schedule is not schedule:
+                self._calendar = ScheduleCalendar(schedule, self.resolve_day)
+            return self._calendar
+
+        calendar = getattr(manager, "calendar", None)
+        if calendar is not None and calendar.schedule is schedule:
+            return calendar
+        if self._mismatched is not schedule:
+            self._mismatched = schedule
+            logger.warning("Schedule is not indexed by ScheduleManager, resolving days without the calendar cache")
+        return ScheduleCalendar(schedule, self.resolve_day)
 
+    @staticmethod
+    def resolve_day(schedule: ScheduleData, weekday: int, current_week: int,
+                    overrides: Optional[OverrideIndex] = None) -> Optional[Timeline]:
+        """
+        解析某日的日程（深拷贝，应用 override）
+        :param weekday: 星期（已处理调休） 1-7
+        :param current_week: 当前第几周
+        :param overrides: override 索引，为空时临时构建
+        """
+        overrides = overrides or OverrideIndex(schedule.overrides)
         max_week_cycle = schedule.meta.maxWeekCycle or 1
 
-        for day in schedule.days:
-            day_of_week_list = [day.dayOfWeek] if isinstance(day.dayOfWeek, int) else day.dayOfWeek
+        for timeline in schedule.days:
+            day_of_week_list = [timeline.dayOfWeek] if isinstance(timeline.dayOfWeek, int) else timeline.dayOfWeek
             if day_of_week_list and weekday in day_of_week_list:
-                if self._is_in_week(day.weeks, current_week, max_week_cycle):
+                if ScheduleServices._is_in_week(timeline.weeks, current_week, max_week_cycle):
                     # 深拷贝 day 和 entries
-                    day_copy = day.model_copy()
-                    day_copy.entries = [entry.model_copy() for entry in day.entries]
+                    day_copy = timeline.model_copy()
+                    day_copy.entries = [entry.model_copy() for entry in timeline.entries]
 
                     # 应用 override 到副本
                     for entry in day_copy.entries:
-                        for override in schedule.overrides:
-                            if override.entryId != entry.id:
-                                continue
-                            if self._override_applies(override, weekday, current_week):
+                        for override in overrides.for_weekday(entry.id, weekday):
+                            if ScheduleServices._override_applies(override, weekday, current_week):
                                 if override.subjectId:
                                     entry.subjectId = override.subjectId
                                 if override.title:
@@ -49,15 +76,23 @@ class ScheduleServices:
                     return day_copy
         return None
 
-    def _override_applies(self, override: Timetable, weekday: int, current_week: int, max_week_cycle: int = 1) -> bool:
+    @staticmethod
+    def _override_applies(override: Timetable, weekday: int, current_week: int, max_week_cycle: int = 1) -> bool:
         if override.dayOfWeek:
             if weekday not in override.dayOfWeek:
                 return False
         if override.weeks:
-            if not self._is_in_week(override.weeks, current_week, max_week_cycle):
+            if not ScheduleServices._is_in_week(override.weeks, current_week, max_week_cycle):
                 return False
         return True
 
+    @staticmethod
+    def compile_day_plan(day: Timeline, subjects: List[Subject]) -> DayPlan:
+        """
+        编译当天日程，供 runtime 每秒查询
+        """
+        return DayPlan(day, subjects)
+
     @staticmethod
     def get_current_entry(day: Timeline, now: Optional[datetime] = None) -> Optional[Entry]:
         now = now or datetime.now()
@@ -111,7 +146,8 @@ class ScheduleServices:
 
     @staticmethod
     def get_current_status(day: Timeline, now: Optional[datetime] = None) -> EntryType:
-        return ScheduleServices.get_current_entry(day, now).type if ScheduleServices.get_current_entry(day, now) else EntryType.FREE
+        current = ScheduleServices.get_current_entry(day, now)
+        return current.type if current else EntryType.FREE
 
     @staticmethod
     def get_current_subject(day: Timeline, subjects: List[Subject], now: Optional[datetime] = None) -> Optional[
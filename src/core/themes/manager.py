@@ -11,6 +11,7 @@ from loguru import logger
 from src.core.themes.loader import ThemeLoader, APP_API_VERSION
 from src.core.themes.worker import ThemeImportWorker
 from src.core.directories import THEMES_PATH
+from src.core.utils.profiler import profiler
 
 DEFAULT_THEME_ID = "default"
 
@@ -127,7 +128,8 @@ class ThemeManager(QObject):
         return True
 
     def scan(self) -> None:
-        self._themes = self.loader.scan_themes(THEMES_PATH)
+        with profiler.span("scan themes", "theme"):
+            self._themes = self.loader.scan_themes(THEMES_PATH)
         self._currentTheme = self._app_central.configs.preferences.current_theme
         
         if not self._is_theme_valid(self._currentTheme):
@@ -1,25 +1,86 @@
-from PySide6.QtCore import QObject, QTimer, Signal
+from typing import Optional
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal, Qt
 from datetime import datetime
 
+from src.core.utils.profiler import tick_profiler
+
+
 class UnionUpdateTimer(QObject):
     tick = Signal()  # 每秒触发一次
+    boundary = Signal()  # 到达 arm_boundary 设定的时间点（总在该时间点之后的 tick 处理完后发送）
+
+    SLACK_MS = 2  # 避免计时器略早触发时仍停留在上一秒
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._running = False
+
         self._timer = QTimer(self)
-        self._timer.timeout.connect(self._check_time)
-        self._last_second = None
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_second)
+
+        self._boundary_timer = QTimer(self)
+        self._boundary_timer.setSingleShot(True)
+        self._boundary_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._boundary_timer.timeout.connect(self._on_boundary)
+        self._boundary_at: Optional[datetime] = None
+        self._expected: Optional[float] = None  # 本次唤醒的预期时间（perf_counter）
+        self._last_tick: Optional[datetime] = None
 
     def start(self):
-        now = datetime.now()
-        self._last_second = now.second
-        self._timer.start(50)
+        self._running = True
+        self._arm_second()
 
     def stop(self):
+        self._running = False
         self._timer.stop()
+        self._boundary_timer.stop()
+
+    def arm_boundary(self, when: Optional[datetime]):
+        """
+        设定下一个边界时间点，None 表示取消
+        重复设定同一时间点不会重置计时器
+        """
+        if when == self._boundary_at and (when is None or self._boundary_timer.isActive()):
+            return
+        self._boundary_at = when
+        self._boundary_timer.stop()
+        if when is None or not self._running:
+            return
+        delay_ms = max(int((when - datetime.now()).total_seconds() * 1000), 0) + self.SLACK_MS
+        self._boundary_timer.start(delay_ms)
 
-    def _check_time(self):
+    def _arm_second(self):
         now = datetime.now()
-        if now.second != self._last_second:
-            self._last_second = now.second
+        delay_ms = 1000 - now.microsecond // 1000 + self.SLACK_MS  # 对齐到下一个整秒
+        self._expected = time.perf_counter() + delay_ms / 1000
+        self._timer.start(delay_ms)
+
+    def _on_second(self):
+        if not self._running:
+            return
+        if self._expected is not None:  # 事件循环繁忙时计时器会迟到
+            tick_profiler.add("tick.lateness", max(time.perf_counter() - self._expected, 0) * 1000)
+            self._expected = None
+        self._arm_second()
+        self._emit_tick()
+
+    def _on_boundary(self):
+        at, self._boundary_at = self._boundary_at, None
+        if not self._running:
+            return
+        # 先 tick 刷新运行时状态，boundary 的处理函数读到的是边界之后的状态；
+        # 整秒计时器已在边界之后触发过时不再重复 tick
+        if at is None or self._last_tick is None or self._last_tick < at:
+            self._arm_second()  # 重置整秒计时
+            self._emit_tick()
+        self.boundary.emit()
+
+    def _emit_tick(self):
+        self._last_tick = datetime.now()
+        with tick_profiler.measure("tick"):
             self.tick.emit()
@@ -7,6 +7,7 @@ from loguru import logger
 from src.core.directories import LOGS_PATH, ROOT_PATH
 from src.core.notification import NotificationProvider
 from src.core.utils.auto_startup import autostart_supported, enable_autostart, disable_autostart, is_autostart_enabled
+from src.core.utils.profiler import profiler, tick_profiler
 
 
 class UtilsBackend(QObject):
@@ -105,6 +106,44 @@ class UtilsBackend(QObject):
             logger.exception(f"Failed to clear logs: {e}")
             return [False, 0]
 
+    # 启动性能分析（调试器）
+    @Slot(result=list)
+    def startupProfile(self):
+        """各启动阶段的耗时（毫秒）"""
+        return profiler.spans()
+
+    @Slot(result=float)
+    def startupTime(self):
+        return profiler.startup_ms or 0.0
+
+    @Slot(result=str)
+    def exportStartupTrace(self):
+        """导出 Chrome Trace 到日志目录，返回文件路径"""
+        try:
+            return str(profiler.export(LOGS_PATH / "startup-trace.json"))
+        except Exception as e:
+            logger.error(f"Failed to export startup trace: {e}")
+            return ""
+
+    # 运行时热点分析（调试器）
+    @Slot(result=list)
+    def tickStats(self):
+        """各测量项的耗时统计（毫秒）"""
+        return tick_profiler.stats()
+
+    @Slot()
+    def resetTickStats(self):
+        tick_profiler.reset()
+
+    @Slot(result=str)
+    def dumpTickStats(self):
+        """导出到日志目录，返回文件路径"""
+        try:
+            return str(tick_profiler.dump(LOGS_PATH / "tick-profile.json"))
+        except Exception as e:
+            logger.error(f"Failed to dump tick profile: {e}")
+            return ""
+
     # 设置与插件
     @Property(list, notify=extraSettingsChanged)
     def extraSettings(self):
@@ -0,0 +1,406 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Optional, Callable, Union
+
+from PySide6.QtCore import QObject, QMetaMethod
+from loguru import logger
+
+
+class ProfileSpan:
+    __slots__ = ("name", "category", "start", "wall", "cpu", "depth", "tid", "args")
+
+    def __init__(self, name: str, category: str, start: float, depth: int, tid: int, args: dict):
+        self.name = name
+        self.category = category
+        self.start = start  # perf_counter 时间
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.depth = depth
+        self.tid = tid
+        self.args = args
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "start_ms": round((self.start - origin) * 1000, 3),
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "depth": self.depth,
+            "args": self.args,
+        }
+
+
+class StartupProfiler:
+    """
+    启动性能分析
+    按阶段记录墙钟时间与（当前线程的）CPU 时间，可导出为 Chrome Trace（chrome://tracing / Perfetto）。
+    启动完成后仍会记录之后的阶段（如按需加载的窗口），总数不超过 MAX_SPANS。
+
+    with profiler.span("plugin:xxx", "plugin"):
+        ...
+    """
+    MAX_SPANS = 2000
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._spans: List[ProfileSpan] = []
+        self._local = threading.local()  # 每个线程的嵌套深度
+        self._lock = threading.Lock()
+        self.startup_ms: Optional[float] = None
+
+    @contextmanager
+    def span(self, name: str, category: str = "startup", **args):
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        record = ProfileSpan(name, category, time.perf_counter(), depth, threading.get_ident(), args)
+        cpu_start = time.thread_time()
+        try:
+            yield record
+        finally:
+            record.cpu = time.thread_time() - cpu_start
+            record.wall = time.perf_counter() - record.start
+            self._local.depth = depth
+            self._append(record)
+
+    def record(self, name: str, start: float, end: float, cpu: float = 0.0, category: str = "startup", **args):
+        """
+        补记一个已结束的阶段（start / end 为 time.perf_counter() 时间）
+        早于当前起点时，起点随之提前（如入口脚本记录的模块导入时间）
+        """
+        record = ProfileSpan(name, category, start, getattr(self._local, "depth", 0), threading.get_ident(), args)
+        record.wall = end - start
+        record.cpu = cpu
+        self._origin = min(self._origin, start)
+        self._append(record)
+
+    def _append(self, record: ProfileSpan):
+        with self._lock:
+            if len(self._spans) < self.MAX_SPANS:
+                self._spans.append(record)
+
+    def finish(self):
+        """标记启动完成"""
+        if self.startup_ms is not None:
+            return
+        self.startup_ms = (time.perf_counter() - self._origin) * 1000
+        slowest = sorted((s for s in self._spans if s.depth == 0), key=lambda s: s.wall, reverse=True)[:3]
+        logger.info(
+            f"Startup finished in {self.startup_ms:.0f} ms "
+            f"(slowest: {', '.join(f'{s.name} {s.wall * 1000:.0f} ms' for s in slowest)})"
+        )
+
+    def spans(self) -> List[Dict]:
+        """按开始时间排序的阶段列表"""
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: (s.start, s.depth))
+        return [s.to_dict(self._origin) for s in spans]
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+        events = [
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": round((s.start - self._origin) * 1e6),
+                "dur": round(s.wall * 1e6),
+                "pid": pid,
+                "tid": s.tid,
+                "args": {**s.args, "cpu_ms": round(s.cpu * 1000, 3)},
+            }
+            for s in spans
+        ]
+        if self.startup_ms is not None:
+            events.append({
+                "name": "startup finished", "cat": "startup", "ph": "i", "s": "p",
+                "ts": round(self.startup_ms * 1000), "pid": pid, "tid": threading.main_thread().ident,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Path) -> Path:
+        """写出 Chrome Trace JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        logger.info(f"Startup trace exported: {path}")
+        return path
+
+
+profiler = StartupProfiler()  # 进程级实例，导入时开始计时
+
+
+class LatencyHistogram:
+    """对数分桶的耗时直方图（毫秒）"""
+    __slots__ = ("counts", "count", "total", "max", "last")
+
+    BOUNDS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)  # 各桶上界，最后一桶为 +inf
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, ms: float):
+        self.counts[bisect_left(self.BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.last = ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float:
+        """近似分位数（所在桶的上界，不超过最大值）"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            if cumulative >= target:
+                return min(self.BOUNDS[i], self.max) if i < len(self.BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 4) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.5), 4),
+            "p95_ms": round(self.percentile(0.95), 4),
+            "p99_ms": round(self.percentile(0.99), 4),
+            "max_ms": round(self.max, 4),
+            "last_ms": round(self.last, 4),
+            "buckets": list(self.counts),
+        }
+
+
+class TickProfiler:
+    """
+    运行时热点分析（常驻，开销为每次测量两次 perf_counter）
+    按名称累计耗时直方图：tick 各阶段、每个自动化任务、每次信号分发等。
+
+    with tick_profiler.measure("runtime.refresh"):
+        ...
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._since = time.time()
+
+    @contextmanager
+    def measure(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(ms)
+
+    def stats(self) -> List[Dict]:
+        """各项统计（按名称排序）"""
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [{"name": name, **histogram.to_dict()} for name, histogram in items]
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._since = time.time()
+
+    def dump(self, path: Path) -> Path:
+        """写出 JSON（含分桶上界）"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "since": self._since,
+            "dumped_at": time.time(),
+            "bucket_bounds_ms": list(LatencyHistogram.BOUNDS),
+            "stats": self.stats(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        logger.info(f"Tick profile dumped: {path}")
+        return path
+
+
+tick_profiler = TickProfiler()
+
+
+class PluginUsage:
+    __slots__ = ("histograms", "window_ms", "rate_ms", "memory")
+
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}  # 类别 -> 耗时直方图
+        self.window_ms = 0.0  # 上次 take_window() 以来的耗时
+        self.rate_ms = 0.0  # 每个窗口耗时的滑动平均
+        self.memory = 0  # tracemalloc 归属的内存（字节）
+
+    @property
+    def total_ms(self) -> float:
+        return sum(h.total for h in self.histograms.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_ms, 3),
+            "rate_ms": round(self.rate_ms, 3),
+            "memory": self.memory,
+            "categories": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+        }
+
+
+class PluginProfiler:
+    """
+    插件资源统计
+    按插件累计 on_load、自动化任务、信号槽与 QML 后端槽的耗时；
+    代码归属按函数所在文件判断（插件目录），内存归属按 tracemalloc 记录的分配位置判断。
+
+    with plugin_profiler.measure("com.example.plugin", "on_load"):
+        ...
+    """
+    RATE_ALPHA = 0.3
+
+    def __init__(self):
+        self._usage: Dict[str, PluginUsage] = {}
+        # 规范化的插件目录前缀 -> plugin_id
+        # 写时复制：修改在锁内替换整个字典，读取方无需加锁即可安全遍历
+        self._dirs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def register_plugin(self, plugin_id: str, path: Union[str, Path, None]):
+        """登记插件目录（用于判断代码和内存的归属），可能在预导入线程中调用"""
+        if path:
+            prefix = os.path.normcase(os.path.abspath(path)).rstrip(os.sep) + os.sep
+            with self._lock:
+                self._dirs = {**self._dirs, prefix: plugin_id}
+
+    def forget(self, plugin_id: str):
+        with self._lock:
+            self._usage.pop(plugin_id, None)
+            self._dirs = {k: v for k, v in self._dirs.items() if v != plugin_id}
+
+    def owner_of_file(self, filename: str) -> Optional[str]:
+        filename = os.path.normcase(filename)
+        for prefix, plugin_id in self._dirs.items():
+            if filename.startswith(prefix):
+                return plugin_id
+        return None
+
+    def owner_of(self, func: Callable) -> Optional[str]:
+        """函数（或绑定方法）定义在哪个插件中"""
+        code = getattr(getattr(func, "__func__", func), "__code__", None)
+        if code is None:
+            return None
+        return self.owner_of_file(os.path.abspath(code.co_filename))
+
+    @contextmanager
+    def measure(self, plugin_id: Optional[str], category: str):
+        if plugin_id is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(plugin_id, category, (time.perf_counter() - start) * 1000)
+
+    def add(self, plugin_id: str, category: str, ms: float):
+        with self._lock:
+            usage = self._usage.get(plugin_id)
+            if usage is None:
+                usage = self._usage[plugin_id] = PluginUsage()
+            histogram = usage.histograms.get(category)
+            if histogram is None:
+                histogram = usage.histograms[category] = LatencyHistogram()
+            histogram.add(ms)
+            usage.window_ms += ms
+
+    def wrap(self, plugin_id: str, category: str, func: Callable) -> Callable:
+        """返回计入该插件耗时的包装函数"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(plugin_id, category, (time.perf_counter() - start) * 1000)
+        wrapper.__plugin_owner__ = plugin_id
+        return wrapper
+
+    def instrument(self, obj: QObject, plugin_id: str) -> int:
+        """
+        统计 QObject 上（QML 调用的）槽函数的耗时
+        PySide 按名称在实例上查找槽，因此在实例上替换为包装函数即可
+        """
+        meta_object = obj.metaObject()
+        names = set()
+        for i in range(QObject.staticMetaObject.methodCount(), meta_object.methodCount()):
+            method = meta_object.method(i)
+            if method.methodType() == QMetaMethod.MethodType.Slot:
+                names.add(method.name().data().decode())
+        count = 0
+        for name in names:
+            func = getattr(obj, name, None)
+            if callable(func) and not hasattr(func, "__plugin_owner__"):
+                setattr(obj, name, self.wrap(plugin_id, f"slot {name}", func))
+                count += 1
+        return count
+
+    def take_window(self) -> Dict[str, float]:
+        """取出各插件自上次调用以来的耗时（毫秒）并更新滑动平均"""
+        with self._lock:
+            window = {}
+            for plugin_id, usage in self._usage.items():
+                window[plugin_id] = usage.window_ms
+                usage.rate_ms += self.RATE_ALPHA * (usage.window_ms - usage.rate_ms)
+                usage.window_ms = 0.0
+            return window
+
+    def sample_memory(self) -> Dict[str, int]:
+        """按分配位置把 tracemalloc 追踪的内存归属到插件（未开启追踪时返回空）"""
+        if not tracemalloc.is_tracing():
+            return {}
+        memory: Dict[str, int] = {}
+        for stat in tracemalloc.take_snapshot().statistics("filename"):
+            plugin_id = self.owner_of_file(stat.traceback[0].filename)
+            if plugin_id is not None:
+                memory[plugin_id] = memory.get(plugin_id, 0) + stat.size
+        with self._lock:
+            for plugin_id in set(self._usage) | set(memory):
+                usage = self._usage.get(plugin_id)
+                if usage is None:
+                    usage = self._usage[plugin_id] = PluginUsage()
+                usage.memory = memory.get(plugin_id, 0)
+        return memory
+
+    def usage(self, plugin_id: str) -> Optional[PluginUsage]:
+        return self._usage.get(plugin_id)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {plugin_id: usage.to_dict() for plugin_id, usage in self._usage.items()}
+
+
+plugin_profiler = PluginProfiler()
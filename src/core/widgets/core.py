@@ -8,6 +8,7 @@ from loguru import logger
 
 from src.core import QML_PATH, SRC_PATH
 from src.core.directories import CW_PATH
+from src.core.utils.profiler import profiler
 
 from src.core.themes.manager import DEFAULT_THEME_ID
 
@@ -74,7 +75,8 @@ class WidgetsWindow(RinUI.RinUIWindow, QObject):
         else:
             logger.warning("No current theme ID set")
 
-        self.load(self.qml_main_path)
+        with profiler.span("qml Widgets", "qml"):
+            self.load(self.qml_main_path)
 
         self._start_listening()
 
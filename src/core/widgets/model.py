@@ -27,8 +27,6 @@ class WidgetListModel(QAbstractListModel):
         self._presets: Dict[str, List[WidgetEntry]] = {}
         self._current_preset: str = ""
 
-        self.modelChanged.connect(self.save_config)
-
     def roleNames(self):
         return {
             self.InstanceIdRole: b"instanceId",
@@ -95,6 +93,7 @@ class WidgetListModel(QAbstractListModel):
             self.load_preset(current_preset)
 
     def save_config(self):
+        """整体写回所有预设（会重新校验全部预设，日常修改请使用 _persist_preset）"""
         if not self._app_central:
             logger.warning("Cannot save widget presets: AppCentral not available")
             return
@@ -103,8 +102,44 @@ class WidgetListModel(QAbstractListModel):
         self._app_central.configs.preferences.current_preset = self._current_preset
         logger.info("Widget presets saved")
 
+    def _persist_preset(self, preset_name: str):
+        """
+        只把一个预设写回配置：替换字典中的这一项（或原地修改后直接通知），
+        不触发整个 widgets_presets 的重新校验
+        """
+        if not self._app_central or preset_name not in self._presets:
+            return
+        preferences = self._app_central.configs.preferences
+        stored = preferences.widgets_presets
+        if stored.get(preset_name) is not self._presets[preset_name]:
+            stored[preset_name] = self._presets[preset_name]  # dict 赋值不会触发 _on_change
+        if preferences._on_change:
+            preferences._on_change()
+
+    def _entry(self, instance_id: str) -> WidgetEntry | None:
+        """当前预设中的条目"""
+        for entry in self._presets.get(self._current_preset, []):
+            if entry.instance_id == instance_id:
+                return entry
+        return None
+
+    def _build_instance(self, entry: WidgetEntry) -> dict | None:
+        definition = self._definitions.get(entry.type_id)
+        if definition is None or definition.get("placeholder"):  # 插件未能提供该组件时不显示
+            return None
+        instance = dict(definition)
+        instance["instance_id"] = entry.instance_id or str(uuid.uuid4())
+        instance["type_id"] = entry.type_id
+        base_settings = dict(definition.get("default_settings", {}))
+        base_settings.update(entry.settings or {})
+        instance["settings"] = base_settings
+        # 保留 backend_obj 给 QML 使用
+        if "backend_obj" in definition:
+            instance["backend_obj"] = definition["backend_obj"]
+        return instance
+
     def syncCurrentPreset(self):
-        """同步当前 _instances 到 _presets"""
+        """同步当前 _instances 到 _presets（整体重建，仅用于外部直接修改 _instances 的情况）"""
         if not self._current_preset:
             return
         self._presets[self._current_preset] = [
@@ -115,10 +150,12 @@ class WidgetListModel(QAbstractListModel):
             )
             for w in self._instances
         ]
+        self._persist_preset(self._current_preset)
 
     @Slot(str, list)
     def updatePreset(self, preset_name: str, enabled_entries: list):
         self._presets[preset_name] = self._normalize_preset_entries(enabled_entries)
+        self._persist_preset(preset_name)
         if self._current_preset == preset_name:
             self.load_preset(preset_name)
         self.modelChanged.emit()
@@ -129,32 +166,65 @@ class WidgetListModel(QAbstractListModel):
 
     @Slot(str)
     def load_preset(self, preset_name: str):
+        """切换预设：与当前实例逐行比较，只发送插入 / 删除 / 移动 / 设置变化"""
         if preset_name not in self._presets:
             return
-        entries = self._presets[preset_name]
-        new_instances = []
-        for entry in entries:
-            type_id = entry.type_id
-            if type_id not in self._definitions:
-                continue
-            definition = self._definitions[type_id]
-            instance = dict(definition)
-            instance["instance_id"] = entry.instance_id or str(uuid.uuid4())
-            instance["type_id"] = type_id
-            base_settings = dict(definition.get("default_settings", {}))
-            base_settings.update(entry.settings or {})
-            instance["settings"] = base_settings
-            # 保留 backend_obj 给 QML 使用
-            if "backend_obj" in definition:
-                instance["backend_obj"] = definition["backend_obj"]
-            new_instances.append(instance)
-
-        self.beginResetModel()
-        self._instances = new_instances
-        self._current_preset = preset_name
-        self.endResetModel()
+        self._activate_providers(entry.type_id for entry in self._presets[preset_name])
+        new_instances = [
+            instance for instance in map(self._build_instance, self._presets[preset_name]) if instance
+        ]
+        self._apply_instances(new_instances)
+
+        if self._current_preset != preset_name:
+            self._current_preset = preset_name
+            if self._app_central:
+                self._app_central.configs.preferences.current_preset = preset_name
         self.modelChanged.emit()
 
+    @staticmethod
+    def _instance_key(instance: dict):
+        return instance["instance_id"], instance["type_id"]
+
+    def _apply_instances(self, new_instances: List[dict]):
+        """把 _instances 变换为 new_instances（最少的行操作，未变化的行保留其委托）"""
+        new_keys = [self._instance_key(w) for w in new_instances]
+        wanted = set(new_keys)
+
+        # 1. 删除不再存在的行（从后往前，保持索引有效）
+        for row in range(len(self._instances) - 1, -1, -1):
+            if self._instance_key(self._instances[row]) not in wanted:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                self._instances.pop(row)
+                self.endRemoveRows()
+
+        # 2. 按目标顺序逐位移动 / 插入
+        for row, (key, instance) in enumerate(zip(new_keys, new_instances)):
+            current = self._instances[row] if row < len(self._instances) else None
+            if current is not None and self._instance_key(current) == key:
+                self._update_row(row, instance)
+                continue
+            source = next(
+                (i for i in range(row + 1, len(self._instances)) if self._instance_key(self._instances[i]) == key),
+                None
+            )
+            if source is None:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._instances.insert(row, instance)
+                self.endInsertRows()
+            else:
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                self._instances.insert(row, self._instances.pop(source))
+                self.endMoveRows()
+                self._update_row(row, instance)
+
+    def _update_row(self, row: int, instance: dict):
+        """保留的行：只在设置不同时通知"""
+        current = self._instances[row]
+        if current.get("settings") != instance.get("settings"):
+            current["settings"] = instance["settings"]
+            ix = self.index(row)
+            self.dataChanged.emit(ix, ix, [self.SettingsRole])
+
     def add_widget(
             self,
             type_id: str,
@@ -178,8 +248,8 @@ class WidgetListModel(QAbstractListModel):
             "default_settings": default_settings or {}
         }
 
-        # 如果 widget 已存在，更新其名称（用于翻译更新）
-        if type_id in self._definitions:
+        # 如果 widget 已存在，更新其名称（用于翻译更新）；占位定义被插件的真实定义替换
+        if type_id in self._definitions and not self._definitions[type_id].get("placeholder"):
             self._definitions[type_id]["name"] = name
             logger.debug(f"Updated widget name for {type_id}: {name}")
         else:
@@ -187,22 +257,51 @@ class WidgetListModel(QAbstractListModel):
         
         self.definitionChanged.emit()
 
+    def add_placeholder(self, type_id: str, name: str, plugin_id: str, default_settings: dict | None = None):
+        """
+        注册延迟激活插件声明的组件占位定义（可在添加组件对话框中显示）
+        首次被预设使用或被添加时激活插件，插件注册的真实定义会替换占位定义
+        """
+        if not type_id or type_id in self._definitions:
+            return
+        self._definitions[type_id] = {
+            "id": type_id,
+            "name": name or type_id,
+            "qml_path": "",
+            "settings_qml": "",
+            "default_settings": default_settings or {},
+            "placeholder": plugin_id,
+        }
+        self.definitionChanged.emit()
+
+    def _activate_providers(self, type_ids):
+        """激活提供这些组件的延迟插件"""
+        plugin_ids = {
+            self._definitions[t]["placeholder"] for t in type_ids
+            if self._definitions.get(t, {}).get("placeholder")
+        }
+        if not plugin_ids or not self._app_central:
+            return
+        for plugin_id in sorted(plugin_ids):
+            self._app_central.plugin_manager.activate(plugin_id)
+
     @Slot(str)
     def addInstance(self, type_id: str):
         if type_id not in self._definitions:
             return
-        definition = self._definitions[type_id]
-        instance = dict(definition)
-        instance["instance_id"] = str(uuid.uuid4())
-        instance["type_id"] = type_id
-        base_settings = dict(definition.get("default_settings", {}))
-        instance["settings"] = base_settings
-        if "backend_obj" in definition:
-            instance["backend_obj"] = definition["backend_obj"]
+        self._activate_providers([type_id])
+        entry = WidgetEntry(type_id=type_id, instance_id=str(uuid.uuid4()))
+        instance = self._build_instance(entry)
+        if instance is None:
+            logger.warning(f"Widget {type_id} is not available")
+            return
+        entry.settings = dict(instance["settings"])
         self.beginInsertRows(QModelIndex(), len(self._instances), len(self._instances))
         self._instances.append(instance)
         self.endInsertRows()
-        self.syncCurrentPreset()
+        if self._current_preset:
+            self._presets.setdefault(self._current_preset, []).append(entry)
+            self._persist_preset(self._current_preset)
         self.modelChanged.emit()
 
     @Slot(int, int)
@@ -215,7 +314,18 @@ class WidgetListModel(QAbstractListModel):
         w = self._instances.pop(from_index)
         self._instances.insert(to_index, w)
         self.endMoveRows()
-        self.syncCurrentPreset()
+
+        entry = self._entry(w["instance_id"])
+        if entry is not None:
+            # 预设中可能有未注册类型的条目（不显示），按相邻实例定位
+            entries = self._presets[self._current_preset]
+            entries.remove(entry)
+            if to_index + 1 < len(self._instances):
+                position = entries.index(self._entry(self._instances[to_index + 1]["instance_id"]))
+            else:
+                position = entries.index(self._entry(self._instances[to_index - 1]["instance_id"])) + 1
+            entries.insert(position, entry)
+            self._persist_preset(self._current_preset)
         self.modelChanged.emit()
 
     @Slot(str)
@@ -225,7 +335,10 @@ class WidgetListModel(QAbstractListModel):
                 self.beginRemoveRows(QModelIndex(), i, i)
                 self._instances.pop(i)
                 self.endRemoveRows()
-                self.syncCurrentPreset()
+                entry = self._entry(instance_id)
+                if entry is not None:
+                    self._presets[self._current_preset].remove(entry)
+                    self._persist_preset(self._current_preset)
                 self.modelChanged.emit()
                 return
 
@@ -238,7 +351,10 @@ class WidgetListModel(QAbstractListModel):
                 w["settings"] = w_settings
                 ix = self.index(i)
                 self.dataChanged.emit(ix, ix, [self.SettingsRole])
-                self.syncCurrentPreset()
+                entry = self._entry(instance_id)
+                if entry is not None:  # 只修改这一个条目
+                    entry.settings = dict(w_settings)
+                    self._persist_preset(self._current_preset)
                 self.modelChanged.emit()
                 return
 
@@ -1,10 +1,112 @@
+import platform
+from typing import Callable, Optional
+
 from loguru import logger
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, QTimer
 
 from RinUI import RinUIWindow
 from src.core.directories import CW_PATH, DEFAULT_THEME
 from src.core.plaza import PlazaBridge
 from src.core.plugin.bridge import PluginBackendBridge
+from src.core.utils.profiler import profiler
+
+
+class LazyWindow(QObject):
+    """
+    按需创建的窗口
+    首次打开时才创建（编译 QML），隐藏后空闲 idle_ms 毫秒自动卸载，再次打开时重新创建。
+    idle_ms 为 0 时不卸载。
+    """
+    loaded = Signal()
+    unloaded = Signal()
+
+    IDLE_UNLOAD_MS = 3 * 60 * 1000
+
+    def __init__(self, name: str, factory: Callable[[], RinUIWindow], parent=None, idle_ms: Optional[int] = None):
+        super().__init__(parent)
+        self.name = name
+        self._factory = factory
+        self._window: Optional[RinUIWindow] = None
+
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(self.IDLE_UNLOAD_MS if idle_ms is None else idle_ms)
+        self._idle_timer.timeout.connect(self.unload)
+
+    @property
+    def instance(self) -> Optional[RinUIWindow]:
+        """已创建的窗口（未创建时为 None，不会触发创建）"""
+        return self._window
+
+    @property
+    def root_window(self):
+        window = self.get()
+        return window.root_window if window else None
+
+    def get(self) -> Optional[RinUIWindow]:
+        """获取窗口，未创建时创建"""
+        if self._window is None:
+            try:
+                with profiler.span(f"qml {self.name}", "qml"):
+                    self._window = self._factory()
+            except Exception as e:
+                logger.error(f"Failed to load {self.name} window: {e}")
+                return None
+            self._window.root_window.visibleChanged.connect(self._on_visible_changed)
+            logger.debug(f"{self.name} window loaded")
+            self.loaded.emit()
+        return self._window
+
+    def open(self):
+        """显示并激活窗口"""
+        window = self.get()
+        if not window or not window.root_window:
+            logger.error(f"{self.name} window not initialized correctly.")
+            return
+        self._idle_timer.stop()
+        window.root_window.show()
+        window.root_window.raise_()
+        window.root_window.requestActivate()
+
+    def _on_visible_changed(self, visible: bool):
+        if visible:
+            self._idle_timer.stop()
+        elif self._idle_timer.interval() > 0:
+            self._idle_timer.start()
+
+    def unload(self):
+        """销毁窗口与其 QML 对象（共享引擎时只释放本窗口，并清理无用的组件缓存）"""
+        window, self._window = self._window, None
+        self._idle_timer.stop()
+        if window is None:
+            return
+        root = window.root_window
+        if root is not None and root.isVisible():  # 再次被打开
+            self._window = window
+            return
+
+        central = getattr(window, "central", None)
+        if central is not None:
+            try:
+                central.retranslate.disconnect(window.engine.retranslate)
+            except (RuntimeError, TypeError):
+                pass
+        if root is not None:
+            handles = getattr(window.theme_manager, "windows", None)
+            if isinstance(handles, list):  # RinUI 记录的窗口句柄（仅 Windows）
+                for w in window.windows or [root]:
+                    try:
+                        handles.remove(int(w.winId()))
+                    except ValueError:
+                        pass
+            root.deleteLater()
+        if getattr(window, "shared_engine", False):  # RinUI 0.4 起默认所有窗口共用一个引擎，不能删除
+            window.engine.trimComponentCache()
+        else:
+            window.engine.deleteLater()
+        window.root_window = None
+        logger.debug(f"{self.name} window unloaded")
+        self.unloaded.emit()
 
 
 class Settings(RinUIWindow, QObject):
@@ -29,6 +131,11 @@ class Settings(RinUIWindow, QObject):
         self.extra_settings = []
 
         self.load(CW_PATH / "Windows" / "Settings.qml")
+
+        # win11 except
+        if platform.system() == "Windows" and platform.release() == "10" and platform.version() < "22000":
+            from RinUI import BackdropEffect
+            self.setBackdropEffect(BackdropEffect.None_)
         logger.info("Settings window initialized")
 
 
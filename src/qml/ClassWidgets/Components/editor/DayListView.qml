@@ -210,9 +210,11 @@ ColumnLayout {
         }
 
         onAccepted: {
-            Configs.set("schedule.default_duration.class_", classDuration.value)
-            Configs.set("schedule.default_duration.break_", breakDuration.value)
-            Configs.set("schedule.default_duration.activity", activityDuration.value)
+            Configs.batchSet({
+                "schedule.default_duration.class_": classDuration.value,
+                "schedule.default_duration.break_": breakDuration.value,
+                "schedule.default_duration.activity": activityDuration.value
+            })
         }
 
         Component.onCompleted: {
@@ -255,17 +257,21 @@ ColumnLayout {
 
 
     ListView {
-        visible: model.length > 0
+        visible: count > 0
         id: timelinesView
         Layout.fillHeight: true
         Layout.fillWidth: true
-        model: days
-
-        onModelChanged: {
-            for (let i = 0; i < model.length; i++) {
-                if (model[i].id === root.oldId) {
-                    currentIndex = i
-                    return
+        model: AppCentral.scheduleEditor.daysModel
+
+        // 切换课表时按 id 恢复选中项（行级变化由 ListView 自动维护 currentIndex）
+        Connections {
+            target: AppCentral.scheduleEditor.daysModel
+            function onModelReset() {
+                for (let i = 0; i < root.days.length; i++) {
+                    if (root.days[i].id === root.oldId) {
+                        timelinesView.currentIndex = i
+                        return
+                    }
                 }
             }
         }
@@ -50,6 +50,13 @@ ColumnLayout {
         }
     }
 
+    Binding {
+        target: AppCentral.scheduleEditor.entriesModel
+        property: "dayId"
+        value: currentDayIndex >= 0 && AppCentral.scheduleEditor.days[currentDayIndex]
+            ? AppCentral.scheduleEditor.days[currentDayIndex].id : ""
+    }
+
     // 时间轴
     Flickable {
         visible: currentDayIndex >= 0
@@ -105,20 +112,12 @@ ColumnLayout {
         // 日程
         Repeater {
             id: entryList
-            model: currentDayIndex >= 0 ? AppCentral.scheduleEditor.days[currentDayIndex].entries : []
-
-            property int prevLength: 0
+            model: AppCentral.scheduleEditor.entriesModel
 
-            onModelChanged: {
-                if (prevLength !== model.length) {
-                    currentIndex = -1
-                }
-                if (model.length === 0) {
-                    currentIndex = -1
-                }
-                prevLength = model.length
+            onCountChanged: {
+                currentIndex = -1
             }
-            
+
             delegate: EntryDelegate {
                 index: model.index
                 entry: modelData
@@ -268,7 +267,7 @@ ColumnLayout {
 
         // 选中新项
         if (newId) {
-            let idx = day.entries.findIndex(e => e.id === newId)
+            let idx = AppCentral.scheduleEditor.days[root.currentDayIndex].entries.findIndex(e => e.id === newId)
             if (idx >= 0) {
                 root.currentIndex = idx
 
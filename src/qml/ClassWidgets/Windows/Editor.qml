@@ -48,9 +48,47 @@ FluentWindow {
             }
         }
 
+        Shortcut {
+            sequences: [StandardKey.Undo]
+            onActivated: AppCentral.scheduleEditor.undo()
+        }
+
+        Shortcut {
+            sequences: [StandardKey.Redo, "Ctrl+Shift+Z"]
+            onActivated: AppCentral.scheduleEditor.redo()
+        }
+
         ToolButton {
             flat: true
             Layout.alignment: Qt.AlignRight
+            icon.name: "ic_fluent_arrow_undo_20_regular"
+            size: 18
+            enabled: AppCentral.scheduleEditor.canUndo
+
+            ToolTip {
+                text: qsTr("Undo")
+                visible: parent.hovered
+            }
+
+            onClicked: AppCentral.scheduleEditor.undo()
+        }
+
+        ToolButton {
+            flat: true
+            icon.name: "ic_fluent_arrow_redo_20_regular"
+            size: 18
+            enabled: AppCentral.scheduleEditor.canRedo
+
+            ToolTip {
+                text: qsTr("Redo")
+                visible: parent.hovered
+            }
+
+            onClicked: AppCentral.scheduleEditor.redo()
+        }
+
+        ToolButton {
+            flat: true
             icon.name: "ic_fluent_save_20_regular"
             size: 18
 
@@ -64,7 +64,7 @@ Item {
             cellHeight: 175
             flow: GridView.FlowLeftToRight
 
-            model: AppCentral.scheduleEditor.subjects
+            model: AppCentral.scheduleEditor.subjectsModel
 
             delegate: SubjectClip {
                 id: subjectClip
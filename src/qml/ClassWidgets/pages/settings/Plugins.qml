@@ -19,6 +19,33 @@ FluentPage {
         severity: Severity.Warning
     }
 
+    // 各插件的资源占用（PluginManager.pluginUsage）
+    property var usage: ({})
+
+    Timer {
+        interval: 2000
+        repeat: true
+        running: root.visible
+        triggeredOnStart: true
+        onTriggered: root.usage = PluginManager.pluginUsage()
+    }
+
+    function formatUsage(u) {
+        if (!u) return ""
+        var parts = [qsTr("%1 ms/s").arg(u.rate_ms.toFixed(1))]
+        if (u.categories && u.categories.on_load) {
+            parts.push(qsTr("Load %1 ms").arg(u.categories.on_load.max_ms.toFixed(0)))
+        }
+        if (u.cpu_percent !== undefined) {
+            parts.push(qsTr("CPU %1%").arg(u.cpu_percent.toFixed(1)))
+        }
+        var memory = u.rss !== undefined ? u.rss : u.memory
+        if (memory > 0) {
+            parts.push(qsTr("%1 MB").arg((memory / 1048576).toFixed(1)))
+        }
+        return parts.join(" · ")
+    }
+
     function uninstallPlugin(pluginId) {
         if (PluginManager.uninstallPlugin(pluginId)) {
             floatLayer.createInfoBar({
@@ -133,6 +160,63 @@ FluentPage {
                 openUrl: "https://plaza.cw.rinlit.cn"
             }
         }
+
+        SettingExpander {
+            Layout.fillWidth: true
+            icon.name: "ic_fluent_shield_task_20_regular"
+            title: qsTr("Resource Watchdog")
+            description: qsTr("Warn when a plugin takes more time or memory than its budget")
+
+            action: Switch {
+                checked: Configs.data.plugins.watchdog.enabled
+                onToggled: Configs.set("plugins.watchdog.enabled", checked)
+            }
+
+            SettingItem {
+                title: qsTr("Time Budget (ms per second)")
+                description: qsTr("Time a plugin may spend in tasks, signal handlers and widget calls every second")
+
+                SpinBox {
+                    from: 5
+                    to: 1000
+                    Layout.preferredWidth: 200
+                    value: Math.round(Configs.data.plugins.watchdog.tick_budget_ms)
+                    onValueModified: Configs.set("plugins.watchdog.tick_budget_ms", value)  // 只写回用户的修改
+                }
+            }
+
+            SettingItem {
+                title: qsTr("Track Memory")
+                description: qsTr("Attribute memory allocations to plugins. Slows down the app slightly\n* Requires restart")
+
+                Switch {
+                    checked: Configs.data.plugins.watchdog.trace_memory
+                    onToggled: Configs.set("plugins.watchdog.trace_memory", checked)
+                }
+            }
+
+            SettingItem {
+                title: qsTr("Memory Budget (MB)")
+
+                SpinBox {
+                    from: 8
+                    to: 4096
+                    Layout.preferredWidth: 200
+                    value: Math.round(Configs.data.plugins.watchdog.memory_budget_mb)
+                    onValueModified: Configs.set("plugins.watchdog.memory_budget_mb", value)
+                }
+            }
+
+            SettingItem {
+                title: qsTr("Disable Plugins Over Budget")
+                description: qsTr("Stop plugins that keep exceeding their budget until they are enabled again")
+
+                Switch {
+                    checked: Configs.data.plugins.watchdog.auto_disable
+                    onToggled: Configs.set("plugins.watchdog.auto_disable", checked)
+                }
+            }
+        }
     }
 
     ColumnLayout {
@@ -286,6 +370,15 @@ FluentPage {
                                 typography: Typography.Caption
                                 color: Colors.proxy.textSecondaryColor
                             }
+                            Text {
+                                Layout.fillWidth: true
+                                visible: root.usage[modelData.id] !== undefined
+                                text: root.formatUsage(root.usage[modelData.id])
+                                wrapMode: Text.NoWrap
+                                elide: Text.ElideRight
+                                typography: Typography.Caption
+                                color: Colors.proxy.textSecondaryColor
+                            }
                         }
 
                         // 右侧区域
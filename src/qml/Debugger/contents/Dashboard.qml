@@ -165,4 +165,200 @@ ColumnLayout {
             }
         }
     }
-}
\ No newline at end of file
+
+    Expander {
+        text: "Startup Profile"
+        Layout.fillWidth: true
+        onExpandedChanged: if (expanded) startupList.refresh()
+
+        ColumnLayout {
+            Layout.fillWidth: true
+            Layout.margins: 12
+
+            RowLayout {
+                Layout.fillWidth: true
+                Text {
+                    Layout.fillWidth: true
+                    typography: Typography.BodyStrong
+                    text: "Startup: " + startupList.startupTime.toFixed(0) + " ms"
+                }
+                Button {
+                    text: "Refresh"
+                    onClicked: startupList.refresh()
+                }
+                Button {
+                    text: "Export Chrome Trace"
+                    onClicked: {
+                        let path = UtilsBackend.exportStartupTrace()
+                        floatLayer.createInfoBar({
+                            severity: path ? Severity.Success : Severity.Error,
+                            text: path ? "Exported to " + path : "Export failed",
+                        })
+                    }
+                }
+            }
+
+            ListView {
+                id: startupList
+                Layout.fillWidth: true
+                Layout.preferredHeight: 300
+                clip: true
+                spacing: 0
+                property real startupTime: 0
+
+                function refresh() {
+                    model = UtilsBackend.startupProfile()
+                    startupTime = UtilsBackend.startupTime()
+                }
+
+                delegate: RowLayout {
+                    width: startupList.width
+                    spacing: 10
+                    Text {
+                        Layout.fillWidth: true
+                        Layout.leftMargin: modelData.depth * 16
+                        text: modelData.name
+                        elide: Text.ElideRight
+                    }
+                    Text {
+                        Layout.preferredWidth: 60
+                        text: modelData.category
+                        color: Colors.proxy.textSecondaryColor
+                    }
+                    Text {
+                        Layout.preferredWidth: 90
+                        horizontalAlignment: Text.AlignRight
+                        text: modelData.wall_ms.toFixed(1) + " ms"
+                    }
+                    Text {
+                        Layout.preferredWidth: 90
+                        horizontalAlignment: Text.AlignRight
+                        text: "cpu " + modelData.cpu_ms.toFixed(1)
+                        color: Colors.proxy.textSecondaryColor
+                    }
+                }
+            }
+        }
+    }
+
+    Expander {
+        id: tickExpander
+        text: "Tick Profile"
+        Layout.fillWidth: true
+
+        Timer {
+            interval: 1000
+            repeat: true
+            running: tickExpander.expanded && mainWindow.visible
+            triggeredOnStart: true
+            onTriggered: tickList.model = UtilsBackend.tickStats()
+        }
+
+        ColumnLayout {
+            Layout.fillWidth: true
+            Layout.margins: 12
+
+            RowLayout {
+                Layout.fillWidth: true
+                Text {
+                    Layout.fillWidth: true
+                    typography: Typography.BodyStrong
+                    text: "Latency (ms): mean / p50 / p95 / p99 / max"
+                }
+                Button {
+                    text: "Reset"
+                    onClicked: {
+                        UtilsBackend.resetTickStats()
+                        tickList.model = UtilsBackend.tickStats()
+                    }
+                }
+                Button {
+                    text: "Dump"
+                    onClicked: {
+                        let path = UtilsBackend.dumpTickStats()
+                        floatLayer.createInfoBar({
+                            severity: path ? Severity.Success : Severity.Error,
+                            text: path ? "Dumped to " + path : "Dump failed",
+                        })
+                    }
+                }
+            }
+
+            ListView {
+                id: tickList
+                Layout.fillWidth: true
+                Layout.preferredHeight: 300
+                clip: true
+                spacing: 0
+
+                delegate: RowLayout {
+                    width: tickList.width
+                    spacing: 10
+                    Text {
+                        Layout.fillWidth: true
+                        text: modelData.name
+                        elide: Text.ElideRight
+                    }
+                    Text {
+                        Layout.preferredWidth: 60
+                        horizontalAlignment: Text.AlignRight
+                        text: modelData.count
+                        color: Colors.proxy.textSecondaryColor
+                    }
+                    Text {
+                        Layout.preferredWidth: 260
+                        horizontalAlignment: Text.AlignRight
+                        text: [modelData.mean_ms, modelData.p50_ms, modelData.p95_ms, modelData.p99_ms, modelData.max_ms]
+                            .map(v => v.toFixed(2)).join(" / ")
+                        color: modelData.p95_ms >= 50 ? Colors.proxy.systemCautionColor : Colors.proxy.textColor
+                    }
+                }
+            }
+        }
+    }
+
+    Expander {
+        id: isolatedExpander
+        text: "Isolated Plugins"
+        Layout.fillWidth: true
+
+        Timer {
+            interval: 2000
+            repeat: true
+            running: isolatedExpander.expanded && mainWindow.visible
+            triggeredOnStart: true
+            onTriggered: isolatedList.model = PluginManager.isolatedPluginStats()
+        }
+
+        ColumnLayout {
+            Layout.fillWidth: true
+            Layout.margins: 12
+
+            Text {
+                Layout.fillWidth: true
+                typography: Typography.BodyStrong
+                text: "State / CPU / Memory"
+            }
+
+            Repeater {
+                id: isolatedList
+                delegate: RowLayout {
+                    Layout.fillWidth: true
+                    spacing: 10
+                    Text {
+                        Layout.fillWidth: true
+                        text: modelData.id + (modelData.os_pid ? " (pid " + modelData.os_pid + ")" : "")
+                        elide: Text.ElideRight
+                    }
+                    Text {
+                        Layout.preferredWidth: 260
+                        horizontalAlignment: Text.AlignRight
+                        text: modelData.state + " / " + modelData.cpu_percent.toFixed(1) + " % / "
+                            + (modelData.rss / 1048576).toFixed(1) + " MB"
+                        color: modelData.state === "running" ? Colors.proxy.textColor : Colors.proxy.systemCautionColor
+                    }
+                }
+            }
+        }
+    }
+}
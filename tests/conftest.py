@@ -0,0 +1,7 @@
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+
+@pytest.fixture(scope="session", autouse=True)
+def qapp():
+    yield QCoreApplication.instance() or QCoreApplication([])
@@ -0,0 +1,43 @@
+import json
+
+from src.core.config import ConfigManager
+
+
+def _load(path):
+    configs = ConfigManager(path, "config.json")
+    configs.load_config()
+    return configs
+
+
+def _saved_provider(path, provider_id):
+    return json.loads((path / "config.json").read_text(encoding="utf-8"))["notifications"]["providers"][provider_id]
+
+
+def test_new_provider_toggle_is_saved(tmp_path):
+    configs = _load(tmp_path)
+    configs.notifications.provider("x").enabled = False
+    assert configs.dirty
+    configs.save()
+    assert _saved_provider(tmp_path, "x")["enabled"] is False
+
+
+def test_loaded_provider_toggle_is_saved(tmp_path):
+    configs = _load(tmp_path)
+    configs.notifications.provider("x")
+    configs.save()
+
+    for _ in range(2):  # 第二次经过快照缓存
+        configs = _load(tmp_path)
+        assert not configs.dirty
+    configs.notifications.providers["x"].use_app_notify = False
+    assert configs.dirty
+    configs.save()
+    assert _saved_provider(tmp_path, "x")["use_app_notify"] is False
+
+
+def test_assigned_providers_are_tracked(tmp_path):
+    configs = _load(tmp_path)
+    configs.notifications.providers = {"y": {"enabled": True}}
+    configs.save()
+    configs.notifications.providers["y"].enabled = False
+    assert configs.dirty
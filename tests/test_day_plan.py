@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.schedule.model import Timeline, Entry, EntryType, Subject
+from src.core.schedule.plan import DayPlan, seconds_of_day
+from src.core.schedule.service import ScheduleServices
+
+SUBJECTS = [Subject(id="math", name="Math"), Subject(id="art", name="Art"), Subject(id="pe", name="PE")]
+
+
+def _entry(entry_id, entry_type, start, end, subject_id=None, title=None):
+    return Entry(id=entry_id, type=entry_type, startTime=start, endTime=end, subjectId=subject_id, title=title)
+
+
+DAY = Timeline(id="day", dayOfWeek=[1], weeks="all", entries=[  # 故意不按时间排序
+    _entry("art", EntryType.CLASS, "10:30", "11:10", "art"),
+    _entry("math", EntryType.CLASS, "08:00", "08:40", "math"),
+    _entry("break", EntryType.BREAK, "08:40", "08:50"),
+    _entry("unknown", EntryType.CLASS, "08:50", "09:30", "missing"),  # 科目不存在
+    _entry("prep", EntryType.PREPARATION, "09:35", "09:40"),
+    _entry("meeting", EntryType.ACTIVITY, "09:40", "10:20", title="Meeting"),
+    _entry("pe", EntryType.CLASS, "12:00", "12:40", "pe"),
+    _entry("overlap", EntryType.ACTIVITY, "12:20", "12:30", title="Overlap"),  # 与 pe 重叠，取列表中靠前的
+])
+
+TIMES = [
+    "00:00:00", "07:57:59", "07:58:00", "07:59:59",  # 第一节课前（预备铃）
+    "08:00:00", "08:00:01", "08:39:59",  # 上课
+    "08:40:00", "08:49:59",  # 课间
+    "08:50:00", "09:29:59",
+    "09:30:00", "09:34:59",  # 空闲
+    "09:35:00", "09:39:59",  # 预备
+    "09:40:00", "10:19:59",  # 活动
+    "10:20:00", "10:28:00", "10:29:59",  # 空闲，下一节课前的预备铃
+    "10:30:00", "11:09:59", "11:10:00",
+    "12:19:59", "12:20:00", "12:29:59", "12:30:00", "12:39:59", "12:40:00",
+    "23:59:59",
+]
+
+
+@pytest.fixture(scope="module")
+def plan():
+    return DayPlan(DAY, SUBJECTS)
+
+
+def _at(value: str) -> datetime:
+    return datetime.strptime(f"2025-09-01 {value}", "%Y-%m-%d %H:%M:%S")
+
+
+def _ids(entries):
+    return [e.id for e in entries]
+
+
+@pytest.mark.parametrize("time", TIMES)
+def test_locate_matches_services(plan, time):
+    now = _at(time)
+    state = plan.locate(now)
+
+    current = ScheduleServices.get_current_entry(DAY, now)
+    assert (state.entry.id if state.entry else None) == (current.id if current else None)
+    assert state.status == ScheduleServices.get_current_status(DAY, now)
+    assert state.subject == ScheduleServices.get_current_subject(DAY, SUBJECTS, now)
+    assert _ids(state.next_entries) == _ids(ScheduleServices.get_next_entries(DAY, now))
+    assert timedelta(seconds=state.remaining_seconds(seconds_of_day(now))) == \
+        ScheduleServices.get_remaining_time(DAY, now)
+
+
+@pytest.mark.parametrize("time", TIMES)
+def test_next_start_matches_services(plan, time):
+    """预备铃按下一条目的开始时间计算"""
+    now = _at(time)
+    upcoming = ScheduleServices.get_next_entries(DAY, now)
+    expected = None
+    if upcoming:
+        start = datetime.strptime(upcoming[0].startTime, "%H:%M")
+        expected = start.hour * 3600 + start.minute * 60
+    assert plan.locate(now).next_start == expected
+
+
+@pytest.mark.parametrize("time, expected", [
+    ("00:00:00", "08:00"),
+    ("07:59:59", "08:00"),
+    ("08:00:00", "08:40"),  # 恰好在边界上时返回下一个边界
+    ("08:39:59", "08:40"),
+    ("09:30:00", "09:35"),
+    ("12:19:59", "12:20"),
+    ("12:20:00", "12:30"),
+    ("12:40:00", None),
+    ("23:59:59", None),
+])
+def test_next_boundary(plan, time, expected):
+    boundary = plan.next_boundary(_at(time))
+    if expected is None:
+        assert boundary is None
+    else:
+        hour, minute = map(int, expected.split(":"))
+        assert boundary == hour * 3600 + minute * 60
+
+
+def test_all_entries_matches_services(plan):
+    assert _ids(plan.all_entries) == _ids(ScheduleServices.get_all_entries(DAY))
+
+
+@pytest.mark.parametrize("time, expected", [
+    ("08:00:00", 0),
+    ("08:20:00", 0.5),
+    ("08:39:59", 1.0),
+    ("09:32:00", 1),  # 空闲
+])
+def test_progress(plan, time, expected):
+    now = _at(time)
+    assert plan.locate(now).progress(seconds_of_day(now)) == expected
+
+
+def test_invalid_times_are_skipped():
+    day = Timeline(id="day", entries=[
+        _entry("bad", EntryType.CLASS, "25:00", "26:00"),
+        _entry("ok", EntryType.CLASS, "08:00", "08:40"),
+    ])
+    plan = DayPlan(day, [])
+    assert _ids(plan.all_entries) == ["ok"]
+    assert plan.locate(_at("08:10:00")).entry.id == "ok"
+
+
+def test_empty_day():
+    plan = DayPlan(Timeline(id="day", entries=[]), [])
+    state = plan.locate(_at("08:00:00"))
+    assert state.entry is None and state.next_entries == [] and state.next_start is None
+    assert plan.next_boundary(_at("08:00:00")) is None
@@ -0,0 +1,176 @@
+import pytest
+
+from src.core.notification.dispatcher import NotificationDispatchQueue, BackPressurePolicy, TokenBucket
+from src.core.notification.model import NotificationData, NotificationLevel, NotificationProviderConfig
+
+CFG = NotificationProviderConfig()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def _data(title, level=NotificationLevel.INFO, provider="p", message=None):
+    return NotificationData(provider_id=provider, level=level, title=title, message=message)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _queue(clock, **kwargs):
+    options = dict(max_size=32, rate=0, burst=5, coalesce_window=0)  # 默认不限流、不去重
+    options.update(kwargs)
+    return NotificationDispatchQueue(clock=clock, **options)
+
+
+def _titles(items):
+    return [item.data.title for item in items]
+
+
+def test_priority_order_and_fifo_within_level(clock):
+    queue = _queue(clock)
+    queue.push(_data("info 1"), CFG)
+    queue.push(_data("warning", NotificationLevel.WARNING), CFG)
+    queue.push(_data("info 2"), CFG)
+    queue.push(_data("system", NotificationLevel.SYSTEM), CFG)
+    queue.push(_data("announcement", NotificationLevel.ANNOUNCEMENT), CFG)
+
+    ready, wait = queue.pop_ready()
+    assert _titles(ready) == ["system", "warning", "announcement", "info 1", "info 2"]
+    assert wait is None
+    assert len(queue) == 0
+
+
+def test_token_bucket_limits_per_provider(clock):
+    queue = _queue(clock, rate=2, burst=2)
+    for i in range(4):
+        queue.push(_data(f"a{i}"), CFG)
+    queue.push(_data("b0", provider="other"), CFG)
+
+    ready, wait = queue.pop_ready()
+    assert _titles(ready) == ["a0", "a1", "b0"]  # 每个提供者各自突发 2 条
+    assert wait == pytest.approx(0.5)
+
+    clock.advance(0.25)
+    ready, wait = queue.pop_ready()
+    assert ready == [] and wait == pytest.approx(0.25)
+
+    clock.advance(0.25)
+    assert _titles(queue.pop_ready()[0]) == ["a2"]
+    clock.advance(0.5)
+    assert _titles(queue.pop_ready()[0]) == ["a3"]
+
+
+def test_system_level_bypasses_rate_limit(clock):
+    queue = _queue(clock, rate=1, burst=1)
+    queue.push(_data("info"), CFG)
+    queue.push(_data("info 2"), CFG)
+    queue.push(_data("system", NotificationLevel.SYSTEM), CFG)
+    ready, wait = queue.pop_ready()
+    assert _titles(ready) == ["system", "info"]
+    assert wait == pytest.approx(1)
+
+
+def test_bucket_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=1, burst=3, now=clock())
+    for _ in range(3):
+        assert bucket.try_take(clock())
+    assert not bucket.try_take(clock())
+    clock.advance(60)
+    assert sum(bucket.try_take(clock()) for _ in range(5)) == 3
+
+
+def test_configure_keeps_consumed_tokens(clock):
+    queue = _queue(clock, rate=1, burst=2)
+    queue.push(_data("a"), CFG)
+    queue.push(_data("b"), CFG)
+    queue.pop_ready()
+
+    queue.configure(32, 1, 5, 0, BackPressurePolicy.DROP_OLDEST)  # 修改设置不应重新获得突发额度
+    queue.push(_data("c"), CFG)
+    ready, wait = queue.pop_ready()
+    assert ready == [] and wait == pytest.approx(1)
+
+
+def test_duplicate_while_queued_is_merged(clock):
+    queue = _queue(clock, rate=1, burst=1)
+    queue.push(_data("first"), CFG)
+    queue.pop_ready()
+    assert queue.push(_data("same", message="m"), CFG)
+    assert not queue.push(_data("same", message="m"), CFG)
+    assert len(queue) == 1
+    clock.advance(1)
+    ready, _ = queue.pop_ready()
+    assert ready[0].merged == 1
+
+
+def test_coalesce_window(clock):
+    queue = _queue(clock, coalesce_window=5)
+    assert queue.push(_data("same"), CFG)
+    queue.pop_ready()
+
+    clock.advance(4.9)
+    assert not queue.push(_data("same"), CFG)  # 窗口内只发送一次
+    assert queue.push(_data("same", message="other"), CFG)
+    assert queue.push(_data("same", provider="other"), CFG)
+    clock.advance(0.1)
+    assert queue.push(_data("same"), CFG)
+
+
+def test_drop_oldest_of_lowest_priority(clock):
+    queue = _queue(clock, max_size=3)
+    queue.push(_data("info 1"), CFG)
+    queue.push(_data("warning", NotificationLevel.WARNING), CFG)
+    queue.push(_data("info 2"), CFG)
+
+    assert queue.push(_data("announcement", NotificationLevel.ANNOUNCEMENT), CFG)
+    assert queue.dropped == 1
+    assert _titles(queue.pop_ready()[0]) == ["warning", "announcement", "info 2"]
+
+
+def test_drop_new_when_lower_than_queue(clock):
+    queue = _queue(clock, max_size=2)
+    queue.push(_data("warning 1", NotificationLevel.WARNING), CFG)
+    queue.push(_data("warning 2", NotificationLevel.WARNING), CFG)
+
+    assert not queue.push(_data("info"), CFG)
+    assert queue.dropped == 1
+    assert _titles(queue.pop_ready()[0]) == ["warning 1", "warning 2"]
+
+
+def test_merge_policy_replaces_newest_from_same_provider(clock):
+    queue = _queue(clock, max_size=2, policy=BackPressurePolicy.MERGE)
+    queue.push(_data("a1", NotificationLevel.WARNING), CFG)
+    queue.push(_data("a2"), CFG)
+
+    assert not queue.push(_data("a3"), CFG)
+    assert len(queue) == 2 and queue.dropped == 0
+    ready, _ = queue.pop_ready()
+    assert _titles(ready) == ["a1", "a3"]
+    assert ready[1].merged == 1
+
+
+def test_merge_policy_keeps_higher_level(clock):
+    queue = _queue(clock, max_size=1, policy=BackPressurePolicy.MERGE)
+    queue.push(_data("warning", NotificationLevel.WARNING), CFG)
+    queue.push(_data("info"), CFG)
+    ready, _ = queue.pop_ready()
+    assert _titles(ready) == ["info"]
+    assert ready[0].data.level == NotificationLevel.WARNING
+
+
+def test_merge_policy_falls_back_to_drop(clock):
+    queue = _queue(clock, max_size=1, policy=BackPressurePolicy.MERGE)
+    queue.push(_data("a"), CFG)
+    assert queue.push(_data("b", NotificationLevel.WARNING, provider="other"), CFG)
+    assert queue.dropped == 1
+    assert _titles(queue.pop_ready()[0]) == ["b"]
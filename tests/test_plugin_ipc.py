@@ -0,0 +1,76 @@
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from src.core.plugin import ipc
+from src.core.plugin.ipc import FrameDecoder, ProtocolError, encode_frame, PROTOCOL_VERSION
+
+
+def _raw_frame(body: dict) -> bytes:
+    data = json.dumps(body).encode("utf-8")
+    return struct.pack(">I", len(data)) + data
+
+
+def test_single_frame():
+    messages = [{"op": "tick", "n": 1}, {"op": "state", "name": "课程"}]
+    assert FrameDecoder().feed(encode_frame(messages)) == messages
+
+
+def test_partial_frame_across_feeds():
+    decoder = FrameDecoder()
+    frame = encode_frame([{"op": "tick"}])
+    assert decoder.feed(frame[:2]) == []  # 长度前缀不完整
+    assert decoder.feed(frame[2:7]) == []  # 消息体不完整
+    assert decoder.feed(frame[7:]) == [{"op": "tick"}]
+    assert decoder.feed(b"") == []
+
+
+def test_byte_by_byte():
+    decoder = FrameDecoder()
+    frame = encode_frame([{"op": "a"}, {"op": "b"}])
+    received = []
+    for i in range(len(frame)):
+        received += decoder.feed(frame[i:i + 1])
+    assert received == [{"op": "a"}, {"op": "b"}]
+
+
+def test_multiple_frames_in_one_buffer():
+    decoder = FrameDecoder()
+    second = encode_frame([{"op": "b"}, {"op": "c"}])
+    data = encode_frame([{"op": "a"}]) + second + encode_frame([]) + second[:3]
+    assert decoder.feed(data) == [{"op": "a"}, {"op": "b"}, {"op": "c"}]
+    assert decoder.feed(second[3:]) == [{"op": "b"}, {"op": "c"}]
+
+
+def test_oversize_frame_is_rejected_before_body_arrives(monkeypatch):
+    monkeypatch.setattr(ipc, "MAX_FRAME", 64)
+    decoder = FrameDecoder()
+    with pytest.raises(ProtocolError):
+        decoder.feed(struct.pack(">I", 65))
+
+
+def test_frame_at_size_limit(monkeypatch):
+    frame = encode_frame([{"op": "x"}])
+    monkeypatch.setattr(ipc, "MAX_FRAME", len(frame) - 4)
+    assert FrameDecoder().feed(frame) == [{"op": "x"}]
+
+
+@pytest.mark.parametrize("version", [PROTOCOL_VERSION + 1, None])
+def test_version_mismatch(version):
+    body = {"m": [{"op": "tick"}]}
+    if version is not None:
+        body["v"] = version
+    with pytest.raises(ProtocolError):
+        FrameDecoder().feed(_raw_frame(body))
+
+
+def test_invalid_json_raises_value_error():
+    data = b"{not json"
+    with pytest.raises(ValueError):
+        FrameDecoder().feed(struct.pack(">I", len(data)) + data)
+
+
+def test_non_json_values_are_stringified():
+    assert FrameDecoder().feed(encode_frame([{"op": "icon", "path": Path("a")}])) == [{"op": "icon", "path": "a"}]
@@ -0,0 +1,44 @@
+from src.core.plugin.loader import PluginLoader, plugin_dependencies
+
+resolve = PluginLoader.resolve_load_order
+
+
+def _metas(**dependencies):
+    return {pid: {"id": pid, "dependencies": deps} for pid, deps in dependencies.items()}
+
+
+def test_independent_plugins_share_one_level():
+    assert resolve(_metas(a=[], b=[], c=[])) == [["a", "b", "c"]]
+
+
+def test_levels_follow_dependencies():
+    levels = resolve(_metas(d=["b", "c"], c=["a"], b=["a"], a=[], e=[]))
+    assert levels == [["a", "e"], ["c", "b"], ["d"]]
+
+
+def test_every_plugin_after_its_dependencies():
+    metas = _metas(a=[], b=["a"], c=["b"], d=["a", "c"], e=["d", "b"], f=[])
+    position = {pid: i for i, level in enumerate(resolve(metas)) for pid in level}
+    assert set(position) == set(metas)
+    for pid, meta in metas.items():
+        assert all(position[dep] < position[pid] for dep in meta["dependencies"])
+
+
+def test_missing_dependency_is_excluded_with_dependents():
+    levels = resolve(_metas(a=[], b=["missing"], c=["b"]))
+    assert levels == [["a"]]
+
+
+def test_cycles_are_excluded():
+    levels = resolve(_metas(a=[], b=["c"], c=["b"], d=["d"], e=["b"]))
+    assert levels == [["a"]]
+
+
+def test_empty():
+    assert resolve({}) == []
+
+
+def test_dependencies_field_is_optional():
+    assert plugin_dependencies({"id": "a"}) == []
+    assert plugin_dependencies({"id": "a", "dependencies": None}) == []
+    assert resolve({"a": {"id": "a"}, "b": {"id": "b", "dependencies": ["a"]}}) == [["a"], ["b"]]
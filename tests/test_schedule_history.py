@@ -0,0 +1,131 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config import ConfigManager
+from src.core.schedule import ScheduleManager
+from src.core.schedule.editor import ScheduleEditor
+from src.core.schedule.history import EditHistory
+from src.core.schedule.journal import make_record
+
+
+@pytest.fixture
+def editor(tmp_path):
+    manager = ScheduleManager(tmp_path / "schedules", SimpleNamespace(configs=ConfigManager(tmp_path, "config.json")))
+    manager.load("test")
+    editor = ScheduleEditor(manager)
+    editor.refresh(manager.schedule)
+
+    day = editor.addDay([1], "all", "")
+    subject = editor.addSubject("Math", "", "", "", "", True)
+    entry = editor.addEntry(day, "class", "08:00", "08:40", subject, "")
+    editor.addOverride(entry, [1], "all", subject, "")
+    editor._history.clear()
+    editor.ids = SimpleNamespace(day=day, subject=subject, entry=entry, override=manager.schedule.overrides[0].id)
+    yield editor
+    manager.persistence.shutdown()
+
+
+EDITS = {
+    "add_subject": lambda e: e.addSubject("Art", "", "", "", "", True),
+    "update_subject": lambda e: e.updateSubject(e.ids.subject, "Maths", "", "Mr. A", "", "", "", False),
+    "remove_subject": lambda e: e.removeSubject(e.ids.subject),
+    "restore_subjects": lambda e: e.restoreDefaultSubjects(),
+    "add_day": lambda e: e.addDay([2, 3], "all", ""),
+    "update_day": lambda e: e.updateDay(e.ids.day, [4], "all", ""),
+    "duplicate_day": lambda e: e.duplicateDay(e.ids.day),
+    "remove_day": lambda e: e.removeDay(e.ids.day),
+    "add_entry": lambda e: e.addEntry(e.ids.day, "break", "07:00", "07:30", "", ""),
+    "update_entry": lambda e: e.updateEntry(e.ids.entry, "", "10:00", "10:40", "", "Moved"),
+    "remove_entry": lambda e: e.removeEntry(e.ids.entry),
+    "add_override": lambda e: e.addOverride(e.ids.entry, [1], [1, 3], "", "Lab"),
+    "update_override": lambda e: e.updateOverride(e.ids.override, "", "Renamed"),
+    "remove_override": lambda e: e.removeOverride(e.ids.override),
+    "set_start_date": lambda e: e.setStartDate("2025-02-17"),
+}
+
+
+@pytest.mark.parametrize("edit", EDITS.values(), ids=EDITS.keys())
+def test_undo_redo_round_trip(editor, edit):
+    schedule = editor.manager.schedule
+    before = schedule.model_dump()
+    edit(editor)
+    after = schedule.model_dump()
+    assert after != before
+
+    assert editor.undo()
+    assert schedule.model_dump() == before
+    assert editor.scheduleData == before
+    assert editor.redo()
+    assert schedule.model_dump() == after
+    assert editor.scheduleData == after
+    assert not editor.canRedo
+
+
+def test_undo_restores_override_order(editor):
+    schedule = editor.manager.schedule
+    entry = editor.ids.entry
+    editor.addOverride(entry, [1], "all", "", "second")
+    editor.addOverride(entry, [1], "all", "", "third")
+    editor.removeOverride(editor.ids.override)
+    editor.undo()
+
+    assert [o.id for o in editor.manager.override_index.for_weekday(entry, 1)] == [o.id for o in schedule.overrides]
+
+
+def test_replayed_steps_are_journaled(editor, tmp_path):
+    editor.removeEntry(editor.ids.entry)
+    editor.undo()
+    editor.manager.persistence.flush()
+
+    reloaded = ScheduleManager(tmp_path / "schedules", editor.manager.app_central)
+    reloaded.load("test")
+    assert reloaded.schedule.model_dump() == editor.manager.schedule.model_dump()
+    reloaded.persistence.shutdown()
+
+
+def test_new_edit_clears_redo(editor):
+    editor.addSubject("Art", "", "", "", "", True)
+    editor.undo()
+    assert editor.canRedo
+    editor.addSubject("Music", "", "", "", "", True)
+    assert not editor.canRedo
+
+
+def _step(n=1):
+    return [make_record("del", "subject", f"s{i}") for i in range(n)], [make_record("put", "subject", "x")]
+
+
+def test_history_step_limit(monkeypatch):
+    monkeypatch.setattr(EditHistory, "MAX_STEPS", 3)
+    history = EditHistory()
+    steps = [_step() for _ in range(5)]
+    for forward, inverse in steps:
+        history.push(forward, inverse)
+
+    undone = []
+    while history.can_undo:
+        undone.append(history.undo())
+    assert undone == [inverse for _, inverse in reversed(steps[2:])]
+
+
+def test_history_record_budget(monkeypatch):
+    monkeypatch.setattr(EditHistory, "MAX_RECORDS", 10)
+    history = EditHistory()
+    history.push(*_step(4))  # 5 条
+    history.push(*_step(3))  # 4 条
+    history.push(*_step(2))  # 3 条，超出预算，丢弃最早的一步
+    assert history._records == 7
+
+    assert history.undo() is not None
+    assert history.undo() is not None
+    assert not history.can_undo
+
+
+def test_history_redo_records_are_released():
+    history = EditHistory()
+    history.push(*_step(2))
+    history.push(*_step(2))
+    history.undo()
+    history.push(*_step(1))
+    assert history._records == 3 + 2
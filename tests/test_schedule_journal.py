@@ -0,0 +1,156 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config import ConfigManager
+from src.core.schedule import ScheduleManager
+from src.core.schedule.journal import ScheduleJournal
+from src.core.schedule.model import ScheduleData, MetaInfo, Subject, Timeline, Entry, EntryType, Timetable
+
+
+def _schedule():
+    return ScheduleData(
+        meta=MetaInfo(id="meta", maxWeekCycle=2, startDate="2025-09-01"),
+        subjects=[Subject(id="math", name="Math")],
+        days=[Timeline(id="mon", dayOfWeek=[1], weeks="all", entries=[
+            Entry(id="e1", type=EntryType.CLASS, startTime="08:00", endTime="08:40", subjectId="math"),
+        ])],
+    )
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return ScheduleJournal(tmp_path / "journal" / "test.jsonl")
+
+
+def _edit(journal):
+    journal.append("put", "subject", "art", Subject(id="art", name="Art"))
+    journal.append("put", "entry", "e2", Entry(id="e2", type=EntryType.CLASS, startTime="07:00", endTime="07:40"),
+                   day="mon")
+    journal.append("put", "override", "o1", Timetable(id="o1", entryId="e1", subjectId="art"))
+    journal.append("del", "entry", "e1", day="mon")
+
+
+def test_append_is_buffered_until_write_pending(journal):
+    record = journal.append("put", "subject", "art", Subject(id="art", name="Art"))
+    assert record["seq"] == 1
+    assert journal.pending == 1
+    assert not journal.path.exists()
+
+    assert journal.write_pending() == 1
+    assert _records(journal.path) == [record]
+    assert journal.write_pending() == 0
+
+
+def test_replay_applies_records(journal):
+    _edit(journal)
+    journal.write_pending()
+
+    schedule = _schedule()
+    assert journal.replay(schedule) == 4
+    assert [s.id for s in schedule.subjects] == ["math", "art"]
+    assert [e.id for e in schedule.days[0].entries] == ["e2"]
+    assert schedule.overrides[0].subjectId == "art"
+
+
+def test_replay_is_idempotent(journal):
+    _edit(journal)
+    journal.write_pending()
+
+    once, twice = _schedule(), _schedule()
+    journal.replay(once)
+    journal.replay(twice)
+    journal.replay(twice)
+    assert twice.model_dump() == once.model_dump()
+
+
+def test_replay_skips_invalid_records(journal):
+    journal.append("put", "entry", "e2", Entry(id="e2", type=EntryType.CLASS, startTime="07:00", endTime="07:40"),
+                   day="missing")
+    journal.append("put", "subject", "art", Subject(id="art", name="Art"))
+    journal.write_pending()
+
+    schedule = _schedule()
+    assert journal.replay(schedule) == 1
+    assert [s.id for s in schedule.subjects] == ["math", "art"]
+
+
+def test_compact_drops_records_in_snapshot(journal):
+    _edit(journal)
+    journal.write_pending()
+    mark = journal.mark()
+    journal.append("del", "subject", "art")
+
+    journal.compact(mark)
+    assert journal.pending == 1
+    assert not journal.path.exists()  # 剩下的一条还在缓冲中
+
+    journal.write_pending()
+    assert [r["seq"] for r in _records(journal.path)] == [mark + 1]
+
+    journal.compact(journal.mark())
+    assert journal.pending == 0
+    assert not journal.path.exists()
+
+
+def test_sequence_continues_after_reopen(journal):
+    _edit(journal)
+    journal.write_pending()
+
+    reopened = ScheduleJournal(journal.path)
+    assert reopened.pending == 4
+    assert reopened.append("del", "subject", "art")["seq"] == 5
+
+
+def test_truncated_last_line_is_ignored(journal):
+    _edit(journal)
+    journal.write_pending()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 5, "op": "del", "ty')  # 写入时崩溃
+
+    schedule = _schedule()
+    assert journal.replay(schedule) == 4
+    assert ScheduleJournal(journal.path).pending == 4
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = ScheduleManager(tmp_path / "schedules", SimpleNamespace(configs=ConfigManager(tmp_path, "config.json")))
+    yield manager
+    manager.persistence.shutdown()
+
+
+def test_load_recovers_unsaved_edits(manager, tmp_path):
+    (manager.schedules_dir / "test.json").write_text(json.dumps(_schedule().model_dump(mode="json")), encoding="utf-8")
+    journal = ScheduleJournal(ScheduleJournal.path_for(manager.journal_dir, manager.schedules_dir / "test.json"))
+    _edit(journal)
+    journal.write_pending()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 5, "op": "del", "type": "subj')
+
+    assert manager.load("test")
+    expected = _schedule()
+    journal.replay(expected)
+    assert manager.schedule.model_dump() == expected.model_dump()
+
+    manager.flush()  # 恢复后写入快照，日志被压缩
+    assert not journal.path.exists()
+    saved = json.loads((manager.schedules_dir / "test.json").read_text(encoding="utf-8"))
+    assert saved == expected.model_dump(mode="json")
+
+
+def test_replace_opens_journal_of_new_schedule(manager):
+    manager.load("old")
+    manager.replace(_schedule(), manager.schedules_dir / "new.json")
+    assert manager.journal.path == ScheduleJournal.path_for(manager.journal_dir, manager.schedules_dir / "new.json")
+    assert manager.calendar.schedule is manager.schedule
+
+    manager.record({"op": "del", "type": "subject", "id": "math"})
+    manager.persistence.flush()
+    assert [r["id"] for r in _records(manager.journal.path)] == ["math"]
+    assert not ScheduleJournal.path_for(manager.journal_dir, manager.schedules_dir / "old.json").exists()
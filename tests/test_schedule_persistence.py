@@ -0,0 +1,42 @@
+import json
+import threading
+
+from src.core.schedule.model import ScheduleData, MetaInfo, Subject
+from src.core.schedule.persistence import SchedulePersistence
+
+
+def _schedule():
+    return ScheduleData(meta=MetaInfo(id="meta", maxWeekCycle=1, startDate="2025-09-01"),
+                        subjects=[Subject(id="math", name="Math")])
+
+
+def test_snapshot_is_taken_when_submitted(tmp_path):
+    persistence = SchedulePersistence(tmp_path / "backup")
+    gate = threading.Event()
+    persistence._executor.submit(gate.wait)  # 让保存线程暂时忙碌
+
+    schedule = _schedule()
+    path = tmp_path / "test.json"
+    persistence.request_save(path, schedule)
+    persistence._commit_pending()
+    schedule.subjects[0].name = "Changed"  # 提交后的编辑不属于这次快照
+    schedule.subjects.append(Subject(id="art", name="Art"))
+
+    gate.set()
+    persistence.flush()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert [s["name"] for s in saved["subjects"]] == ["Math"]
+    persistence.shutdown()
+
+
+def test_debounced_saves_are_merged(tmp_path):
+    persistence = SchedulePersistence(tmp_path / "backup")
+    path = tmp_path / "test.json"
+    first, second = _schedule(), _schedule()
+    second.subjects[0].name = "Latest"
+    persistence.request_save(path, first)
+    persistence.request_save(path, second)
+    persistence.flush()
+
+    assert json.loads(path.read_text(encoding="utf-8"))["subjects"][0]["name"] == "Latest"
+    persistence.shutdown()